@@ -0,0 +1,30 @@
+"""
+Fast JSON response path for read endpoints.
+
+Repository rows (domain dataclasses, dicts with datetimes/UUIDs) are serialized directly by
+orjson, skipping the SuccessResponse / response_model validation and re-encoding pass.
+The envelope is the same {"success", "message", "data"} shape as SuccessResponse.
+"""
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def success_response(message: str, data: Any = None, status_code: int = 200) -> FastJSONResponse:
+    """SuccessResponse-shaped body rendered straight to JSON bytes."""
+    return FastJSONResponse({"success": True, "message": message, "data": data}, status_code=status_code)
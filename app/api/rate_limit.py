@@ -0,0 +1,185 @@
+"""
+Hybrid rate limiting: in-process counters per client, synchronized to Redis in batches.
+
+Each HybridRateLimiter counts requests per client IP in fixed windows in process memory, so the
+request path does no network I/O. A background task (run_rate_limit_sync) periodically pushes the
+unsynced hits of every active client to Redis with one pipelined INCRBY per key and pulls back the
+global count for the window, so the limit holds across processes within roughly one sync interval.
+If Redis is unreachable the sync fails open: limits are then enforced per process only.
+
+sync_interval controls accuracy per route: 0 checks Redis on every request (strict, like
+fastapi_limiter; no local counters, and no limit while Redis is unreachable), larger values trade
+accuracy for overhead.
+
+Limits are fixed windows, the same semantics as the fastapi_limiter dependencies this replaced: a
+window's count is a single Redis key that batched INCRBYs from every process add up exactly,
+which a token bucket's time-based refill does not allow without a round trip per request.
+"""
+import asyncio
+import ipaddress
+import math
+import time
+from dataclasses import dataclass
+
+import redis.asyncio as async_redis
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.config import RATE_LIMIT_ENABLED, RATE_LIMIT_SYNC_SECONDS, TRUSTED_PROXIES, TRUSTED_PROXY_HOPS
+
+_limiters: list["HybridRateLimiter"] = []
+
+
+@dataclass
+class _Counter:
+    window: int
+    pending: int = 0   # hits not yet pushed to Redis
+    remote: int = 0    # global count for the window at the last sync (includes our pushed hits)
+
+
+_trusted_networks = [ipaddress.ip_network(net.strip(), strict=False) for net in TRUSTED_PROXIES.split(",") if net.strip()]
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in _trusted_networks)
+
+
+def client_identifier(request: Request) -> str:
+    """
+    Client IP for per-IP limits. X-Forwarded-For is client-controlled except for the addresses our
+    own proxies appended, so only those are used: the TRUSTED_PROXY_HOPS-th address from the right,
+    or, when the peer is in TRUSTED_PROXIES, the right-most address not in that list. With neither
+    configured the header is ignored and the peer address is used.
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("X-Forwarded-For")
+    if not forwarded:
+        return peer
+    hops = [address.strip() for address in forwarded.split(",") if address.strip()]
+    if not hops:
+        return peer
+    if TRUSTED_PROXY_HOPS > 0:
+        return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    if _trusted_networks and _is_trusted(peer):
+        for address in reversed(hops):
+            if not _is_trusted(address):
+                return address
+        return hops[0]
+    return peer
+
+
+class HybridRateLimiter:
+    def __init__(
+        self,
+        times: int,
+        milliseconds: int = 0,
+        seconds: int = 0,
+        minutes: int = 0,
+        hours: int = 0,
+        sync_interval: float | None = None,
+    ):
+        self.times = times
+        self.window_ms = milliseconds + 1000 * (seconds + 60 * (minutes + 60 * hours))
+        self.sync_interval = RATE_LIMIT_SYNC_SECONDS if sync_interval is None else sync_interval
+        self._counters: dict[str, _Counter] = {}
+        self._window = 0
+        self._route_key: str | None = None
+        self._last_sync = 0.0
+        _limiters.append(self)
+
+    def _redis_key(self, client: str, window: int) -> str:
+        return f"ratelimit:{self._route_key}:{client}:{window}"
+
+    async def __call__(self, request: Request, response: Response):
+        if not RATE_LIMIT_ENABLED:
+            return
+        if self._route_key is None:
+            route = request.scope.get("route")
+            self._route_key = f"{request.method}:{route.path if route else request.url.path}"
+
+        now_ms = int(time.time() * 1000)
+        window = now_ms // self.window_ms
+        client = client_identifier(request)
+
+        if self.sync_interval <= 0:
+            used = await self._remote_hit(client, window)
+            if used is None:
+                return  # fail open: strict limiters keep no local state
+        else:
+            if window != self._window:
+                # Counters of the finished window are dead (sync drops them the same way); clearing
+                # here keeps memory bounded by the clients of one window even if sync is not running
+                self._counters = {}
+                self._window = window
+            counter = self._counters.get(client)
+            if counter is None:
+                counter = self._counters[client] = _Counter(window=window)
+            used = counter.remote + counter.pending + 1
+            if used <= self.times:
+                counter.pending += 1  # rejected requests do not consume quota
+
+        if used > self.times:
+            retry_after = math.ceil(((window + 1) * self.window_ms - now_ms) / 1000)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too Many Requests",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    async def _remote_hit(self, client: str, window: int) -> int | None:
+        """Strict mode: count the hit in Redis. Returns the global count, None if Redis is unavailable."""
+        if _redis is None:
+            return None
+        key = self._redis_key(client, window)
+        try:
+            used = await _redis.incr(key)
+            if used == 1:
+                await _redis.pexpire(key, self.window_ms)
+            return used
+        except Exception:
+            return None
+
+    async def sync(self, redis_conn) -> None:
+        """Push pending hits, pull global counts, drop counters from finished windows."""
+        window = int(time.time() * 1000) // self.window_ms
+        for client in [c for c, counter in self._counters.items() if counter.window != window]:
+            del self._counters[client]
+        # Snapshot what is pushed: requests arriving while the pipeline is in flight stay pending
+        active = [(client, counter, counter.pending) for client, counter in self._counters.items() if counter.pending]
+        if not active:
+            return
+
+        pipe = redis_conn.pipeline(transaction=False)
+        for client, counter, pushed in active:
+            key = self._redis_key(client, counter.window)
+            pipe.incrby(key, pushed)
+            pipe.pexpire(key, self.window_ms)
+        results = await pipe.execute()
+
+        for (_, counter, pushed), total in zip(active, results[::2]):
+            counter.pending -= pushed
+            counter.remote = total
+
+
+_redis = None
+
+
+async def run_rate_limit_sync(redis_conn: async_redis.Redis) -> None:
+    """Background task: sync every limiter at its own interval. Errors are logged and ignored (fail open)."""
+    global _redis
+    _redis = redis_conn
+    tick = max(0.1, min([l.sync_interval for l in _limiters if l.sync_interval > 0] or [1.0]))
+    while True:
+        await asyncio.sleep(tick)
+        now = time.monotonic()
+        for limiter in _limiters:
+            if limiter.sync_interval <= 0 or now - limiter._last_sync < limiter.sync_interval:
+                continue
+            limiter._last_sync = now
+            try:
+                await limiter.sync(redis_conn)
+            except Exception as e:
+                print(f"Rate limit sync failed, enforcing locally: {e}")
@@ -0,0 +1,36 @@
+"""
+Operator endpoints. Disabled (404) unless ADMIN_TOKEN is set; requests must send it as X-Admin-Token.
+"""
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from app.schemas.responses import SuccessResponse
+from app.api.fast_json import success_response
+from app.core.config import ADMIN_TOKEN, SLOW_QUERY_MS
+from app.db.instrumentation import captured_explains, query_stats
+from app.db.statements import statement_stats
+
+
+def require_admin(x_admin_token: str | None = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+
+@router.get(
+    "/slow-queries",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+)
+def slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Per-fingerprint query stats (this process), prepared statement stats and the sampled EXPLAIN captures."""
+    return success_response("Query stats fetched successfully", {
+        "threshold_ms": SLOW_QUERY_MS,
+        "statements": query_stats(limit),
+        "prepared_statements": statement_stats(),
+        "explains": captured_explains(),
+    })
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status, Depends, Query
+from app.schemas.responses import SuccessResponse
+from app.domain.enum import AutocompleteKind
+from app.services.autocomplete_service import autocomplete_service
+from app.api.fast_json import success_response
+from app.api.rate_limit import HybridRateLimiter
+
+router = APIRouter()
+
+
+@router.get(
+    "/autocomplete",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(HybridRateLimiter(times=120, minutes=1))],
+)
+async def autocomplete(
+    kind: AutocompleteKind,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Complete a lecturer or lesson name from the in-memory index, most-voted first. Never queries the database."""
+    return success_response("Completions fetched successfully", autocomplete_service.lookup(kind, q, limit))
@@ -0,0 +1,65 @@
+"""
+Live vote tallies for one video, pushed instead of polled. Events are the JSON objects
+{"kind", "suggestion_id", "approval_count"} published by the vote jobs.
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.services.live_votes import live_vote_hub
+from app.api.rate_limit import HybridRateLimiter
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15
+
+
+@router.get(
+    "/videos/{video_id}/stream",
+    dependencies=[Depends(HybridRateLimiter(times=30, minutes=1))],
+)
+async def stream_votes(video_id: str):
+    """Server-sent events: one `vote` event per committed vote on this video's suggestions."""
+
+    async def events():
+        queue = live_vote_hub.subscribe(video_id)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: vote\ndata: {payload}\n\n"
+        finally:
+            live_vote_hub.unsubscribe(video_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/videos/{video_id}/ws")
+async def websocket_votes(websocket: WebSocket, video_id: str):
+    """WebSocket variant of /stream: each committed vote is sent as one JSON text message."""
+    await websocket.accept()
+    queue = live_vote_hub.subscribe(video_id)
+
+    async def forward():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Nothing is expected from the client; receiving only detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        live_vote_hub.unsubscribe(video_id, queue)
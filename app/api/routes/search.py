@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from app.schemas.responses import SuccessResponse
+from app.db.repo.videos_repo import search_videos
+from app.core.arabic import normalize_arabic
+from app.api.fast_json import success_response
+from app.api.rate_limit import HybridRateLimiter
+
+router = APIRouter()
+
+
+@router.get(
+    "/search",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(HybridRateLimiter(times=30, minutes=1))],
+)
+async def search(q: str = Query(..., min_length=1, max_length=200), limit: int = Query(20, ge=1, le=100)):
+    """Search videos by title, leading lesson name and leading lecturer. Arabic is normalized (tashkeel, tatweel, alef/ya/ta-marbuta)."""
+    try:
+        results = search_videos(normalize_arabic(q), limit=limit)
+        return success_response("Search results fetched successfully", results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
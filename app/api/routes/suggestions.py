@@ -1,366 +1,126 @@
 """
 User-facing suggestion APIs. All write operations (create, vote) go through the message queue.
-Read operations (GET) hit the database directly.
+Read operations (GET) hit the database directly (concurrent identical reads are coalesced) and serialize
+the domain rows with the fast JSON path. The create / list / vote routes are generated per kind from
+app.domain.suggestion_kinds.
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from uuid import UUID
-from app.schemas.suggestions import (
-    TitleSuggestionCreate,
-    DescriptionSuggestionCreate,
-    TitleSuggestionResponse,
-    DescriptionSuggestionResponse,
-    LessonNameSuggestionCreate,
-    LecturerSuggestionCreate,
-    LessonNameSuggestionResponse,
-    LecturerSuggestionResponse,
-    VoteRequest,
-    RelatedVoteRequest,
-    RelatedSuggestionResponse,
-)
+from app.schemas.suggestions import SUGGESTION_CREATE_SCHEMAS, VoteRequest, RelatedVoteRequest
 from app.schemas.responses import SuccessResponse
+from app.api.fast_json import success_response
+from app.core.singleflight import single_flight
+from app.core.tracing import enqueue_traced
+from app.domain.enum import SuggestionRank
+from app.domain.suggestion_kinds import SUGGESTION_KINDS, SuggestionKind
 from app.queues.redis_queue import suggestions_queue
 from app.workers.suggestion_worker import (
-    job_create_title_suggestion,
-    job_create_description_suggestion,
-    job_vote_title_suggestion,
-    job_vote_description_suggestion,
-    job_create_lesson_name_suggestion,
-    job_create_lecturer_suggestion,
-    job_vote_lesson_name_suggestion,
-    job_vote_lecturer_suggestion,
+    job_create_suggestion,
+    job_vote_suggestion,
     job_submit_related_vote,
 )
-from app.db.repo.videos_repo import (
-    get_title_suggestions_by_video,
-    get_description_suggestions_by_video,
-    get_lesson_name_suggestions_by_video,
-    get_lecturer_suggestions_by_video,
-    get_related_suggestions_by_video,
-)
-from app.domain.models import (
-    titleSuggestions,
-    descriptionSuggestions,
-    lessonNameSuggestions,
-    lecturerSuggestions,
-    relatedSuggestion,
-)
-from fastapi_limiter.depends import RateLimiter
+from app.services.vote_counts import current_suggestions, current_related_suggestions
+from app.api.rate_limit import HybridRateLimiter, client_identifier
+from app.core.config import VOTE_FLAG_TTL_SECONDS
+from app.services.vote_guard import check_vote
 
 router = APIRouter()
 
 
-def _title_to_resp(ts: titleSuggestions) -> TitleSuggestionResponse:
-    return TitleSuggestionResponse(
-        id=ts.id,
-        video_id=ts.video_id,
-        title_text=ts.title_text,
-        approval_count=ts.approval_count or 0,
-        created_at=ts.created_at,
-    )
-
-
-def _desc_to_resp(ds: descriptionSuggestions) -> DescriptionSuggestionResponse:
-    return DescriptionSuggestionResponse(
-        id=ds.id,
-        video_id=ds.video_id,
-        description_text=ds.description_text,
-        approval_count=ds.approval_count or 0,
-        created_at=ds.created_at,
-    )
-
-
-def _lesson_to_resp(ls: lessonNameSuggestions) -> LessonNameSuggestionResponse:
-    return LessonNameSuggestionResponse(
-        id=ls.id,
-        video_id=ls.video_id,
-        lesson_name_text=ls.lesson_name_text,
-        approval_count=ls.approval_count or 0,
-        created_at=ls.created_at,
-    )
-
-
-def _lecturer_to_resp(ls: lecturerSuggestions) -> LecturerSuggestionResponse:
-    return LecturerSuggestionResponse(
-        id=ls.id,
-        video_id=ls.video_id,
-        lecturer_name_text=ls.lecturer_name_text,
-        approval_count=ls.approval_count or 0,
-        created_at=ls.created_at,
-    )
-
-
-def _related_to_resp(r: relatedSuggestion) -> RelatedSuggestionResponse:
-    return RelatedSuggestionResponse(
-        id=r.id,
-        video_id=r.video_id,
-        is_related=r.is_related or False,
-        approval_count=r.approval_count or 0,
-        created_at=r.created_at,
-    )
-
-
-# ---- Title ----
-
-@router.post(
-    "/videos/{video_id}/title-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=20, minutes=1))],
-)
-async def create_title_suggestion_endpoint(video_id: str, suggestion: TitleSuggestionCreate):
-    """Submit your own title suggestion (or vote on an existing one via /title-suggestions/{id}/vote). Queued."""
-    if suggestion.video_id != video_id:
-        raise HTTPException(status_code=400, detail="Video ID in path must match body")
-    try:
-        job = suggestions_queue.enqueue(
-            job_create_title_suggestion,
-            suggestion.video_id,
-            suggestion.title_text,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Title suggestion queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get(
-    "/videos/{video_id}/title-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
-)
-async def get_title_suggestions(video_id: str, limit: int = 5):
-    """Top N title suggestions (default 5). User can vote on one of these or submit their own via POST."""
-    suggestions = get_title_suggestions_by_video(video_id, limit=limit)
-    return SuccessResponse(
-        success=True,
-        message="Title suggestions fetched successfully",
-        data=[_title_to_resp(s) for s in suggestions],
-    )
-
-
-@router.post(
-    "/title-suggestions/{suggestion_id}/vote",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=50, minutes=1))],
-)
-async def vote_title_suggestion_endpoint(suggestion_id: UUID, vote: VoteRequest):
-    """Queue a vote on a title suggestion."""
-    try:
-        job = suggestions_queue.enqueue(
-            job_vote_title_suggestion,
-            str(suggestion_id),
-            vote.voter_hash,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Vote queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---- Description ----
-
-@router.post(
-    "/videos/{video_id}/description-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=20, minutes=1))],
-)
-async def create_description_suggestion_endpoint(video_id: str, suggestion: DescriptionSuggestionCreate):
-    """Submit your own description (or vote on existing via /description-suggestions/{id}/vote). Queued."""
-    if suggestion.video_id != video_id:
-        raise HTTPException(status_code=400, detail="Video ID in path must match body")
-    try:
-        job = suggestions_queue.enqueue(
-            job_create_description_suggestion,
-            suggestion.video_id,
-            suggestion.description_text,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Description suggestion queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get(
-    "/videos/{video_id}/description-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
-)
-async def get_description_suggestions(video_id: str, limit: int = 5):
-    """Top N description suggestions (default 5). Vote on one or submit your own via POST."""
-    suggestions = get_description_suggestions_by_video(video_id, limit=limit)
-    return SuccessResponse(
-        success=True,
-        message="Description suggestions fetched successfully",
-        data=[_desc_to_resp(s) for s in suggestions],
+async def _guard_vote(request: Request, kind: str, voter_hash: str, target: str) -> None:
+    """Reject votes over the per-voter / per-(IP, target) quotas before they reach the queue."""
+    verdict = await run_in_threadpool(check_vote, kind, voter_hash, client_identifier(request), target)
+    if verdict.rejected:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Vote quota exceeded",
+            headers={"Retry-After": str(VOTE_FLAG_TTL_SECONDS)},
+        )
+
+
+# ---- Title, description, lesson name, lecturer name (one set of routes per registered kind) ----
+
+def _add_kind_routes(kind: SuggestionKind) -> None:
+    """POST and GET /videos/{video_id}/<slug>-suggestions, POST /<slug>-suggestions/{suggestion_id}/vote."""
+    create_schema = SUGGESTION_CREATE_SCHEMAS[kind.name]
+    noun = kind.label.lower()
+
+    async def create_endpoint(video_id: str, suggestion: create_schema):
+        if suggestion.video_id != video_id:
+            raise HTTPException(status_code=400, detail="Video ID in path must match body")
+        try:
+            job = enqueue_traced(
+                suggestions_queue,
+                job_create_suggestion,
+                kind.name,
+                suggestion.video_id,
+                getattr(suggestion, kind.text_field),
+            )
+            return SuccessResponse(
+                success=True,
+                message=f"{kind.label} suggestion queued for processing",
+                data={"job_id": job.get_id()},
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def list_endpoint(video_id: str, limit: int = 5, rank: SuggestionRank = SuggestionRank.top):
+        suggestions = await single_flight(current_suggestions, kind.name, video_id, limit=limit, rank=rank.value)
+        return success_response(f"{kind.label} suggestions fetched successfully", suggestions)
+
+    async def vote_endpoint(request: Request, suggestion_id: UUID, vote: VoteRequest):
+        await _guard_vote(request, kind.name, vote.voter_hash, str(suggestion_id))
+        try:
+            job = enqueue_traced(
+                suggestions_queue,
+                job_vote_suggestion,
+                kind.name,
+                str(suggestion_id),
+                vote.voter_hash,
+            )
+            return SuccessResponse(
+                success=True,
+                message="Vote queued for processing",
+                data={"job_id": job.get_id()},
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    router.add_api_route(
+        f"/videos/{{video_id}}/{kind.slug}-suggestions",
+        create_endpoint,
+        methods=["POST"],
+        name=f"create_{kind.name}_suggestion_endpoint",
+        description=f"Submit your own {noun} suggestion (or vote on an existing one via /{kind.slug}-suggestions/{{id}}/vote). Queued.",
+        response_model=SuccessResponse,
+        status_code=status.HTTP_202_ACCEPTED,
+        dependencies=[Depends(HybridRateLimiter(times=20, minutes=1, sync_interval=1))],
     )
-
-
-@router.post(
-    "/description-suggestions/{suggestion_id}/vote",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=50, minutes=1))],
-)
-async def vote_description_suggestion_endpoint(suggestion_id: UUID, vote: VoteRequest):
-    """Queue a vote on a description suggestion."""
-    try:
-        job = suggestions_queue.enqueue(
-            job_vote_description_suggestion,
-            str(suggestion_id),
-            vote.voter_hash,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Vote queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---- Lesson name ----
-
-@router.post(
-    "/videos/{video_id}/lesson-name-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=20, minutes=1))],
-)
-async def create_lesson_name_suggestion_endpoint(video_id: str, suggestion: LessonNameSuggestionCreate):
-    """Submit your own lesson name (or vote on existing via /lesson-name-suggestions/{id}/vote). Queued."""
-    if suggestion.video_id != video_id:
-        raise HTTPException(status_code=400, detail="Video ID in path must match body")
-    try:
-        job = suggestions_queue.enqueue(
-            job_create_lesson_name_suggestion,
-            suggestion.video_id,
-            suggestion.lesson_name_text,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Lesson name suggestion queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get(
-    "/videos/{video_id}/lesson-name-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
-)
-async def get_lesson_name_suggestions(video_id: str, limit: int = 5):
-    """Top N lesson name suggestions (default 5). Vote on one or submit your own via POST."""
-    suggestions = get_lesson_name_suggestions_by_video(video_id, limit=limit)
-    return SuccessResponse(
-        success=True,
-        message="Lesson name suggestions fetched successfully",
-        data=[_lesson_to_resp(s) for s in suggestions],
+    router.add_api_route(
+        f"/videos/{{video_id}}/{kind.slug}-suggestions",
+        list_endpoint,
+        methods=["GET"],
+        name=f"get_{kind.name}_suggestions",
+        description=f"Top N {noun} suggestions (default 5; rank=top by votes, rank=hot by time-decayed score). Vote on one or submit your own via POST.",
+        response_model=SuccessResponse,
+        status_code=status.HTTP_200_OK,
+        dependencies=[Depends(HybridRateLimiter(times=30, minutes=1))],
     )
-
-
-@router.post(
-    "/lesson-name-suggestions/{suggestion_id}/vote",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=50, minutes=1))],
-)
-async def vote_lesson_name_suggestion_endpoint(suggestion_id: UUID, vote: VoteRequest):
-    """Queue a vote on a lesson name suggestion."""
-    try:
-        job = suggestions_queue.enqueue(
-            job_vote_lesson_name_suggestion,
-            str(suggestion_id),
-            vote.voter_hash,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Vote queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ---- Lecturer name ----
-
-@router.post(
-    "/videos/{video_id}/lecturer-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=20, minutes=1))],
-)
-async def create_lecturer_suggestion_endpoint(video_id: str, suggestion: LecturerSuggestionCreate):
-    """Submit your own lecturer name (or vote on existing via /lecturer-suggestions/{id}/vote). Queued."""
-    if suggestion.video_id != video_id:
-        raise HTTPException(status_code=400, detail="Video ID in path must match body")
-    try:
-        job = suggestions_queue.enqueue(
-            job_create_lecturer_suggestion,
-            suggestion.video_id,
-            suggestion.lecturer_name_text,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Lecturer suggestion queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get(
-    "/videos/{video_id}/lecturer-suggestions",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
-)
-async def get_lecturer_suggestions(video_id: str, limit: int = 5):
-    """Top N lecturer suggestions (default 5). Vote on one or submit your own via POST."""
-    suggestions = get_lecturer_suggestions_by_video(video_id, limit=limit)
-    return SuccessResponse(
-        success=True,
-        message="Lecturer suggestions fetched successfully",
-        data=[_lecturer_to_resp(s) for s in suggestions],
+    router.add_api_route(
+        f"/{kind.slug}-suggestions/{{suggestion_id}}/vote",
+        vote_endpoint,
+        methods=["POST"],
+        name=f"vote_{kind.name}_suggestion_endpoint",
+        description=f"Queue a vote on a {noun} suggestion.",
+        response_model=SuccessResponse,
+        status_code=status.HTTP_202_ACCEPTED,
+        dependencies=[Depends(HybridRateLimiter(times=50, minutes=1, sync_interval=1))],
     )
 
 
-@router.post(
-    "/lecturer-suggestions/{suggestion_id}/vote",
-    response_model=SuccessResponse,
-    status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=50, minutes=1))],
-)
-async def vote_lecturer_suggestion_endpoint(suggestion_id: UUID, vote: VoteRequest):
-    """Queue a vote on a lecturer suggestion."""
-    try:
-        job = suggestions_queue.enqueue(
-            job_vote_lecturer_suggestion,
-            str(suggestion_id),
-            vote.voter_hash,
-        )
-        return SuccessResponse(
-            success=True,
-            message="Vote queued for processing",
-            data={"job_id": job.get_id()},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+for _kind in SUGGESTION_KINDS.values():
+    _add_kind_routes(_kind)
 
 
 # ---- Is related (users decide if the video is related or not) ----
@@ -369,28 +129,26 @@ async def vote_lecturer_suggestion_endpoint(suggestion_id: UUID, vote: VoteReque
     "/videos/{video_id}/related-suggestions",
     response_model=SuccessResponse,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
+    dependencies=[Depends(HybridRateLimiter(times=30, minutes=1))],
 )
 async def get_related_suggestions(video_id: str):
     """Returns the two options (related / not_related) and their vote counts. User votes to decide if the video is related."""
-    suggestions = get_related_suggestions_by_video(video_id)
-    return SuccessResponse(
-        success=True,
-        message="Related suggestions fetched successfully",
-        data=[_related_to_resp(s) for s in suggestions],
-    )
+    suggestions = await single_flight(current_related_suggestions, video_id)
+    return success_response("Related suggestions fetched successfully", suggestions)
 
 
 @router.post(
     "/videos/{video_id}/related-vote",
     response_model=SuccessResponse,
     status_code=status.HTTP_202_ACCEPTED,
-    dependencies=[Depends(RateLimiter(times=50, minutes=1))],
+    dependencies=[Depends(HybridRateLimiter(times=50, minutes=1, sync_interval=1))],
 )
-async def submit_related_vote(video_id: str, body: RelatedVoteRequest):
+async def submit_related_vote(request: Request, video_id: str, body: RelatedVoteRequest):
     """Vote whether this video is related or not. Queued. Use GET /videos?related_only=true to list only videos users marked as related."""
+    await _guard_vote(request, "related", body.voter_hash, video_id)
     try:
-        job = suggestions_queue.enqueue(
+        job = enqueue_traced(
+            suggestions_queue,
             job_submit_related_vote,
             video_id,
             body.is_related,
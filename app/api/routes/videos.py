@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from app.schemas.responses import SuccessResponse
-from app.db.repo.videos_repo import get_videos_for_catalog
-from fastapi_limiter.depends import RateLimiter
+from app.db.repo.videos_repo import get_videos_for_catalog, get_catalog_facets, get_suggest_video
+from app.domain.enum import MainAcademicLevel, CommonSubLevel, SpecializedLevel, ExportFormat
+from app.api.fast_json import success_response
+from app.core.singleflight import single_flight
+from app.services.catalog_snapshot import get_catalog_snapshot, pick_encoding, etag_matches
+from app.services.catalog_stream import MEDIA_TYPES, stream_catalog
+from app.api.rate_limit import HybridRateLimiter
 
 router = APIRouter()
 
@@ -17,16 +24,78 @@ async def root_api():
     "/videos",
     response_model=SuccessResponse,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=30, minutes=1))],
+    dependencies=[Depends(HybridRateLimiter(times=30, minutes=1))],
 )
-async def list_videos(related_only: bool = False):
-    """List videos from the catalog. Use related_only=true to return only videos users have marked as related (related votes > not_related)."""
+async def list_videos(
+    request: Request,
+    related_only: bool = False,
+    main_level: MainAcademicLevel | None = None,
+    common_sub_level: CommonSubLevel | None = None,
+    specialized_level: SpecializedLevel | None = None,
+    include_facets: bool = False,
+):
+    """List videos from the catalog. Use related_only=true to return only videos users have marked as related (the consensus related verdict, see RELATED_MIN_VOTES / RELATED_MIN_MARGIN).
+    Filter by academic level with main_level / common_sub_level / specialized_level. With include_facets=true, data is
+    {"videos": [...], "facets": {"main_level": {value: count}, ...}} using the precomputed facet rollup.
+    The unfiltered list is served from a precompressed snapshot with a strong ETag per encoding (If-None-Match -> 304)."""
     try:
-        videos = get_videos_for_catalog(related_only=related_only)
-        return SuccessResponse(
-            success=True,
-            message="Videos fetched successfully",
-            data=videos,
+        if not (main_level or common_sub_level or specialized_level or include_facets):
+            snapshot = await run_in_threadpool(get_catalog_snapshot, related_only)
+            encoding = pick_encoding(request.headers.get("accept-encoding"))
+            headers = {"ETag": snapshot.etag(encoding), "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), snapshot):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            if encoding != "identity":
+                headers["Content-Encoding"] = encoding
+            return Response(content=snapshot.bodies[encoding], media_type="application/json", headers=headers)
+
+        videos = get_videos_for_catalog(
+            related_only=related_only,
+            main_level=main_level.value if main_level else None,
+            common_sub_level=common_sub_level.value if common_sub_level else None,
+            specialized_level=specialized_level.value if specialized_level else None,
         )
+        data = videos
+        if include_facets:
+            data = {"videos": videos, "facets": get_catalog_facets(related_only=related_only)}
+        return success_response("Videos fetched successfully", data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# Declared before /videos/{video_id} so "export" isn't taken as a video id
+@router.get(
+    "/videos/export",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(HybridRateLimiter(times=5, minutes=1))],
+)
+async def export_videos(format: ExportFormat = ExportFormat.ndjson):
+    """The whole catalog with resolved metadata, one video per line (NDJSON, default) or as CSV.
+    Streamed from a server-side cursor: the response starts immediately and memory stays flat.
+    503 when this process is already serving CATALOG_EXPORT_MAX_CONCURRENT exports."""
+    chunks = stream_catalog(format)
+    if chunks is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many catalog exports in progress, retry shortly",
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="catalog.{format.value}"'},
+    )
+
+
+@router.get(
+    "/videos/{video_id}",
+    response_model=SuccessResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(HybridRateLimiter(times=60, minutes=1))],
+)
+async def get_video(video_id: str):
+    """Resolved metadata for one video: curated levels plus the consensus title, lesson name, lecturer and related verdict."""
+    video = await single_flight(get_suggest_video, video_id)
+    if video is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return success_response("Video fetched successfully", video)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.services.youtube_service import get_channel_video_count
 from app.schemas.responses import SuccessResponse
-from fastapi_limiter.depends import RateLimiter
+from app.api.rate_limit import HybridRateLimiter
 
 router = APIRouter()
 
@@ -10,7 +10,7 @@ router = APIRouter()
     "/youtube/count",
     response_model=SuccessResponse,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(RateLimiter(times=10, minutes=1))]
+    dependencies=[Depends(HybridRateLimiter(times=10, minutes=1, sync_interval=0))]
 )
 async def get_youtube_video_count():
     """Get the total video count from YouTube channel."""
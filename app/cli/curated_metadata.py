@@ -0,0 +1,72 @@
+"""
+Bulk load and back up curated video metadata (levels, lesson, lecturer) with COPY.
+
+    python -m app.cli.curated_metadata import curated.csv
+    python -m app.cli.curated_metadata import curated.jsonl --overwrite
+    python -m app.cli.curated_metadata export backup.csv
+
+Import validates every record first (level enums, dates, booleans) and writes nothing if one is
+invalid, unless --skip-invalid. Rows for videos not in video_info are skipped and reported.
+Empty fields keep the stored value; --overwrite clears it instead (e.g. restoring a backup).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.services.curated_metadata import export_curated_metadata, import_curated_metadata
+
+_MAX_LISTED = 20
+
+
+def _format(path: Path, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def _print_list(title: str, items: list[str]) -> None:
+    print(f"{title} ({len(items)}):")
+    for item in items[:_MAX_LISTED]:
+        print(f"  {item}")
+    if len(items) > _MAX_LISTED:
+        print(f"  ... {len(items) - _MAX_LISTED} more")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import / export curated video metadata.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="load a CSV / JSONL file into suggestion_video_info")
+    imp.add_argument("path", type=Path)
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension (.csv, else jsonl)")
+    imp.add_argument("--overwrite", action="store_true", help="empty fields clear stored values instead of keeping them")
+    imp.add_argument("--skip-invalid", action="store_true", help="import the valid records even if some are invalid")
+
+    exp = sub.add_parser("export", help="write suggestion_video_info as CSV")
+    exp.add_argument("path", type=Path)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        count = export_curated_metadata(args.path)
+        print(f"Exported {count} videos to {args.path}")
+        return 0
+
+    result = import_curated_metadata(
+        args.path, _format(args.path, args.format), overwrite=args.overwrite, skip_invalid=args.skip_invalid
+    )
+    if result["errors"]:
+        _print_list("Invalid records", result["errors"])
+    if result["unknown"]:
+        _print_list("Skipped, video_id not in video_info", result["unknown"])
+    print(f"Read {result['read']}: {result['inserted']} inserted, {result['updated']} updated, "
+          f"{result['invalid']} invalid, {result['duplicates']} duplicates (last one kept), "
+          f"{len(result['unknown'])} unknown videos")
+    if result["errors"] and not args.skip_invalid:
+        print("Nothing imported; fix the records above or pass --skip-invalid")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
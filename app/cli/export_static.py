@@ -0,0 +1,32 @@
+"""
+Export the catalog as static JSON shards for CDN / object-storage hosting.
+
+    python -m app.cli.export_static --target ./public/catalog
+    python -m app.cli.export_static --target s3://my-bucket/catalog --full
+"""
+import argparse
+import sys
+
+from app.core.config import STATIC_EXPORT_TARGET, STATIC_EXPORT_PAGE_SIZE
+from app.services.static_export import export_static_catalog, open_target
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the catalog as static JSON shards.")
+    parser.add_argument("--target", default=STATIC_EXPORT_TARGET,
+                        help="directory or s3://bucket/prefix (default: STATIC_EXPORT_TARGET)")
+    parser.add_argument("--page-size", type=int, default=STATIC_EXPORT_PAGE_SIZE)
+    parser.add_argument("--full", action="store_true", help="rewrite every shard, ignoring the previous manifest")
+    args = parser.parse_args(argv)
+
+    if not args.target:
+        parser.error("--target is required when STATIC_EXPORT_TARGET is not set")
+
+    result = export_static_catalog(open_target(args.target), page_size=args.page_size, full=args.full)
+    print(f"Exported to {args.target}: {result['written']} written, "
+          f"{result['unchanged']} unchanged, {result['deleted']} deleted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Arabic text normalization shared by search and autocomplete.
+
+Must stay in sync with the `normalize_arabic` SQL function in database_schema.sql,
+which applies the same rules when the search index is written.
+"""
+import re
+
+# Tashkeel (harakat, tanween, shadda, sukun, superscript alef, Quranic marks) and tatweel
+_DIACRITICS = re.compile("[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+
+_LETTER_FORMS = str.maketrans({
+    "\u0623": "\u0627",  # alef with hamza above -> alef
+    "\u0625": "\u0627",  # alef with hamza below -> alef
+    "\u0622": "\u0627",  # alef with madda -> alef
+    "\u0671": "\u0627",  # alef wasla -> alef
+    "\u0649": "\u064A",  # alef maksura -> ya
+    "\u0629": "\u0647",  # ta marbuta -> ha
+})
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_arabic(text: str | None) -> str:
+    """Strip tashkeel/tatweel, unify alef/ya/ta-marbuta forms, lowercase and collapse whitespace."""
+    if not text:
+        return ""
+    text = _DIACRITICS.sub("", text).translate(_LETTER_FORMS).lower()
+    return _SPACES.sub(" ", text).strip()
@@ -18,4 +18,78 @@ CHANNEL_ID =  "UCUoYtTky7mURqrkp593xAgw"
 YOUTUBE_API_KEY = getenv("YOUTUBE_API_KEY")
 
 
-REDIS_URL = getenv("REDIS_URL")
\ No newline at end of file
+REDIS_URL = getenv("REDIS_URL")
+
+
+# Consensus projection: how a video's winning title / lesson name / lecturer / related verdict is chosen
+CONSENSUS_MIN_VOTES = int(getenv("CONSENSUS_MIN_VOTES", "1"))      # leader needs at least this many votes
+CONSENSUS_MIN_MARGIN = int(getenv("CONSENSUS_MIN_MARGIN", "0"))    # and this many more than the runner-up
+CONSENSUS_TIE_BREAK = getenv("CONSENSUS_TIE_BREAK", "oldest")      # equal counts: "oldest" or "newest" suggestion wins
+RELATED_MIN_VOTES = int(getenv("RELATED_MIN_VOTES", "1"))
+RELATED_MIN_MARGIN = int(getenv("RELATED_MIN_MARGIN", "1"))        # 1 = strict majority; ?related_only=true lists videos with this verdict
+
+
+# Static catalog export for CDN / object storage, e.g. "/var/www/catalog" or "s3://bucket/prefix".
+# The scheduled export is disabled when unset.
+STATIC_EXPORT_TARGET = getenv("STATIC_EXPORT_TARGET")
+STATIC_EXPORT_PAGE_SIZE = int(getenv("STATIC_EXPORT_PAGE_SIZE", "100"))
+STATIC_EXPORT_INTERVAL_MINUTES = int(getenv("STATIC_EXPORT_INTERVAL_MINUTES", "15"))
+S3_ENDPOINT_URL = getenv("S3_ENDPOINT_URL")  # for S3-compatible stores (R2, MinIO, Supabase Storage)
+
+# GET /api/videos/export streams from a server-side cursor, this many rows per fetch
+CATALOG_EXPORT_BATCH_SIZE = int(getenv("CATALOG_EXPORT_BATCH_SIZE", "2000"))
+# Each running export holds a db_pool connection for the whole transfer; more than this many per
+# process get 503 so slow downloads cannot exhaust the pool for every other endpoint
+CATALOG_EXPORT_MAX_CONCURRENT = int(getenv("CATALOG_EXPORT_MAX_CONCURRENT", "4"))
+
+
+# Rate limiting: per-process counters synced to Redis every RATE_LIMIT_SYNC_SECONDS (routes may override)
+RATE_LIMIT_ENABLED = getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+RATE_LIMIT_SYNC_SECONDS = float(getenv("RATE_LIMIT_SYNC_SECONDS", "5"))
+# Client IP behind a reverse proxy (rate limits and vote quotas): X-Forwarded-For is only read
+# from our own proxies. TRUSTED_PROXY_HOPS = how many proxies append to it (Render: 1), or
+# TRUSTED_PROXIES = comma-separated addresses / CIDRs of the proxies. Unset: the peer address.
+TRUSTED_PROXY_HOPS = int(getenv("TRUSTED_PROXY_HOPS", "0"))
+TRUSTED_PROXIES = getenv("TRUSTED_PROXIES", "")
+
+
+# Vote abuse throttling (sliding window, enforced before a vote is queued)
+VOTE_QUOTA_WINDOW_SECONDS = int(getenv("VOTE_QUOTA_WINDOW_SECONDS", "3600"))
+VOTE_FLAG_TTL_SECONDS = int(getenv("VOTE_FLAG_TTL_SECONDS", "3600"))  # how long an over-quota voter / (IP, target) stays blocked
+# kind -> (votes per voter_hash, votes per (IP, target)) per window
+VOTE_QUOTAS = {
+    "title": (int(getenv("VOTE_QUOTA_TITLE", "30")), int(getenv("VOTE_QUOTA_TITLE_PER_IP_TARGET", "5"))),
+    "description": (int(getenv("VOTE_QUOTA_DESCRIPTION", "30")), int(getenv("VOTE_QUOTA_DESCRIPTION_PER_IP_TARGET", "5"))),
+    "lesson_name": (int(getenv("VOTE_QUOTA_LESSON_NAME", "30")), int(getenv("VOTE_QUOTA_LESSON_NAME_PER_IP_TARGET", "5"))),
+    "lecturer": (int(getenv("VOTE_QUOTA_LECTURER", "30")), int(getenv("VOTE_QUOTA_LECTURER_PER_IP_TARGET", "5"))),
+    "related": (int(getenv("VOTE_QUOTA_RELATED", "120")), int(getenv("VOTE_QUOTA_RELATED_PER_IP_TARGET", "5"))),
+}
+
+
+# Vote counts are write-behind: a vote job records the vote row and bumps a Redis counter; every
+# VOTE_FLUSH_SECONDS one API process folds the buffered counts into suggestions.approval_count
+VOTE_FLUSH_SECONDS = float(getenv("VOTE_FLUSH_SECONDS", "2"))
+# Scheduled repair of approval_count drift: recount vote rows per kind in chunks of suggestion ids,
+# skipping suggestions voted on in the last VOTE_RECONCILE_GRACE_SECONDS
+VOTE_RECONCILE_INTERVAL_MINUTES = int(getenv("VOTE_RECONCILE_INTERVAL_MINUTES", "60"))
+VOTE_RECONCILE_CHUNK_SIZE = int(getenv("VOTE_RECONCILE_CHUNK_SIZE", "5000"))
+VOTE_RECONCILE_GRACE_SECONDS = float(getenv("VOTE_RECONCILE_GRACE_SECONDS", "60"))
+
+
+# Read coalescing: identical concurrent reads share one DB call; results are reused for this long (0 = off)
+SINGLEFLIGHT_CACHE_SECONDS = float(getenv("SINGLEFLIGHT_CACHE_SECONDS", "0.5"))
+
+
+# Slow-query log: statements slower than SLOW_QUERY_MS are logged; a sampled fraction of slow
+# SELECTs is re-run under EXPLAIN (ANALYZE, BUFFERS) and kept in a per-process ring buffer
+SLOW_QUERY_MS = float(getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE = float(getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+SLOW_QUERY_RING_SIZE = int(getenv("SLOW_QUERY_RING_SIZE", "50"))
+ADMIN_TOKEN = getenv("ADMIN_TOKEN")  # admin endpoints are disabled when unset
+
+
+# Tracing (OpenTelemetry): "otlp" (collector at OTEL_EXPORTER_OTLP_ENDPOINT, needs
+# opentelemetry-exporter-otlp-proto-http), "file" (JSON lines at TRACING_FILE) or "none"
+TRACING_EXPORTER = getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SERVICE_NAME = getenv("OTEL_SERVICE_NAME", "alazhar-e-learning")
@@ -0,0 +1,178 @@
+"""
+Prometheus metrics for the API, the RQ queues and workers, and the DB pool.
+
+Exposed at GET /metrics. Under gunicorn (several worker processes) set PROMETHEUS_MULTIPROC_DIR
+to an empty, writable directory for every process (API and rq worker): each process then writes
+its samples there and /metrics aggregates them; gunicorn.conf.py cleans up after exited workers.
+Queue depth and oldest-job age are read from Redis at scrape time, so they are process independent.
+"""
+import os
+import time
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template and status code",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_repo_call_duration_seconds",
+    "Duration of repository functions (connection checkout, statements and commit)",
+    ["function"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Background job runtime (RQ and scheduler jobs) by job function",
+    ["job"],
+)
+JOB_FAILURES = Counter(
+    "job_failures_total",
+    "Background jobs that raised, by job function",
+    ["job"],
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections checked out of db_pool",
+    multiprocess_mode="livesum",
+)
+POOL_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Open connections waiting in db_pool",
+    multiprocess_mode="livesum",
+)
+POOL_GETCONN_WAIT = Histogram(
+    "db_pool_getconn_seconds",
+    "Time to obtain a connection from db_pool (includes opening new connections)",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+POOL_EXHAUSTED = Counter(
+    "db_pool_exhausted_total",
+    "getconn calls that failed because every connection was in use",
+)
+VOTE_COUNTS_FLUSHED = Counter(
+    "vote_counts_flushed_total",
+    "Buffered votes folded into suggestions.approval_count",
+)
+VOTE_COUNTS_DIRECT = Counter(
+    "vote_counts_direct_total",
+    "Votes counted straight into suggestions.approval_count because the Redis buffer was unavailable",
+)
+VOTE_COUNT_CORRECTIONS = Counter(
+    "vote_count_corrections_total",
+    "Suggestions whose approval_count the reconciliation job reset to the vote row count, by kind",
+    ["kind"],
+)
+VOTE_COUNT_CORRECTION_SIZE = Histogram(
+    "vote_count_correction_votes",
+    "Size of each approval_count correction (absolute difference from the vote row count), by kind",
+    ["kind"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 1000),
+)
+
+
+def timed(fn):
+    """Record the duration of a repository function in DB_QUERY_LATENCY."""
+    histogram = DB_QUERY_LATENCY.labels(fn.__name__)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def instrumented_job(fn):
+    """Record runtime and failures of a background job. RQ still resolves the job by its original name."""
+    duration = JOB_DURATION.labels(fn.__name__)
+    failures = JOB_FAILURES.labels(fn.__name__)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            failures.inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+async def metrics_middleware(request, call_next):
+    """Latency per route template (not raw path, to keep label cardinality bounded)."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status),
+        ).observe(time.perf_counter() - start)
+
+
+class QueueCollector:
+    """Depth and oldest-job age per RQ queue, collected from Redis on each scrape."""
+
+    def describe(self):
+        # Skip the collect() the registry would otherwise run at registration time
+        return []
+
+    def collect(self):
+        from app.queues.redis_queue import suggestions_queue, video_queue
+
+        depth = GaugeMetricFamily("rq_queue_depth", "Jobs waiting in the queue", labels=["queue"])
+        age = GaugeMetricFamily("rq_queue_oldest_job_age_seconds", "Age of the oldest waiting job", labels=["queue"])
+        for queue in (suggestions_queue, video_queue):
+            try:
+                depth.add_metric([queue.name], queue.count)
+                job_ids = queue.get_job_ids(0, 1)
+                job = queue.fetch_job(job_ids[0]) if job_ids else None
+                oldest = job.enqueued_at.timestamp() if job is not None and job.enqueued_at else None
+            except Exception as e:
+                print(f"Queue metrics unavailable for {queue.name}: {e}")
+                continue
+            age.add_metric([queue.name], time.time() - oldest if oldest else 0)
+        yield depth
+        yield age
+
+
+_queue_collector = QueueCollector()
+if not MULTIPROCESS:
+    REGISTRY.register(_queue_collector)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition body and content type for GET /metrics."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_queue_collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
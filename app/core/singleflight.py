@@ -0,0 +1,62 @@
+"""
+Request coalescing for read paths.
+
+Concurrent calls to single_flight(fn, *args) with the same function and arguments share one
+execution of fn in the threadpool, so a burst of identical reads costs one pool connection and
+one query. Results may additionally be kept for a short TTL (SINGLEFLIGHT_CACHE_SECONDS) to absorb
+bursts that do not overlap exactly. Errors are shared by the waiting callers but never cached.
+
+State is per process and per event loop; fn must be a plain synchronous callable with hashable
+arguments, and callers must treat the shared result as read-only.
+"""
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import SINGLEFLIGHT_CACHE_SECONDS
+
+_MAX_CACHED = 4096
+
+_inflight: dict[tuple, asyncio.Future] = {}
+_cache: dict[tuple, tuple[float, object]] = {}
+
+
+def _key(fn, args, kwargs) -> tuple:
+    return (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+
+
+def _prune(now: float) -> None:
+    for key in [k for k, (expires, _) in _cache.items() if expires <= now]:
+        del _cache[key]
+    # Still full of live entries: drop the oldest inserted
+    while len(_cache) >= _MAX_CACHED:
+        del _cache[next(iter(_cache))]
+
+
+async def single_flight(fn, *args, ttl: float = SINGLEFLIGHT_CACHE_SECONDS, **kwargs):
+    """Run fn(*args, **kwargs) in the threadpool, sharing the call with concurrent identical requests."""
+    key = _key(fn, args, kwargs)
+    now = time.monotonic()
+
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+        _inflight[key] = task
+
+        def _done(t: asyncio.Future) -> None:
+            _inflight.pop(key, None)
+            if ttl > 0 and not t.cancelled() and t.exception() is None:
+                finished = time.monotonic()
+                if len(_cache) >= _MAX_CACHED:
+                    _prune(finished)
+                _cache[key] = (finished + ttl, t.result())
+
+        task.add_done_callback(_done)
+
+    # shield: a disconnecting client must not cancel the call the other waiters share
+    return await asyncio.shield(task)
@@ -0,0 +1,148 @@
+"""
+End-to-end tracing: API request -> enqueue -> time waiting in Redis -> RQ job -> SQL statements.
+
+The route span is created by tracing_middleware (continuing an incoming `traceparent` if any).
+enqueue_traced() injects the current context into the RQ job's meta; @traced_job resumes it in
+the worker, adds a "queue.wait" span covering the time the job sat in the queue, and wraps the job
+in a consumer span. The instrumented cursors add one span per statement. Export goes to an OTLP
+collector or to a JSON-lines file (TRACING_EXPORTER); with "none" nothing is recorded.
+
+The provider is configured lazily on first use, so the API process and the rq worker process
+each set up their own exporter without extra wiring.
+"""
+import json
+import threading
+import time
+from functools import wraps
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.config import TRACING_EXPORTER, TRACING_FILE, TRACING_SERVICE_NAME
+
+TRACING_ENABLED = TRACING_EXPORTER in ("otlp", "file")
+
+_setup_lock = threading.Lock()
+_tracer = None
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """One JSON object per finished span, appended to a local file."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(json.dumps(json.loads(span.to_json()), ensure_ascii=False) + "\n" for span in spans)
+        try:
+            with self._lock, open(self._path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Failed to write spans to {self._path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _exporter() -> SpanExporter:
+    if TRACING_EXPORTER == "file":
+        return JsonLinesSpanExporter(TRACING_FILE)
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        raise RuntimeError(
+            "TRACING_EXPORTER=otlp requires opentelemetry-exporter-otlp-proto-http"
+        ) from e
+    return OTLPSpanExporter()
+
+
+def get_tracer():
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    with _setup_lock:
+        if _tracer is None:
+            if TRACING_ENABLED:
+                provider = TracerProvider(resource=Resource.create({"service.name": TRACING_SERVICE_NAME}))
+                provider.add_span_processor(BatchSpanProcessor(_exporter()))
+                trace.set_tracer_provider(provider)
+            _tracer = trace.get_tracer("app")
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+
+async def tracing_middleware(request, call_next):
+    """Server span per request, named after the route template once routing has matched."""
+    if not TRACING_ENABLED:
+        return await call_next(request)
+    ctx = propagate.extract(dict(request.headers))
+    with get_tracer().start_as_current_span(
+        f"{request.method} {request.url.path}", context=ctx, kind=SpanKind.SERVER
+    ) as span:
+        span.set_attribute("http.request.method", request.method)
+        try:
+            response = await call_next(request)
+        finally:
+            route = request.scope.get("route")
+            if route is not None:
+                span.update_name(f"{request.method} {route.path}")
+                span.set_attribute("http.route", route.path)
+        span.set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.set_status(Status(StatusCode.ERROR))
+        return response
+
+
+def enqueue_traced(queue, fn, *args, **kwargs):
+    """queue.enqueue() that carries the current trace context in the job's meta."""
+    if not TRACING_ENABLED:
+        return queue.enqueue(fn, *args, **kwargs)
+    with get_tracer().start_as_current_span(f"enqueue {fn.__name__}", kind=SpanKind.PRODUCER) as span:
+        span.set_attribute("messaging.destination.name", queue.name)
+        carrier: dict[str, str] = {}
+        propagate.inject(carrier)
+        job = queue.enqueue(fn, *args, meta={"trace": carrier}, **kwargs)
+        span.set_attribute("messaging.message.id", job.get_id())
+        return job
+
+
+def traced_job(fn):
+    """Resume the enqueuer's trace in the worker: a queue.wait span, then a consumer span around the job."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not TRACING_ENABLED:
+            return fn(*args, **kwargs)
+        from rq import get_current_job
+
+        job = get_current_job()
+        carrier = (job.meta or {}).get("trace") if job is not None else None
+        ctx = propagate.extract(carrier or {})
+        tracer = get_tracer()
+        started_ns = time.time_ns()
+
+        if job is not None and job.enqueued_at is not None:
+            enqueued_ns = int(job.enqueued_at.timestamp() * 1e9)
+            wait = tracer.start_span("queue.wait", context=ctx, kind=SpanKind.INTERNAL, start_time=enqueued_ns)
+            wait.set_attribute("messaging.destination.name", job.origin)
+            wait.end(end_time=started_ns)
+
+        with tracer.start_as_current_span(
+            f"job {fn.__name__}", context=ctx, kind=SpanKind.CONSUMER, start_time=started_ns
+        ) as span:
+            if job is not None:
+                span.set_attribute("messaging.message.id", job.id)
+            return fn(*args, **kwargs)
+
+    return wrapper
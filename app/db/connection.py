@@ -1,13 +1,49 @@
+import time
+import uuid
+
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extensions import register_adapter
+from psycopg2.extras import UUID_adapter
 from app.core.config import USER, PASSWORD, HOST, PORT, DBNAME
+from app.core.metrics import POOL_EXHAUSTED, POOL_GETCONN_WAIT, POOL_IDLE, POOL_IN_USE
+from app.db.instrumentation import TimedCursor
+
+# Jobs pass uuid.UUID suggestion ids as query parameters. Only the adapter is registered, so uuid
+# columns still come back as strings.
+register_adapter(uuid.UUID, UUID_adapter)
+
+
+class InstrumentedConnectionPool(pool.ThreadedConnectionPool):
+    """ThreadedConnectionPool that reports checkout time, exhaustion and in-use / idle counts."""
+
+    def _report(self):
+        POOL_IN_USE.set(len(self._used))
+        POOL_IDLE.set(len(self._pool))
+
+    def getconn(self, key=None):
+        start = time.perf_counter()
+        try:
+            conn = super().getconn(key)
+        except pool.PoolError:
+            POOL_EXHAUSTED.inc()
+            raise
+        POOL_GETCONN_WAIT.observe(time.perf_counter() - start)
+        self._report()
+        return conn
+
+    def putconn(self, conn=None, key=None, close=False):
+        super().putconn(conn, key, close)
+        self._report()
+
 
-db_pool = psycopg2.pool.ThreadedConnectionPool(
+db_pool = InstrumentedConnectionPool(
     minconn=5,
     maxconn=50,
     host=HOST,
     dbname=DBNAME,
     user=USER,
     password=PASSWORD,
-    port=PORT
-)
\ No newline at end of file
+    port=PORT,
+    cursor_factory=TimedCursor,  # every conn.cursor() is timed; see app/db/instrumentation.py
+)
@@ -0,0 +1,173 @@
+"""
+Query instrumentation for every cursor the repository opens.
+
+TimedCursor / TimedRealDictCursor time each execute() and record, per statement fingerprint
+(the SQL with literals and value lists collapsed, or the prepared statement name), the call count,
+total / max duration and rows. Statements slower than SLOW_QUERY_MS are logged. For a sampled
+fraction (SLOW_QUERY_EXPLAIN_SAMPLE) of slow read-only statements the query is re-run under
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) inside a savepoint and the plan is kept in a ring buffer
+of SLOW_QUERY_RING_SIZE entries. Stats and plans are per process (API and worker separately).
+When tracing is enabled each statement is also a child span of the current request or job.
+"""
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from psycopg2.extensions import cursor as _base_cursor
+from psycopg2.extras import RealDictCursor
+
+from opentelemetry.trace import SpanKind
+
+from app.core.config import SLOW_QUERY_EXPLAIN_SAMPLE, SLOW_QUERY_MS, SLOW_QUERY_RING_SIZE
+from app.core.tracing import TRACING_ENABLED, get_tracer
+from app.db.statements import get_statement
+
+_MAX_FINGERPRINTS = 1000
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_VALUE_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROW_LISTS = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+_SPACES = re.compile(r"\s+")
+_EXECUTE = re.compile(r"^EXECUTE (\w+)", re.IGNORECASE)
+_WRITES = re.compile(r"\b(?:INSERT|UPDATE|DELETE|FOR UPDATE|PG_ADVISORY\w*)\b")
+
+_lock = threading.Lock()
+_stats: dict[str, list] = {}  # fingerprint id -> [fingerprint, calls, total_ms, max_ms, rows]
+_explains: deque = deque(maxlen=SLOW_QUERY_RING_SIZE)
+
+
+def fingerprint(query) -> str:
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    query = _SPACES.sub(" ", query).strip()
+    execute = _EXECUTE.match(query)
+    if execute:
+        return f"EXECUTE {execute.group(1)}"
+    query = _NUMBERS.sub("?", _STRINGS.sub("?", query))
+    return _ROW_LISTS.sub(r"\1, ...", _VALUE_LISTS.sub("?, ...", query))
+
+
+def _fingerprint_id(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def _is_read_only(query) -> bool:
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    head = query.lstrip()
+    execute = _EXECUTE.match(head)
+    if execute:
+        stmt = get_statement(execute.group(1))
+        head = stmt.sql.lstrip() if stmt is not None else ""
+    head = head.lstrip("( \n").upper()
+    if not (head.startswith("SELECT") or head.startswith("WITH")):
+        return False
+    return _WRITES.search(head) is None
+
+
+def _record(text: str, elapsed_ms: float, rows: int) -> str:
+    fid = _fingerprint_id(text)
+    with _lock:
+        entry = _stats.get(fid)
+        if entry is None:
+            if len(_stats) >= _MAX_FINGERPRINTS:
+                return fid
+            entry = _stats[fid] = [text, 0, 0.0, 0.0, 0]
+        entry[1] += 1
+        entry[2] += elapsed_ms
+        entry[3] = max(entry[3], elapsed_ms)
+        entry[4] += max(rows, 0)
+    return fid
+
+
+def _capture_explain(conn, query, vars, fid: str, text: str, elapsed_ms: float, rows: int) -> None:
+    """Re-run the statement under EXPLAIN ANALYZE. A savepoint keeps failures out of the caller's transaction."""
+    in_transaction = not conn.autocommit
+    cur = _base_cursor(conn)
+    try:
+        if in_transaction:
+            cur.execute("SAVEPOINT slow_query_explain")
+        if isinstance(query, bytes):
+            query = query.decode("utf-8")
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, vars)
+        plan = cur.fetchone()[0]
+        if in_transaction:
+            cur.execute("RELEASE SAVEPOINT slow_query_explain")
+    except Exception as e:
+        print(f"EXPLAIN capture failed for {fid}: {e}")
+        if in_transaction:
+            cur.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+        return
+    finally:
+        cur.close()
+    _explains.append({
+        "fingerprint_id": fid,
+        "fingerprint": text,
+        "duration_ms": round(elapsed_ms, 3),
+        "rows": rows,
+        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "plan": plan,
+    })
+
+
+class _TimedMixin:
+    def execute(self, query, vars=None):
+        text = fingerprint(query)
+        if not TRACING_ENABLED:
+            return self._timed_execute(query, vars, text)
+        name = text if text.startswith("EXECUTE ") else text.split(" ", 1)[0].upper()
+        with get_tracer().start_as_current_span(f"db {name}", kind=SpanKind.CLIENT) as span:
+            span.set_attribute("db.system", "postgresql")
+            span.set_attribute("db.query.text", text[:2000])
+            result = self._timed_execute(query, vars, text)
+            span.set_attribute("db.response.returned_rows", self.rowcount)
+            return result
+
+    def _timed_execute(self, query, vars, text: str):
+        start = time.perf_counter()
+        result = super().execute(query, vars)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        fid = _record(text, elapsed_ms, self.rowcount)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            print(f"Slow query {fid} ({elapsed_ms:.1f} ms, {self.rowcount} rows): {text[:500]}")
+            if random.random() < SLOW_QUERY_EXPLAIN_SAMPLE and _is_read_only(query):
+                _capture_explain(self.connection, query, vars, fid, text, elapsed_ms, self.rowcount)
+        return result
+
+
+class TimedCursor(_TimedMixin, _base_cursor):
+    pass
+
+
+class TimedRealDictCursor(_TimedMixin, RealDictCursor):
+    pass
+
+
+def query_stats(limit: int = 50) -> list[dict]:
+    """Fingerprints ordered by total time spent."""
+    with _lock:
+        entries = [(fid, *entry) for fid, entry in _stats.items()]
+    entries.sort(key=lambda e: e[3], reverse=True)
+    return [
+        {
+            "fingerprint_id": fid,
+            "fingerprint": text,
+            "calls": calls,
+            "total_ms": round(total_ms, 3),
+            "avg_ms": round(total_ms / calls, 3) if calls else 0.0,
+            "max_ms": round(max_ms, 3),
+            "rows": rows,
+        }
+        for fid, text, calls, total_ms, max_ms, rows in entries[:limit]
+    ]
+
+
+def captured_explains() -> list[dict]:
+    """Most recent EXPLAIN captures, newest first."""
+    return list(reversed(_explains))
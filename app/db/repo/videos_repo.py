@@ -1,47 +1,151 @@
+import csv
+import hashlib
+import io
+from dataclasses import replace
 from typing import List
 
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import execute_values
 
-from typing import Optional
+from typing import Iterator, Optional
 from uuid import UUID
 from datetime import datetime
 from app.db.connection import db_pool
+from app.db.statements import register_statement, execute_prepared
+from app.db.instrumentation import TimedRealDictCursor
+from app.core.metrics import timed
+from app.core.config import (
+    CONSENSUS_MIN_VOTES,
+    CONSENSUS_MIN_MARGIN,
+    CONSENSUS_TIE_BREAK,
+    RELATED_MIN_VOTES,
+    RELATED_MIN_MARGIN,
+)
 from app.domain.youtube import YouTubeVideo
 from app.schemas.video_info import VideoInfo
+from app.mappers.video_mapper import row_to_suggestion
 from app.domain.models import (
+    CatalogVideo,
+    ResolvedVideo,
     SuggestionVideo,
-    titleSuggestions,
-    descriptionSuggestions,
-    lessonNameSuggestions,
-    lecturerSuggestions,
     relatedSuggestion,
 )
+from app.domain.suggestion_kinds import (
+    CONSENSUS_KINDS,
+    NOT_RELATED,
+    RELATED,
+    RELATED_KIND,
+    SEARCHABLE_KINDS,
+    SUGGESTION_KINDS,
+)
 
 
 # -------------------------------------------------------------------
-# Query helpers
+# Prepared statements (hot paths: top-N lookups, vote dedupe, catalog)
 # -------------------------------------------------------------------
 
-def row_to_suggestion(row: dict) -> SuggestionVideo:
+def voter_key(voter_hash: str) -> bytes:
+    """
+    Fixed-width (16-byte) form of a client-supplied voter_hash as stored in suggestion_votes.
+    Must match the voter_key() SQL function used to migrate existing rows.
+    """
+    return hashlib.sha256(voter_hash.encode("utf-8")).digest()[:16]
+
+
+register_statement(
+    "suggestions_top_n",
+    ("text", "text", "int"),
+    """
+    SELECT id, video_id, text, approval_count, created_at
+    FROM suggestions
+    WHERE video_id = $1 AND kind = $2
+    ORDER BY approval_count DESC, created_at DESC
+    LIMIT $3
+    """,
+)
+
+register_statement(
+    "suggestions_hot_n",
+    ("text", "text", "int"),
     """
-    Convert a DB row dict into a SuggestionVideo domain model.
+    SELECT id, video_id, text, approval_count, created_at
+    FROM suggestions
+    WHERE video_id = $1 AND kind = $2
+    ORDER BY score DESC
+    LIMIT $3
+    """,
+)
+
+# Records a vote without touching the suggestion row (its count is write-behind, see
+# app.services.vote_counts); no row when the voter already voted or the id is not of that kind
+register_statement(
+    "suggestion_vote_insert",
+    ("uuid", "text", "bytea"),
     """
-    return SuggestionVideo(**row)
+    WITH s AS (
+        SELECT id, video_id, text, approval_count, created_at
+        FROM suggestions
+        WHERE id = $1 AND kind = $2
+    ), v AS (
+        INSERT INTO suggestion_votes (suggestion_id, voter_hash)
+        SELECT id, $3 FROM s
+        ON CONFLICT DO NOTHING
+        RETURNING suggestion_id
+    )
+    SELECT s.id, s.video_id, s.text, s.approval_count, s.created_at
+    FROM s JOIN v ON v.suggestion_id = s.id
+    """,
+)
+
+register_statement(
+    "related_by_video",
+    ("text",),
+    """
+    SELECT id, video_id, text = 'related' AS is_related, approval_count, created_at
+    FROM suggestions
+    WHERE video_id = $1 AND kind = 'related'
+    ORDER BY is_related DESC
+    """,
+)
+
+register_statement(
+    "catalog_all",
+    (),
+    """
+    SELECT video_id, title, published_at, created_at
+    FROM video_info
+    ORDER BY published_at DESC NULLS LAST
+    """,
+)
+
+register_statement(
+    "catalog_related",
+    (),
+    """
+    SELECT v.video_id, v.title, v.published_at, v.created_at
+    FROM video_info v
+    INNER JOIN suggestion_video_info s ON s.video_id = v.video_id
+    WHERE s.is_related_video
+    ORDER BY v.published_at DESC NULLS LAST
+    """,
+)
+
+
+_RANK_STATEMENTS = {"top": "suggestions_top_n", "hot": "suggestions_hot_n"}
 
 
 # -------------------------------------------------------------------
 # Read operations
 # -------------------------------------------------------------------
+@timed
 def get_all_suggest_videos():
     """Fetch all videos from the database."""
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
             cur.execute(
-                """
-                SELECT
-                    *
-                FROM suggestion_video_info 
+                f"""
+                SELECT {", ".join(SuggestionVideo.columns)}
+                FROM suggestion_video_info
                 WHERE is_related_video = TRUE
                 """
             )
@@ -51,6 +155,7 @@ def get_all_suggest_videos():
         db_pool.putconn(conn)
 
 
+@timed
 def get_suggest_videos(ids: List[str]) -> List[SuggestionVideo]:
     """
     Fetch suggestion videos by video_id.
@@ -60,7 +165,7 @@ def get_suggest_videos(ids: List[str]) -> List[SuggestionVideo]:
 
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT
@@ -71,7 +176,8 @@ def get_suggest_videos(ids: List[str]) -> List[SuggestionVideo]:
                     lecture_title,
                     lesson_name,
                     batch,
-                    is_related_video
+                    is_related_video,
+                    lecturer_name
                 FROM suggestion_video_info
                 WHERE video_id = ANY(%s)
                 AND is_related_video = TRUE
@@ -88,6 +194,7 @@ def get_suggest_videos(ids: List[str]) -> List[SuggestionVideo]:
 # Write operations
 # -------------------------------------------------------------------
 
+@timed
 def insert_suggestion_videos(videos: List[VideoInfo]) -> None:
     """
     Insert suggested video metadata.
@@ -98,13 +205,14 @@ def insert_suggestion_videos(videos: List[VideoInfo]) -> None:
     values = [
         (
             v.video_id,
-            v.main_level,
-            v.common_sub_level,
-            v.specialized_level,
+            v.main_level.value if v.main_level else None,
+            v.common_sub_level.value if v.common_sub_level else None,
+            v.specialized_level.value if v.specialized_level else None,
             v.lecture_title,
             v.lesson_name,
             v.batch,
-            v.is_related_video
+            v.is_related_video,
+            v.lecturer_name,
         )
         for v in videos
     ]
@@ -123,7 +231,8 @@ def insert_suggestion_videos(videos: List[VideoInfo]) -> None:
                     lecture_title,
                     lesson_name,
                     batch,
-                    is_related_video
+                    is_related_video,
+                    lecturer_name
                 )
                 VALUES %s
                 ON CONFLICT (video_id) DO NOTHING
@@ -138,12 +247,13 @@ def insert_suggestion_videos(videos: List[VideoInfo]) -> None:
         db_pool.putconn(conn)
 
 
-def insert_youtube_videos(videos: List[YouTubeVideo]) -> None:
+@timed
+def insert_youtube_videos(videos: List[YouTubeVideo]) -> List[str]:
     """
-    Insert YouTube video base metadata.
+    Insert YouTube video base metadata. Returns the ids of videos that were not already stored.
     """
     if not videos:
-        return
+        return []
 
     values = [
         (
@@ -157,7 +267,7 @@ def insert_youtube_videos(videos: List[YouTubeVideo]) -> None:
     conn = db_pool.getconn()
     try:
         with conn.cursor() as cur:
-            execute_values(
+            inserted = execute_values(
                 cur,
                 """
                 INSERT INTO video_info (
@@ -167,10 +277,13 @@ def insert_youtube_videos(videos: List[YouTubeVideo]) -> None:
                 )
                 VALUES %s
                 ON CONFLICT (video_id) DO NOTHING
+                RETURNING video_id
                 """,
                 values,
+                fetch=True,
             )
         conn.commit()
+        return [r[0] for r in inserted]
     except Exception:
         conn.rollback()
         raise
@@ -178,6 +291,7 @@ def insert_youtube_videos(videos: List[YouTubeVideo]) -> None:
         db_pool.putconn(conn)
 
 
+@timed
 def get_videos_count() -> int:
     conn = db_pool.getconn()
     try:
@@ -189,60 +303,74 @@ def get_videos_count() -> int:
         db_pool.putconn(conn)
 
 
-def get_videos_for_catalog(related_only: bool = False):
-    """List videos from video_info. If related_only=True, only videos users have marked as related (related votes > not_related)."""
+@timed
+def get_videos_for_catalog(
+    related_only: bool = False,
+    main_level: Optional[str] = None,
+    common_sub_level: Optional[str] = None,
+    specialized_level: Optional[str] = None,
+) -> List[CatalogVideo]:
+    """List videos from video_info. If related_only=True, only videos whose related verdict is related
+    (suggestion_video_info.is_related_video, the same rows the related_only facets count).
+    Level filters match suggestion_video_info (enum values)."""
+    levels = {
+        "main_level": main_level,
+        "common_sub_level": common_sub_level,
+        "specialized_level": specialized_level,
+    }
+    levels = {col: value for col, value in levels.items() if value is not None}
+
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if related_only:
+        with conn.cursor() as cur:
+            if not levels:
+                execute_prepared(cur, "catalog_related" if related_only else "catalog_all")
+            else:
+                conditions = " AND ".join(f"s.{col} = %({col})s" for col in levels)
+                if related_only:
+                    conditions += " AND s.is_related_video"
                 cur.execute(
-                    """
+                    f"""
                     SELECT v.video_id, v.title, v.published_at, v.created_at
                     FROM video_info v
-                    INNER JOIN (
-                        SELECT video_id
-                        FROM related_suggestions
-                        GROUP BY video_id
-                        HAVING COALESCE(SUM(CASE WHEN is_related THEN approval_count ELSE 0 END), 0)
-                             > COALESCE(SUM(CASE WHEN NOT is_related THEN approval_count ELSE 0 END), 0)
-                    ) r ON r.video_id = v.video_id
+                    INNER JOIN suggestion_video_info s ON s.video_id = v.video_id
+                    WHERE {conditions}
                     ORDER BY v.published_at DESC NULLS LAST
-                    """
+                    """,
+                    levels,
                 )
-            else:
-                cur.execute(
-                    """
-                    SELECT video_id, title, published_at, created_at
-                    FROM video_info
-                    ORDER BY published_at DESC NULLS LAST
-                    """
-                )
-            rows = cur.fetchall()
-            return [dict(r) for r in rows]
+            return [CatalogVideo(*r) for r in cur.fetchall()]
     finally:
         db_pool.putconn(conn)
 
 
 # -------------------------------------------------------------------
-# Title Suggestions Operations
+# Catalog facets (rollup of suggestion_video_info level values)
 # -------------------------------------------------------------------
 
-def create_title_suggestion(video_id: str, title_text: str) -> titleSuggestions:
-    """Create a new title suggestion."""
+@timed
+def rebuild_catalog_facets() -> None:
+    """Recount catalog_facets from scratch (initial backfill or repair)."""
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
+            cur.execute("LOCK TABLE catalog_facets IN EXCLUSIVE MODE")
+            cur.execute("DELETE FROM catalog_facets")
             cur.execute(
                 """
-                INSERT INTO title_suggestions (video_id, title_text, approval_count)
-                VALUES (%s, %s, 0)
-                RETURNING id, video_id, title_text, approval_count, created_at
-                """,
-                (video_id, title_text)
+                INSERT INTO catalog_facets (facet, value, is_related, video_count)
+                SELECT f.facet, f.value, COALESCE(s.is_related_video, FALSE), COUNT(*)
+                FROM suggestion_video_info s
+                CROSS JOIN LATERAL (VALUES
+                    ('main_level', s.main_level),
+                    ('common_sub_level', s.common_sub_level),
+                    ('specialized_level', s.specialized_level)
+                ) AS f(facet, value)
+                WHERE f.value IS NOT NULL
+                GROUP BY f.facet, f.value, COALESCE(s.is_related_video, FALSE)
+                """
             )
-            row = cur.fetchone()
-            conn.commit()
-            return titleSuggestions(**row)
+        conn.commit()
     except Exception:
         conn.rollback()
         raise
@@ -250,63 +378,111 @@ def create_title_suggestion(video_id: str, title_text: str) -> titleSuggestions:
         db_pool.putconn(conn)
 
 
-def get_title_suggestions_by_video(video_id: str, limit: int = 5) -> List[titleSuggestions]:
-    """Get top N title suggestions for a video (default 5)."""
+register_statement(
+    "catalog_facets",
+    ("bool",),
+    """
+    SELECT facet, value, SUM(video_count) AS video_count
+    FROM catalog_facets
+    WHERE is_related OR NOT $1
+    GROUP BY facet, value
+    HAVING SUM(video_count) > 0
+    """,
+)
+
+
+@timed
+def get_catalog_facets(related_only: bool = False) -> dict[str, dict[str, int]]:
+    """Video counts per level value: {"main_level": {value: count}, ...}. related_only counts only is_related_video rows."""
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, video_id, title_text, approval_count, created_at
-                FROM title_suggestions
-                WHERE video_id = %s
-                ORDER BY approval_count DESC, created_at DESC
-                LIMIT %s
-                """,
-                (video_id, limit)
-            )
-            rows = cur.fetchall()
-            return [titleSuggestions(**row) for row in rows]
+        with conn.cursor() as cur:
+            execute_prepared(cur, "catalog_facets", (related_only,))
+            facets: dict[str, dict[str, int]] = {
+                "main_level": {},
+                "common_sub_level": {},
+                "specialized_level": {},
+            }
+            for facet, value, count in cur.fetchall():
+                facets[facet][value] = int(count)
+            return facets
     finally:
         db_pool.putconn(conn)
 
 
-def vote_title_suggestion(title_suggestion_id: UUID, voter_hash: str) -> bool:
-    """Vote on a title suggestion. Returns True if vote was added, False if already voted."""
+# -------------------------------------------------------------------
+# Curated metadata bulk load / backup (COPY)
+# -------------------------------------------------------------------
+
+_CURATED_COLUMNS = ", ".join(SuggestionVideo.columns)
+# Names of a staged row's non-NULL fields (suggestion_video_info.curated_columns)
+_CURATED_SET = "ARRAY_REMOVE(ARRAY[{}]::TEXT[], NULL)".format(
+    ", ".join(f"CASE WHEN {c} IS NOT NULL THEN '{c}' END" for c in SuggestionVideo.columns[1:])
+)
+
+
+@timed
+def bulk_merge_curated_metadata(rows: List[tuple], overwrite: bool = False) -> dict:
+    """
+    Merge curated suggestion_video_info rows (tuples in SuggestionVideo.columns order, one per
+    video_id) in a single transaction: COPY into a temp staging table, drop rows whose video is not
+    in video_info, then upsert. With overwrite=False a NULL field keeps the stored value; with
+    overwrite=True it clears it. Every non-NULL field is recorded in curated_columns, which the
+    consensus projection does not overwrite. Facet counts follow via the catalog_facets trigger.
+    Returns {"inserted", "updated", "unknown": [video_id, ...]}.
+    """
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)   # None -> unquoted empty field -> NULL
+    buf.seek(0)
+
+    if overwrite:
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in SuggestionVideo.columns[1:])
+        curated = "EXCLUDED.curated_columns"
+    else:
+        updates = ", ".join(f"{c} = COALESCE(EXCLUDED.{c}, suggestion_video_info.{c})" for c in SuggestionVideo.columns[1:])
+        curated = (
+            "ARRAY(SELECT DISTINCT unnest(suggestion_video_info.curated_columns || EXCLUDED.curated_columns) ORDER BY 1)"
+        )
+
     conn = db_pool.getconn()
     try:
         with conn.cursor() as cur:
-            # Check if already voted
+            cur.execute(
+                f"CREATE TEMP TABLE curated_staging ON COMMIT DROP AS "
+                f"SELECT {_CURATED_COLUMNS} FROM suggestion_video_info WITH NO DATA"
+            )
+            cur.copy_expert(f"COPY curated_staging ({_CURATED_COLUMNS}) FROM STDIN WITH (FORMAT csv)", buf)
             cur.execute(
                 """
-                SELECT id FROM title_votes
-                WHERE title_suggestion_id = %s AND voter_hash = %s
-                """,
-                (title_suggestion_id, voter_hash)
+                DELETE FROM curated_staging c
+                WHERE NOT EXISTS (SELECT 1 FROM video_info v WHERE v.video_id = c.video_id)
+                RETURNING c.video_id
+                """
             )
-            if cur.fetchone():
-                return False
-            
-            # Add vote
+            unknown = sorted(r[0] for r in cur.fetchall())
+            cur.execute("SELECT video_id FROM curated_staging")
+            ids = [r[0] for r in cur.fetchall()]
+
+            # Same per-video lock as project_video_consensus, so a projection never decides on a
+            # row (or curated_columns) the import is about to change; taken in one fixed order so
+            # two imports cannot deadlock
             cur.execute(
                 """
-                INSERT INTO title_votes (title_suggestion_id, voter_hash)
-                VALUES (%s, %s)
-                """,
-                (title_suggestion_id, voter_hash)
+                SELECT pg_advisory_xact_lock(h)
+                FROM (SELECT DISTINCT hashtext(video_id) AS h FROM curated_staging ORDER BY h) locks
+                """
             )
-            
-            # Update approval count
             cur.execute(
+                f"""
+                INSERT INTO suggestion_video_info ({_CURATED_COLUMNS}, curated_columns)
+                SELECT {_CURATED_COLUMNS}, {_CURATED_SET} FROM curated_staging ORDER BY video_id
+                ON CONFLICT (video_id) DO UPDATE SET {updates}, curated_columns = {curated}
+                RETURNING (xmax = 0)
                 """
-                UPDATE title_suggestions
-                SET approval_count = approval_count + 1
-                WHERE id = %s
-                """,
-                (title_suggestion_id,)
             )
-            conn.commit()
-            return True
+            inserted = sum(1 for (is_insert,) in cur.fetchall() if is_insert)
+        conn.commit()
+        return {"inserted": inserted, "updated": len(ids) - inserted, "unknown": unknown}
     except Exception:
         conn.rollback()
         raise
@@ -314,26 +490,46 @@ def vote_title_suggestion(title_suggestion_id: UUID, voter_hash: str) -> bool:
         db_pool.putconn(conn)
 
 
+@timed
+def copy_curated_metadata_out(out) -> int:
+    """Write every suggestion_video_info row as CSV with a header (SuggestionVideo.columns) to a text file. Returns the row count."""
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(
+                f"COPY (SELECT {_CURATED_COLUMNS} FROM suggestion_video_info ORDER BY video_id) "
+                "TO STDOUT WITH (FORMAT csv, HEADER)",
+                out,
+            )
+            count = cur.rowcount
+        conn.rollback()
+        return count
+    finally:
+        db_pool.putconn(conn)
+
+
 # -------------------------------------------------------------------
-# Description Suggestions Operations
+# Suggestions (one table for every kind in app.domain.suggestion_kinds)
 # -------------------------------------------------------------------
 
-def create_description_suggestion(video_id: str, description_text: str) -> descriptionSuggestions:
-    """Create a new description suggestion."""
+@timed
+def create_suggestion(kind: str, video_id: str, text: str):
+    """Create a suggestion of the given kind. Returns the kind's row type."""
+    model = SUGGESTION_KINDS[kind].model
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO description_suggestions (video_id, description_text, approval_count)
-                VALUES (%s, %s, 0)
-                RETURNING id, video_id, description_text, approval_count, created_at
+                INSERT INTO suggestions (kind, video_id, text)
+                VALUES (%s, %s, %s)
+                RETURNING id, video_id, text, approval_count, created_at
                 """,
-                (video_id, description_text)
+                (kind, video_id, text)
             )
             row = cur.fetchone()
             conn.commit()
-            return descriptionSuggestions(**row)
+            return model(*row)
     except Exception:
         conn.rollback()
         raise
@@ -341,63 +537,54 @@ def create_description_suggestion(video_id: str, description_text: str) -> descr
         db_pool.putconn(conn)
 
 
-def get_description_suggestions_by_video(video_id: str, limit: int = 5) -> List[descriptionSuggestions]:
-    """Get top N description suggestions for a video (default 5)."""
+@timed
+def get_suggestions_by_video(kind: str, video_id: str, limit: int = 5, rank: str = "top") -> list:
+    """Get top N suggestions of a kind for a video (default 5). rank="top" orders by votes, rank="hot" by the stored time-decayed score."""
+    model = SUGGESTION_KINDS[kind].model
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, video_id, description_text, approval_count, created_at
-                FROM description_suggestions
-                WHERE video_id = %s
-                ORDER BY approval_count DESC, created_at DESC
-                LIMIT %s
-                """,
-                (video_id, limit)
-            )
-            rows = cur.fetchall()
-            return [descriptionSuggestions(**row) for row in rows]
+        with conn.cursor() as cur:
+            execute_prepared(cur, _RANK_STATEMENTS[rank], (video_id, kind, limit))
+            return [model(*r) for r in cur.fetchall()]
     finally:
         db_pool.putconn(conn)
 
 
-def vote_description_suggestion(description_suggestion_id: UUID, voter_hash: str) -> bool:
-    """Vote on a description suggestion. Returns True if vote was added, False if already voted."""
+@timed
+def get_suggestions_by_ids(kind: str, video_id: str, ids: List[str]) -> list:
+    """Get the given suggestions of a kind for a video (ids of other kinds / videos are ignored)."""
+    if not ids:
+        return []
+    model = SUGGESTION_KINDS[kind].model
     conn = db_pool.getconn()
     try:
         with conn.cursor() as cur:
-            # Check if already voted
-            cur.execute(
-                """
-                SELECT id FROM description_votes
-                WHERE description_suggestion_id = %s AND voter_hash = %s
-                """,
-                (description_suggestion_id, voter_hash)
-            )
-            if cur.fetchone():
-                return False
-            
-            # Add vote
             cur.execute(
                 """
-                INSERT INTO description_votes (description_suggestion_id, voter_hash)
-                VALUES (%s, %s)
+                SELECT id, video_id, text, approval_count, created_at
+                FROM suggestions
+                WHERE id = ANY(%s::uuid[]) AND video_id = %s AND kind = %s
                 """,
-                (description_suggestion_id, voter_hash)
+                (list(ids), video_id, kind)
             )
-            
-            # Update approval count
-            cur.execute(
-                """
-                UPDATE description_suggestions
-                SET approval_count = approval_count + 1
-                WHERE id = %s
-                """,
-                (description_suggestion_id,)
-            )
-            conn.commit()
-            return True
+            return [model(*r) for r in cur.fetchall()]
+    finally:
+        db_pool.putconn(conn)
+
+
+def _record_vote(kind: str, suggestion_id: UUID, voter_hash: str) -> Optional[tuple]:
+    """
+    Insert the (suggestion, voter) row. Returns (id, video_id, text, approval_count, created_at)
+    with the stored count (not including this vote), or None if the voter already voted or
+    suggestion_id is not a suggestion of this kind.
+    """
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            execute_prepared(cur, "suggestion_vote_insert", (suggestion_id, kind, voter_key(voter_hash)))
+            row = cur.fetchone()
+        conn.commit()
+        return row
     except Exception:
         conn.rollback()
         raise
@@ -405,25 +592,61 @@ def vote_description_suggestion(description_suggestion_id: UUID, voter_hash: str
         db_pool.putconn(conn)
 
 
-# -------------------------------------------------------------------
-# Lesson name suggestions
-# -------------------------------------------------------------------
+@timed
+def vote_suggestion(kind: str, suggestion_id: UUID, voter_hash: str):
+    """
+    Vote on a suggestion. Returns the suggestion (the kind's row type) if the vote was added, None if
+    already voted. approval_count is the stored count: the caller adds the vote to the write-behind
+    counter (app.services.vote_counts.count_vote).
+    """
+    row = _record_vote(kind, suggestion_id, voter_hash)
+    return SUGGESTION_KINDS[kind].model(*row) if row else None
+
 
-def create_lesson_name_suggestion(video_id: str, lesson_name_text: str) -> lessonNameSuggestions:
+@timed
+def add_approval_counts(deltas: dict[str, int], batch_id: Optional[UUID] = None) -> Optional[List[tuple]]:
+    """
+    Add vote counts ({suggestion id: votes}) to approval_count and refresh the hot score, in one
+    statement. Returns (id, kind, video_id, text, approval_count, txid) for every updated suggestion.
+    With a batch_id the batch is recorded in vote_count_flush in the same transaction; None is
+    returned (and nothing changed) if that batch was already the last one applied.
+    """
+    if not deltas:
+        return []
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(
+        with conn.cursor() as cur:
+            if batch_id is not None:
+                cur.execute(
+                    """
+                    INSERT INTO vote_count_flush (singleton, last_batch) VALUES (TRUE, %s)
+                    ON CONFLICT (singleton) DO UPDATE
+                    SET last_batch = EXCLUDED.last_batch, applied_at = NOW()
+                    WHERE vote_count_flush.last_batch IS DISTINCT FROM EXCLUDED.last_batch
+                    RETURNING last_batch
+                    """,
+                    (batch_id,)
+                )
+                if cur.fetchone() is None:
+                    conn.rollback()
+                    return None
+            rows = execute_values(
+                cur,
                 """
-                INSERT INTO lesson_name_suggestions (video_id, lesson_name_text, approval_count)
-                VALUES (%s, %s, 0)
-                RETURNING id, video_id, lesson_name_text, approval_count, created_at
+                UPDATE suggestions s
+                SET approval_count = s.approval_count + d.delta,
+                    score = suggestion_hot_score(s.approval_count + d.delta, s.created_at)
+                FROM (VALUES %s) AS d(id, delta)
+                WHERE s.id = d.id
+                RETURNING s.id, s.kind, s.video_id, s.text, s.approval_count, txid_current()
                 """,
-                (video_id, lesson_name_text)
+                sorted(deltas.items()),
+                template="(%s::uuid, %s)",
+                page_size=1000,
+                fetch=True,
             )
-            row = cur.fetchone()
-            conn.commit()
-            return lessonNameSuggestions(**row)
+        conn.commit()
+        return rows
     except Exception:
         conn.rollback()
         raise
@@ -431,45 +654,66 @@ def create_lesson_name_suggestion(video_id: str, lesson_name_text: str) -> lesso
         db_pool.putconn(conn)
 
 
-def get_lesson_name_suggestions_by_video(video_id: str, limit: int = 5) -> List[lessonNameSuggestions]:
-    """Get top N lesson name suggestions for a video (default 5)."""
+@timed
+def count_suggestion_votes(kind: str, after_id: Optional[UUID], limit: int, recent_seconds: float) -> List[tuple]:
+    """
+    Next chunk of suggestions of a kind by id (after after_id; from the start when None), with their
+    vote rows counted. Returns (id, approval_count, votes, has a vote in the last recent_seconds).
+    """
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT id, video_id, lesson_name_text, approval_count, created_at
-                FROM lesson_name_suggestions WHERE video_id = %s
-                ORDER BY approval_count DESC, created_at DESC
-                LIMIT %s
+                WITH chunk AS (
+                    SELECT id, approval_count FROM suggestions
+                    WHERE kind = %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                )
+                SELECT c.id, c.approval_count, count(v.suggestion_id)::int,
+                       coalesce(max(v.created_at) > NOW() - make_interval(secs => %s), false)
+                FROM chunk c
+                LEFT JOIN suggestion_votes v ON v.suggestion_id = c.id
+                GROUP BY c.id, c.approval_count
+                ORDER BY c.id
                 """,
-                (video_id, limit)
+                (kind, after_id or UUID(int=0), limit, recent_seconds)
             )
-            return [lessonNameSuggestions(**r) for r in cur.fetchall()]
+            return cur.fetchall()
     finally:
         db_pool.putconn(conn)
 
 
-def vote_lesson_name_suggestion(suggestion_id: UUID, voter_hash: str) -> bool:
+@timed
+def set_approval_counts(corrections: List[tuple]) -> List[tuple]:
+    """
+    Overwrite approval_count (and the hot score) for (id, expected current count, new count) rows,
+    skipping rows whose count no longer matches the expected one. Returns
+    (id, kind, video_id, text, approval_count, txid) for every updated suggestion.
+    """
+    if not corrections:
+        return []
     conn = db_pool.getconn()
     try:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id FROM lesson_name_votes WHERE lesson_name_suggestion_id = %s AND voter_hash = %s",
-                (suggestion_id, voter_hash)
-            )
-            if cur.fetchone():
-                return False
-            cur.execute(
-                "INSERT INTO lesson_name_votes (lesson_name_suggestion_id, voter_hash) VALUES (%s, %s)",
-                (suggestion_id, voter_hash)
-            )
-            cur.execute(
-                "UPDATE lesson_name_suggestions SET approval_count = approval_count + 1 WHERE id = %s",
-                (suggestion_id,)
+            rows = execute_values(
+                cur,
+                """
+                UPDATE suggestions s
+                SET approval_count = d.count,
+                    score = suggestion_hot_score(d.count, s.created_at)
+                FROM (VALUES %s) AS d(id, expected, count)
+                WHERE s.id = d.id AND s.approval_count = d.expected
+                RETURNING s.id, s.kind, s.video_id, s.text, s.approval_count, txid_current()
+                """,
+                sorted(corrections),
+                template="(%s::uuid, %s, %s)",
+                page_size=1000,
+                fetch=True,
             )
-            conn.commit()
-            return True
+        conn.commit()
+        return rows
     except Exception:
         conn.rollback()
         raise
@@ -478,24 +722,51 @@ def vote_lesson_name_suggestion(suggestion_id: UUID, voter_hash: str) -> bool:
 
 
 # -------------------------------------------------------------------
-# Lecturer name suggestions
+# Related (is_related): users vote whether the video is related or not
 # -------------------------------------------------------------------
 
-def create_lecturer_suggestion(video_id: str, lecturer_name_text: str) -> lecturerSuggestions:
+def _related_row(row: tuple) -> relatedSuggestion:
+    suggestion_id, video_id, text, approval_count, created_at = row
+    return relatedSuggestion(suggestion_id, video_id, text == RELATED, approval_count, created_at)
+
+
+@timed
+def get_related_suggestions_by_video(video_id: str) -> List[relatedSuggestion]:
+    """Get the two options (related / not_related) and their vote counts for a video."""
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
+            execute_prepared(cur, "related_by_video", (video_id,))
+            return [relatedSuggestion(*r) for r in cur.fetchall()]
+    finally:
+        db_pool.putconn(conn)
+
+
+@timed
+def get_or_create_related_suggestion(video_id: str, is_related: bool) -> relatedSuggestion:
+    """Get or create the (video_id, is_related) row and return it."""
+    text = RELATED if is_related else NOT_RELATED
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO suggestions (kind, video_id, text)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (video_id, text) WHERE kind = 'related' DO NOTHING
+                """,
+                (RELATED_KIND, video_id, text)
+            )
             cur.execute(
                 """
-                INSERT INTO lecturer_suggestions (video_id, lecturer_name_text, approval_count)
-                VALUES (%s, %s, 0)
-                RETURNING id, video_id, lecturer_name_text, approval_count, created_at
+                SELECT id, video_id, text, approval_count, created_at
+                FROM suggestions WHERE video_id = %s AND kind = %s AND text = %s
                 """,
-                (video_id, lecturer_name_text)
+                (video_id, RELATED_KIND, text)
             )
             row = cur.fetchone()
             conn.commit()
-            return lecturerSuggestions(**row)
+            return _related_row(row)
     except Exception:
         conn.rollback()
         raise
@@ -503,98 +774,268 @@ def create_lecturer_suggestion(video_id: str, lecturer_name_text: str) -> lectur
         db_pool.putconn(conn)
 
 
-def get_lecturer_suggestions_by_video(video_id: str, limit: int = 5) -> List[lecturerSuggestions]:
-    """Get top N lecturer suggestions for a video (default 5)."""
+@timed
+def vote_related_suggestion(suggestion_id: UUID, voter_hash: str) -> Optional[relatedSuggestion]:
+    """Vote on a related/not_related option. Returns the option (stored count, see vote_suggestion) if the vote was added, None if already voted."""
+    row = _record_vote(RELATED_KIND, suggestion_id, voter_hash)
+    return _related_row(row) if row else None
+
+
+# -------------------------------------------------------------------
+# Search (video_search: title + leading lesson name + leading lecturer)
+# -------------------------------------------------------------------
+
+register_statement(
+    "search_videos",
+    ("text", "int"),
+    """
+    SELECT s.video_id, s.title, s.lesson_name, s.lecturer_name, v.published_at
+    FROM video_search s
+    JOIN video_info v ON v.video_id = s.video_id
+    WHERE s.document @@ websearch_to_tsquery('simple', $1)
+       OR $1 <% s.search_text
+    ORDER BY ts_rank(s.document, websearch_to_tsquery('simple', $1))
+             + word_similarity($1, s.search_text) DESC,
+             v.published_at DESC NULLS LAST
+    LIMIT $2
+    """,
+)
+
+
+@timed
+def refresh_video_search(video_ids: Optional[List[str]] = None) -> None:
+    """
+    Recompute the search rows for the given videos (all videos when video_ids is None).
+    Text is normalized by the normalize_arabic SQL function before indexing.
+    """
+    if video_ids is not None and not video_ids:
+        return
+
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT id, video_id, lecturer_name_text, approval_count, created_at
-                FROM lecturer_suggestions WHERE video_id = %s
-                ORDER BY approval_count DESC, created_at DESC
-                LIMIT %s
+                INSERT INTO video_search (
+                    video_id, title, lesson_name, lecturer_name, search_text, document, updated_at
+                )
+                SELECT
+                    v.video_id,
+                    v.title,
+                    l.text,
+                    c.text,
+                    normalize_arabic(concat_ws(' ', v.title, l.text, c.text)),
+                    setweight(to_tsvector('simple', normalize_arabic(v.title)), 'A')
+                    || setweight(to_tsvector('simple', COALESCE(normalize_arabic(l.text), '')), 'B')
+                    || setweight(to_tsvector('simple', COALESCE(normalize_arabic(c.text), '')), 'C'),
+                    NOW()
+                FROM video_info v
+                LEFT JOIN LATERAL (
+                    SELECT text FROM suggestions
+                    WHERE video_id = v.video_id AND kind = 'lesson_name'
+                    ORDER BY approval_count DESC, created_at DESC
+                    LIMIT 1
+                ) l ON TRUE
+                LEFT JOIN LATERAL (
+                    SELECT text FROM suggestions
+                    WHERE video_id = v.video_id AND kind = 'lecturer'
+                    ORDER BY approval_count DESC, created_at DESC
+                    LIMIT 1
+                ) c ON TRUE
+                WHERE %(all)s OR v.video_id = ANY(%(ids)s)
+                ON CONFLICT (video_id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    lesson_name = EXCLUDED.lesson_name,
+                    lecturer_name = EXCLUDED.lecturer_name,
+                    search_text = EXCLUDED.search_text,
+                    document = EXCLUDED.document,
+                    updated_at = EXCLUDED.updated_at
                 """,
-                (video_id, limit)
+                {"all": video_ids is None, "ids": video_ids or []},
             )
-            return [lecturerSuggestions(**r) for r in cur.fetchall()]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         db_pool.putconn(conn)
 
 
-def vote_lecturer_suggestion(suggestion_id: UUID, voter_hash: str) -> bool:
+@timed
+def search_videos(normalized_query: str, limit: int = 20) -> List[dict]:
+    """Full-text + trigram search. The query must already be normalized with app.core.arabic.normalize_arabic."""
+    if not normalized_query:
+        return []
+
     conn = db_pool.getconn()
     try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id FROM lecturer_votes WHERE lecturer_suggestion_id = %s AND voter_hash = %s",
-                (suggestion_id, voter_hash)
-            )
-            if cur.fetchone():
-                return False
-            cur.execute(
-                "INSERT INTO lecturer_votes (lecturer_suggestion_id, voter_hash) VALUES (%s, %s)",
-                (suggestion_id, voter_hash)
-            )
-            cur.execute(
-                "UPDATE lecturer_suggestions SET approval_count = approval_count + 1 WHERE id = %s",
-                (suggestion_id,)
-            )
-            conn.commit()
-            return True
-    except Exception:
-        conn.rollback()
-        raise
+        with conn.cursor(cursor_factory=TimedRealDictCursor) as cur:
+            execute_prepared(cur, "search_videos", (normalized_query, limit))
+            return [dict(r) for r in cur.fetchall()]
     finally:
         db_pool.putconn(conn)
 
 
 # -------------------------------------------------------------------
-# Related (is_related): users vote whether the video is related or not
+# Autocomplete source data
 # -------------------------------------------------------------------
 
-def get_related_suggestions_by_video(video_id: str) -> List[relatedSuggestion]:
-    """Get the two options (related / not_related) and their vote counts for a video."""
+@timed
+def get_suggestion_name_weights() -> tuple[List[tuple], str]:
+    """
+    (kind, name, total approval_count) for every distinct name of the searchable kinds (lecturer,
+    lesson name), and the txid_current_snapshot() they were read in: count changes by transactions
+    visible in it are already included.
+    """
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cur.execute("SELECT txid_current_snapshot()::text")
+            snapshot = cur.fetchone()[0]
             cur.execute(
                 """
-                SELECT id, video_id, is_related, approval_count, created_at
-                FROM related_suggestions
-                WHERE video_id = %s
-                ORDER BY is_related DESC
+                SELECT kind, text, SUM(approval_count)
+                FROM suggestions
+                WHERE kind = ANY(%s)
+                GROUP BY kind, text
                 """,
-                (video_id,)
+                (SEARCHABLE_KINDS,)
             )
-            return [relatedSuggestion(**r) for r in cur.fetchall()]
+            rows = cur.fetchall()
+        conn.rollback()
+        return rows, snapshot
     finally:
         db_pool.putconn(conn)
 
 
-def get_or_create_related_suggestion(video_id: str, is_related: bool) -> relatedSuggestion:
-    """Get or create the (video_id, is_related) row and return it."""
+# -------------------------------------------------------------------
+# Consensus projection (winning metadata -> suggestion_video_info)
+# -------------------------------------------------------------------
+
+register_statement(
+    "suggest_video_by_id",
+    ("text",),
+    """
+    SELECT video_id, main_level, common_sub_level, specialized_level,
+           lecture_title, lesson_name, batch, is_related_video, lecturer_name
+    FROM suggestion_video_info
+    WHERE video_id = $1
+    """,
+)
+
+register_statement(
+    "consensus_candidates",
+    ("text", "text[]"),
+    """
+    SELECT kind, text, approval_count, created_at
+    FROM (
+        SELECT kind, text, approval_count, created_at,
+               row_number() OVER (PARTITION BY kind ORDER BY approval_count DESC, created_at {order}) AS position
+        FROM suggestions
+        WHERE video_id = $1 AND kind = ANY($2)
+    ) s
+    WHERE position <= 2 OR kind = 'related'
+    ORDER BY kind, position
+    """.format(order="DESC" if CONSENSUS_TIE_BREAK == "newest" else "ASC"),
+)
+
+# The consensus kinds' winners plus the related verdict, in suggestion_video_info
+_CONSENSUS_KIND_NAMES = [kind.name for kind in CONSENSUS_KINDS] + [RELATED_KIND]
+_CONSENSUS_COLUMNS = [kind.consensus_column for kind in CONSENSUS_KINDS] + ["is_related_video"]
+_CONSENSUS_UPSERT = f"""
+    INSERT INTO suggestion_video_info (video_id, {", ".join(_CONSENSUS_COLUMNS)})
+    VALUES (%s{", %s" * len(_CONSENSUS_COLUMNS)})
+    ON CONFLICT (video_id) DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in _CONSENSUS_COLUMNS)}
+"""
+
+
+@timed
+def get_suggest_video(video_id: str) -> Optional[SuggestionVideo]:
+    """Resolved metadata for one video (primary-key lookup), or None."""
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            execute_prepared(cur, "suggest_video_by_id", (video_id,))
+            row = cur.fetchone()
+            return row_to_suggestion(row) if row else None
+    finally:
+        db_pool.putconn(conn)
+
+
+def _consensus_winner(candidates: List[tuple]) -> Optional[str]:
+    """candidates: [(text, votes, created_at)] already in tie-break order. None when nobody qualifies."""
+    if not candidates:
+        return None
+    text, votes, _ = candidates[0]
+    runner_up = candidates[1][1] if len(candidates) > 1 else 0
+    if votes < CONSENSUS_MIN_VOTES or votes - runner_up < CONSENSUS_MIN_MARGIN:
+        return None
+    return text
+
+
+def _related_verdict(related: int, not_related: int) -> Optional[bool]:
+    if related >= RELATED_MIN_VOTES and related - not_related >= RELATED_MIN_MARGIN:
+        return True
+    if not_related >= RELATED_MIN_VOTES and not_related - related >= RELATED_MIN_MARGIN:
+        return False
+    return None
+
+
+@timed
+def project_video_consensus(video_id: str) -> tuple[Optional[SuggestionVideo], SuggestionVideo]:
+    """
+    Recompute the winning text of every consensus kind (title, lesson name, lecturer) and the
+    related verdict for a video from the vote counts and upsert them into suggestion_video_info. A field without a qualifying winner
+    keeps its current value (the previous winner), and so does a field in curated_columns: curated
+    data is authoritative. Facet counts follow via the catalog_facets trigger. Returns (previous row or None, new row).
+    """
     conn = db_pool.getconn()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
+            # Serialize projections of the same video, including the first one (no row to lock yet)
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (video_id,))
             cur.execute(
                 """
-                INSERT INTO related_suggestions (video_id, is_related, approval_count)
-                VALUES (%s, %s, 0)
-                ON CONFLICT (video_id, is_related) DO NOTHING
+                SELECT video_id, main_level, common_sub_level, specialized_level,
+                       lecture_title, lesson_name, batch, is_related_video, lecturer_name,
+                       curated_columns
+                FROM suggestion_video_info
+                WHERE video_id = %s
                 """,
-                (video_id, is_related)
+                (video_id,)
             )
+            row = cur.fetchone()
+            before = row_to_suggestion(row[:-1]) if row else None
+            curated = set(row[-1]) if row else set()
+
+            execute_prepared(cur, "consensus_candidates", (video_id, _CONSENSUS_KIND_NAMES))
+            by_kind: dict[str, list] = {}
+            for kind, text, votes, created_at in cur.fetchall():
+                by_kind.setdefault(kind, []).append((text, votes, created_at))
+
+            related_counts = {text: votes for text, votes, _ in by_kind.get(RELATED_KIND, [])}
+            is_related = _related_verdict(related_counts.get(RELATED, 0), related_counts.get(NOT_RELATED, 0))
+
+            changes = {}
+            for kind in CONSENSUS_KINDS:
+                winner = _consensus_winner(by_kind.get(kind.name, []))
+                if winner is not None and kind.consensus_column not in curated:
+                    changes[kind.consensus_column] = winner
+            if is_related is not None and "is_related_video" not in curated:
+                changes["is_related_video"] = is_related
+            after = replace(before or SuggestionVideo(video_id=video_id), **changes)
+            if after == before:
+                conn.commit()
+                return before, after
+
             cur.execute(
-                """
-                SELECT id, video_id, is_related, approval_count, created_at
-                FROM related_suggestions WHERE video_id = %s AND is_related = %s
-                """,
-                (video_id, is_related)
+                _CONSENSUS_UPSERT,
+                (video_id, *(getattr(after, column) for column in _CONSENSUS_COLUMNS))
             )
-            row = cur.fetchone()
             conn.commit()
-            return relatedSuggestion(**row)
+            return before, after
     except Exception:
         conn.rollback()
         raise
@@ -602,29 +1043,59 @@ def get_or_create_related_suggestion(video_id: str, is_related: bool) -> related
         db_pool.putconn(conn)
 
 
-def vote_related_suggestion(suggestion_id: UUID, voter_hash: str) -> bool:
-    """Vote on a related/not_related option. Returns True if vote was added."""
+# -------------------------------------------------------------------
+# Static export
+# -------------------------------------------------------------------
+
+_CATALOG_EXPORT_QUERY = """
+    SELECT
+        v.video_id,
+        v.title,
+        v.published_at,
+        s.main_level,
+        s.common_sub_level,
+        s.specialized_level,
+        s.lecture_title,
+        s.lesson_name,
+        s.lecturer_name,
+        s.batch,
+        s.is_related_video
+    FROM video_info v
+    LEFT JOIN suggestion_video_info s ON s.video_id = v.video_id
+    ORDER BY v.published_at DESC, v.video_id   -- idx_video_info_published_at_video_id; published_at is NOT NULL
+"""
+
+
+@timed
+def get_catalog_export_rows() -> List[ResolvedVideo]:
+    """Every video with its resolved metadata (NULLs where nothing is curated or voted yet), newest first."""
     conn = db_pool.getconn()
     try:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id FROM related_votes WHERE related_suggestion_id = %s AND voter_hash = %s",
-                (suggestion_id, voter_hash)
-            )
-            if cur.fetchone():
-                return False
-            cur.execute(
-                "INSERT INTO related_votes (related_suggestion_id, voter_hash) VALUES (%s, %s)",
-                (suggestion_id, voter_hash)
-            )
-            cur.execute(
-                "UPDATE related_suggestions SET approval_count = approval_count + 1 WHERE id = %s",
-                (suggestion_id,)
-            )
-            conn.commit()
-            return True
-    except Exception:
-        conn.rollback()
-        raise
+            cur.execute(_CATALOG_EXPORT_QUERY)
+            return [ResolvedVideo(*r) for r in cur.fetchall()]
     finally:
         db_pool.putconn(conn)
+
+
+def iter_catalog_export_rows(batch_size: int = 2000) -> Iterator[List[ResolvedVideo]]:
+    """
+    Same rows as get_catalog_export_rows, streamed in batches from a named (server-side) cursor so
+    memory stays flat whatever the catalog size. The pool connection is held until the generator is
+    exhausted or closed.
+    """
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor(name="catalog_export") as cur:
+            cur.itersize = batch_size
+            cur.execute(_CATALOG_EXPORT_QUERY)
+            while rows := cur.fetchmany(batch_size):
+                yield [ResolvedVideo(*r) for r in rows]
+    finally:
+        rolled_back = False
+        try:
+            conn.rollback()   # ends the read transaction the named cursor lived in
+            rolled_back = True
+        finally:
+            # Always free the pool slot; a connection whose rollback failed is closed, not reused
+            db_pool.putconn(conn, close=not rolled_back)
@@ -0,0 +1,122 @@
+"""
+Registry of server-side prepared statements for the hot repository queries.
+
+Statements are registered once (name, argument types, SQL with $1..$n placeholders).
+The first time a pooled connection runs one, it is PREPAREd on that backend; after
+that only EXECUTE is sent, so Postgres skips parsing and planning. Execution counts
+and latency are tracked per statement.
+"""
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Sequence
+
+from psycopg2 import errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    name: str
+    arg_types: tuple[str, ...]
+    sql: str
+
+
+@dataclass
+class StatementStats:
+    calls: int = 0
+    prepares: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+_registry: dict[str, PreparedStatement] = {}
+_stats: dict[str, StatementStats] = {}
+_lock = threading.Lock()
+
+# connection -> (backend pid, names prepared on that backend)
+_prepared = weakref.WeakKeyDictionary()
+
+
+def register_statement(name: str, arg_types: Sequence[str], sql: str) -> PreparedStatement:
+    """Register a hot statement. Names must be valid SQL identifiers."""
+    stmt = PreparedStatement(name=name, arg_types=tuple(arg_types), sql=sql)
+    with _lock:
+        _registry[name] = stmt
+        _stats.setdefault(name, StatementStats())
+    return stmt
+
+
+def get_statement(name: str) -> PreparedStatement | None:
+    return _registry.get(name)
+
+
+def _prepared_names(conn) -> set:
+    """Names prepared on this connection's current backend. Reset after a reconnect."""
+    pid = conn.get_backend_pid()
+    with _lock:
+        entry = _prepared.get(conn)
+        if entry is None or entry[0] != pid:
+            entry = (pid, set())
+            _prepared[conn] = entry
+        return entry[1]
+
+
+def _run(cur, stmt: PreparedStatement, names: set, params: Sequence) -> bool:
+    prepared_now = False
+    if stmt.name not in names:
+        args = f" ({', '.join(stmt.arg_types)})" if stmt.arg_types else ""
+        cur.execute(f"PREPARE {stmt.name}{args} AS {stmt.sql}")
+        names.add(stmt.name)
+        prepared_now = True
+    if params:
+        cur.execute(f"EXECUTE {stmt.name} ({', '.join(['%s'] * len(params))})", tuple(params))
+    else:
+        cur.execute(f"EXECUTE {stmt.name}")
+    return prepared_now
+
+
+def execute_prepared(cur, name: str, params: Sequence = ()) -> None:
+    """
+    Execute a registered statement on `cur`, preparing it first if this backend has not seen it.
+    If the backend lost the statement (reconnect, DISCARD ALL, pooler reset) and no transaction
+    was in progress, the statement is re-prepared and retried once; otherwise the error is raised
+    and the caller's usual rollback applies.
+    """
+    stmt = _registry[name]
+    conn = cur.connection
+    names = _prepared_names(conn)
+    idle = conn.info.transaction_status == TRANSACTION_STATUS_IDLE
+    start = time.perf_counter()
+    try:
+        prepared_now = _run(cur, stmt, names, params)
+    except errors.InvalidSqlStatementName:
+        names.clear()
+        if not idle:
+            raise
+        conn.rollback()
+        prepared_now = _run(cur, stmt, names, params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    with _lock:
+        stats = _stats[name]
+        stats.calls += 1
+        stats.prepares += int(prepared_now)
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+
+def statement_stats() -> dict[str, dict]:
+    """Snapshot of per-statement counters (calls, prepares, total/avg/max latency in ms)."""
+    with _lock:
+        return {
+            name: {
+                "calls": s.calls,
+                "prepares": s.prepares,
+                "total_ms": round(s.total_ms, 3),
+                "avg_ms": round(s.total_ms / s.calls, 3) if s.calls else 0.0,
+                "max_ms": round(s.max_ms, 3),
+            }
+            for name, s in _stats.items()
+        }
@@ -15,3 +15,15 @@ class SpecializedLevel(Enum):
     SpecializedLevel2 = "التفسير والحديث"
     SpecializedLevel3 = "الفقه وأصوله"
     SpecializedLevel4 = "اللغة العربية"
+
+class AutocompleteKind(Enum):
+    lecturer = "lecturer"
+    lesson_name = "lesson_name"
+
+class SuggestionRank(Enum):
+    top = "top"    # most votes, newest first on ties
+    hot = "hot"    # stored time-decayed score
+
+class ExportFormat(Enum):
+    ndjson = "ndjson"
+    csv = "csv"
@@ -1,11 +1,11 @@
 
 from typing import ClassVar
-from datetime import datetime
+from datetime import date, datetime
 from dataclasses import dataclass
 import uuid
 
 
-@dataclass
+@dataclass(slots=True)
 class videoInfo:
     video_id: str | None = None
     created_at: datetime| None = None
@@ -20,7 +20,7 @@ class videoInfo:
         "published_at",
         "is_related_video"
     ]
-@dataclass
+@dataclass(slots=True)
 class titleSuggestions:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -36,7 +36,7 @@ class titleSuggestions:
         "created_at"
     ]
 
-@dataclass
+@dataclass(slots=True)
 class descriptionSuggestions:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -52,7 +52,7 @@ class descriptionSuggestions:
         "created_at"
     ]
 
-@dataclass
+@dataclass(slots=True)
 class videoVotes:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -67,36 +67,20 @@ class videoVotes:
     ]
 
 
-@dataclass
-class titleVotes:
-    id: uuid.UUID | None = None
-    title_suggestion_id: uuid.UUID | None = None
-    voter_hash: str| None = None
+@dataclass(slots=True)
+class suggestionVotes:
+    suggestion_id: uuid.UUID | None = None
+    voter_hash: bytes | None = None   # voter_key(): first 16 bytes of sha256(voter_hash)
     created_at: datetime| None = None
     
     columns: ClassVar[list[str]] = [
-        "id",
-        "title_suggestion_id",
-        "voter_hash",
-        "created_at"
-    ]
-
-@dataclass
-class descriptionVotes:
-    id: uuid.UUID | None = None
-    description_suggestion_id: uuid.UUID | None = None
-    voter_hash: str| None = None
-    created_at: datetime| None = None
-    
-    columns: ClassVar[list[str]] = [
-        "id",
-        "description_suggestion_id",
+        "suggestion_id",
         "voter_hash",
         "created_at"
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class lessonNameSuggestions:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -109,7 +93,7 @@ class lessonNameSuggestions:
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class lecturerSuggestions:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -122,7 +106,7 @@ class lecturerSuggestions:
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class relatedSuggestion:
     id: uuid.UUID | None = None
     video_id: str | None = None
@@ -135,7 +119,7 @@ class relatedSuggestion:
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class SuggestionVideo:
     video_id: str | None = None
     main_level: str | None = None
@@ -145,6 +129,7 @@ class SuggestionVideo:
     lesson_name: str | None = None
     batch: datetime | None = None
     is_related_video: bool | None = None
+    lecturer_name: str | None = None
     
     columns: ClassVar[list[str]] = [
         "video_id",
@@ -154,5 +139,39 @@ class SuggestionVideo:
         "lecture_title",
         "lesson_name",
         "batch",
-        "is_related_video"
-    ]
\ No newline at end of file
+        "is_related_video",
+        "lecturer_name"
+    ]
+
+
+@dataclass(slots=True)
+class CatalogVideo:
+    video_id: str | None = None
+    title: str | None = None
+    published_at: datetime | None = None
+    created_at: datetime | None = None
+
+    columns: ClassVar[list[str]] = [
+        "video_id", "title", "published_at", "created_at"
+    ]
+
+
+@dataclass(slots=True)
+class ResolvedVideo:
+    """A video_info row with its resolved metadata from suggestion_video_info (None where unset)."""
+    video_id: str | None = None
+    title: str | None = None
+    published_at: datetime | None = None
+    main_level: str | None = None
+    common_sub_level: str | None = None
+    specialized_level: str | None = None
+    lecture_title: str | None = None
+    lesson_name: str | None = None
+    lecturer_name: str | None = None
+    batch: date | None = None
+    is_related_video: bool | None = None
+
+    columns: ClassVar[list[str]] = [
+        "video_id", "title", "published_at", "main_level", "common_sub_level", "specialized_level",
+        "lecture_title", "lesson_name", "lecturer_name", "batch", "is_related_video"
+    ]
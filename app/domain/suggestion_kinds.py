@@ -0,0 +1,52 @@
+"""
+Registry of the free-text suggestion kinds users propose and vote on.
+
+All kinds share the suggestions / suggestion_votes tables; the repository reads and writes, the
+RQ jobs and the /api routes for each kind are generated from this registry, so a new kind is one
+entry here plus its row type in app.domain.models (and a vote quota in VOTE_QUOTAS).
+"""
+from dataclasses import dataclass
+
+from app.domain.models import (
+    titleSuggestions,
+    descriptionSuggestions,
+    lessonNameSuggestions,
+    lecturerSuggestions,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SuggestionKind:
+    name: str                     # suggestions.kind, vote quota key, live-vote / autocomplete event kind
+    slug: str                     # URL segment: /videos/{video_id}/{slug}-suggestions, /{slug}-suggestions/{id}/vote
+    label: str                    # used in API messages
+    text_field: str               # name of the text in request bodies, rows and job results
+    model: type                   # row type: (id, video_id, <text_field>, approval_count, created_at)
+    consensus_column: str | None = None   # suggestion_video_info column the winning text is projected to
+    searchable: bool = False      # the leader is indexed in video_search and names feed autocomplete
+
+
+SUGGESTION_KINDS: dict[str, SuggestionKind] = {
+    kind.name: kind
+    for kind in (
+        SuggestionKind("title", "title", "Title", "title_text", titleSuggestions, consensus_column="lecture_title"),
+        SuggestionKind("description", "description", "Description", "description_text", descriptionSuggestions),
+        SuggestionKind(
+            "lesson_name", "lesson-name", "Lesson name", "lesson_name_text", lessonNameSuggestions,
+            consensus_column="lesson_name", searchable=True,
+        ),
+        SuggestionKind(
+            "lecturer", "lecturer", "Lecturer", "lecturer_name_text", lecturerSuggestions,
+            consensus_column="lecturer_name", searchable=True,
+        ),
+    )
+}
+
+# Users also vote whether a video is related: two fixed rows per video in the same table, kind
+# RELATED_KIND with text RELATED / NOT_RELATED. It has its own routes and job (no free text).
+RELATED_KIND = "related"
+RELATED = "related"
+NOT_RELATED = "not_related"
+
+CONSENSUS_KINDS = [kind for kind in SUGGESTION_KINDS.values() if kind.consensus_column]
+SEARCHABLE_KINDS = [kind.name for kind in SUGGESTION_KINDS.values() if kind.searchable]
@@ -1,15 +1,34 @@
+import asyncio
 import subprocess
 import threading
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi_limiter import FastAPILimiter
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from app.api.routes.videos import router as video_router
 from app.api.routes.suggestions import router as suggestions_router
 from app.api.routes.youtube import router as youtube_router
-from app.core.config import REDIS_URL
+from app.api.routes.search import router as search_router
+from app.api.routes.autocomplete import router as autocomplete_router
+from app.api.routes.live import router as live_router
+from app.api.routes.metrics import router as metrics_router
+from app.api.routes.admin import router as admin_router
+from app.core.metrics import metrics_middleware
+from app.core.tracing import shutdown_tracing, tracing_middleware
+from app.api.rate_limit import run_rate_limit_sync
+from app.core.config import (
+    REDIS_URL,
+    STATIC_EXPORT_TARGET,
+    STATIC_EXPORT_INTERVAL_MINUTES,
+    VOTE_FLUSH_SECONDS,
+    VOTE_RECONCILE_INTERVAL_MINUTES,
+)
 from app.workers.youtube_scheduler import fetch_and_store_youtube_videos
+from app.workers.static_export_scheduler import export_static_catalog_job
+from app.workers.vote_flush_scheduler import flush_vote_counts_job, reconcile_vote_counts_job
+from app.services.autocomplete_service import autocomplete_service
+from app.services.live_votes import live_vote_hub
 
 from app.queues.redis_queue import redis_conn, video_queue
 import redis.asyncio as async_redis
@@ -18,7 +37,9 @@ import redis.asyncio as async_redis
 async def lifespan(app: FastAPI):
     def run_worker():
         # Process both video jobs (internal) and suggestion/vote jobs (user writes via queue)
-        subprocess.call(["rq", "worker", "video_queue", "suggestions_queue"])
+        # SimpleWorker runs jobs in the worker process instead of a fork per job, so jobs reuse the
+        # DB pool and report metrics from one long-lived process
+        subprocess.call(["rq", "worker", "--worker-class", "rq.worker.SimpleWorker", "video_queue", "suggestions_queue"])
 
     worker_thread = threading.Thread(
         target=run_worker,
@@ -36,16 +57,58 @@ async def lifespan(app: FastAPI):
         name='Fetch YouTube videos daily',
         replace_existing=True
     )
+    if STATIC_EXPORT_TARGET:
+        # Incremental static catalog export for the CDN
+        scheduler.add_job(
+            export_static_catalog_job,
+            trigger=IntervalTrigger(minutes=STATIC_EXPORT_INTERVAL_MINUTES),
+            id='static_catalog_export',
+            name='Export static catalog shards',
+            replace_existing=True
+        )
+    # Write-behind vote counts: fold the Redis-buffered votes into approval_count
+    scheduler.add_job(
+        flush_vote_counts_job,
+        trigger=IntervalTrigger(seconds=VOTE_FLUSH_SECONDS),
+        id='vote_count_flush',
+        name='Flush buffered vote counts',
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
+    # Repair approval_count drift from the vote rows
+    scheduler.add_job(
+        reconcile_vote_counts_job,
+        trigger=IntervalTrigger(minutes=VOTE_RECONCILE_INTERVAL_MINUTES),
+        id='vote_count_reconcile',
+        name='Reconcile vote counts',
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
     scheduler.start()
     
     async_redis_conn = async_redis.from_url(REDIS_URL)
-    await FastAPILimiter.init(async_redis_conn)
+    # Batched sync of the in-process rate limit counters
+    rate_limit_sync = asyncio.create_task(run_rate_limit_sync(async_redis_conn))
+
+    # In-memory autocomplete index, kept current through Redis pub/sub
+    autocomplete_service.start()
+    # One shared votes:* subscription per process for the live tally streams
+    await live_vote_hub.start()
     yield
     
     # Shutdown scheduler on app close
     scheduler.shutdown()
+    autocomplete_service.stop()
+    await live_vote_hub.stop()
+    rate_limit_sync.cancel()
+    await async_redis_conn.aclose()
+    shutdown_tracing()
 
 app = FastAPI(lifespan=lifespan)
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(tracing_middleware)
 
 
 
@@ -59,4 +122,9 @@ async def root():
 app.include_router(video_router, prefix="/api")
 app.include_router(suggestions_router, prefix="/api")
 app.include_router(youtube_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
+app.include_router(autocomplete_router, prefix="/api")
+app.include_router(live_router, prefix="/api")
+app.include_router(metrics_router)
+app.include_router(admin_router, prefix="/api")
 
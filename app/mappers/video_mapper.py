@@ -4,6 +4,13 @@ from app.domain.models import SuggestionVideo
 from app.schemas.video_info import VideoInfo
 
 
+def row_to_suggestion(row: tuple) -> SuggestionVideo:
+    """
+    Convert a DB row tuple (selected in SuggestionVideo.columns order) into a SuggestionVideo domain model.
+    """
+    return SuggestionVideo(*row)
+
+
 def suggestion_to_video_info(s: SuggestionVideo) -> VideoInfo:
     """Convert this dataclass to a Pydantic VideoInfo model"""
     return VideoInfo(
@@ -14,5 +21,6 @@ def suggestion_to_video_info(s: SuggestionVideo) -> VideoInfo:
         lecture_title=s.lecture_title,
         lesson_name=s.lesson_name,
         is_related_video=s.is_related_video,
+        lecturer_name=s.lecturer_name,
         batch=s.batch
     )
\ No newline at end of file
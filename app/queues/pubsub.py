@@ -0,0 +1,27 @@
+"""
+Redis pub/sub channels used to push worker-side changes to API processes.
+"""
+import json
+import redis
+from app.core.config import REDIS_URL
+from app.queues.redis_queue import redis_conn
+
+AUTOCOMPLETE_CHANNEL = "autocomplete:updates"
+VOTES_CHANNEL_PREFIX = "votes:"  # one channel per video: votes:{video_id}
+
+
+def votes_channel(video_id: str) -> str:
+    return f"{VOTES_CHANNEL_PREFIX}{video_id}"
+
+
+def publish_event(channel: str, payload: dict) -> None:
+    """Publish a JSON payload. Best effort: a lost event only delays a refresh, it never fails the job."""
+    try:
+        redis_conn.publish(channel, json.dumps(payload, ensure_ascii=False))
+    except redis.RedisError as e:
+        print(f"Failed to publish to {channel}: {e}")
+
+
+def subscriber_connection() -> redis.Redis:
+    """Dedicated connection for long-lived subscriptions (no socket_timeout, unlike the queue connection)."""
+    return redis.from_url(REDIS_URL, health_check_interval=30)
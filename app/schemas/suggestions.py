@@ -1,14 +1,17 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 from datetime import datetime
 from uuid import UUID
-
-class TitleSuggestionCreate(BaseModel):
-    video_id: str
-    title_text: str
-
-class DescriptionSuggestionCreate(BaseModel):
-    video_id: str
-    description_text: str
+from app.domain.suggestion_kinds import SUGGESTION_KINDS
+
+# Request body per kind: {"video_id": ..., "<text_field>": ...}, e.g. TitleSuggestionCreate(video_id, title_text)
+SUGGESTION_CREATE_SCHEMAS: dict[str, type[BaseModel]] = {
+    kind.name: create_model(
+        kind.label.title().replace(" ", "") + "SuggestionCreate",
+        video_id=(str, ...),
+        **{kind.text_field: (str, ...)},
+    )
+    for kind in SUGGESTION_KINDS.values()
+}
 
 class TitleSuggestionResponse(BaseModel):
     id: UUID
@@ -24,16 +27,6 @@ class DescriptionSuggestionResponse(BaseModel):
     approval_count: int
     created_at: datetime
 
-class LessonNameSuggestionCreate(BaseModel):
-    video_id: str
-    lesson_name_text: str
-
-
-class LecturerSuggestionCreate(BaseModel):
-    video_id: str
-    lecturer_name_text: str
-
-
 class LessonNameSuggestionResponse(BaseModel):
     id: UUID
     video_id: str
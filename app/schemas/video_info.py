@@ -13,4 +13,5 @@ class VideoInfo(BaseModel):
     lecture_title : str | None = None
     lesson_name : str | None = None
     batch : date | None = None
-    is_related_video:bool | None = None
\ No newline at end of file
+    is_related_video:bool | None = None
+    lecturer_name : str | None = None
\ No newline at end of file
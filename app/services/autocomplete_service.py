@@ -0,0 +1,143 @@
+"""
+Per-process autocomplete index for lecturer and lesson names.
+
+Built from the suggestion tables at startup, then kept current by events the suggestion
+workers and the vote-count flush publish on AUTOCOMPLETE_CHANNEL. Lookups only touch memory.
+"""
+import heapq
+import json
+import threading
+from bisect import bisect_left, insort
+
+from app.core.arabic import normalize_arabic
+from app.db.repo.videos_repo import get_suggestion_name_weights
+from app.domain.enum import AutocompleteKind
+from app.queues.pubsub import AUTOCOMPLETE_CHANNEL, subscriber_connection
+
+
+class PrefixIndex:
+    """
+    Sorted array of (normalized word-suffix, name key) pairs. Every word start of a name is indexed,
+    so "عبد" completes "محمد عبد الله". Names that normalize to the same key share one weight and
+    show the spelling with the most votes.
+    """
+
+    def __init__(self):
+        self._prefixes: list[tuple[str, str]] = []
+        self._names: dict[str, list] = {}  # key -> [display name, weight, {spelling: weight}]
+
+    def __len__(self):
+        return len(self._names)
+
+    def _count(self, name: str, weight: int) -> str | None:
+        """Add weight to a name. Returns its key if the key is new (its prefixes still need indexing)."""
+        key = normalize_arabic(name)
+        if not key:
+            return None
+        entry = self._names.get(key)
+        if entry is None:
+            self._names[key] = [name, weight, {name: weight}]
+            return key
+        spellings = entry[2]
+        spellings[name] = spellings.get(name, 0) + weight
+        entry[1] += weight
+        if spellings[name] > spellings[entry[0]] or (name == entry[0] and weight < 0):
+            entry[0] = max(spellings, key=spellings.get)
+        return None
+
+    @staticmethod
+    def _word_suffixes(key: str) -> list[tuple[str, str]]:
+        words = key.split(" ")
+        return [(" ".join(words[i:]), key) for i in range(len(words))]
+
+    def add(self, name: str, weight: int) -> None:
+        key = self._count(name, weight)
+        if key is not None:
+            for item in self._word_suffixes(key):
+                insort(self._prefixes, item)
+
+    def add_all(self, names) -> None:
+        """Bulk add (name, weight) pairs, sorting the prefix array once."""
+        for name, weight in names:
+            key = self._count(name, weight)
+            if key is not None:
+                self._prefixes.extend(self._word_suffixes(key))
+        self._prefixes.sort()
+
+    def lookup(self, prefix: str, limit: int) -> list[dict]:
+        prefix = normalize_arabic(prefix)
+        if not prefix:
+            return []
+        lo = bisect_left(self._prefixes, (prefix,))
+        hi = bisect_left(self._prefixes, (prefix + chr(0x10FFFF),))
+        keys = {key for _, key in self._prefixes[lo:hi]}
+        top = heapq.nlargest(limit, keys, key=lambda k: (self._names[k][1], k))
+        return [{"name": self._names[k][0], "weight": self._names[k][1]} for k in top]
+
+
+def _visible_in(txid: int | None, snapshot: str) -> bool:
+    """Was transaction txid committed as of a txid_current_snapshot() ("xmin:xmax:xip,...")?"""
+    if txid is None:
+        return False
+    xmin, xmax, xip = snapshot.split(":")
+    if txid < int(xmin):
+        return True
+    return txid < int(xmax) and str(txid) not in xip.split(",")
+
+
+class AutocompleteService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {kind: PrefixIndex() for kind in AutocompleteKind}
+        self._held: list | None = None  # events received while start() builds the indexes
+        self._pubsub = None
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Subscribe first, then build. Events received during the build are held back and applied
+        after it, except those from transactions the build's snapshot already counted.
+        """
+        with self._lock:
+            self._held = []
+        self._pubsub = subscriber_connection().pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{AUTOCOMPLETE_CHANNEL: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+        rows, snapshot = get_suggestion_name_weights()
+        names: dict[AutocompleteKind, list] = {kind: [] for kind in AutocompleteKind}
+        for kind, name, weight in rows:
+            names[AutocompleteKind(kind)].append((name, int(weight)))
+        indexes = {kind: PrefixIndex() for kind in AutocompleteKind}
+        for kind, index in indexes.items():
+            index.add_all(names[kind])
+        with self._lock:
+            for event in self._held:
+                if not _visible_in(event.get("txid"), snapshot):
+                    indexes[AutocompleteKind(event["kind"])].add(event["name"], int(event["delta"]))
+            self._held = None
+            self._indexes = indexes
+        print(f"Autocomplete index built: { {k.value: len(i) for k, i in indexes.items()} }")
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+    def _on_message(self, message) -> None:
+        try:
+            event = json.loads(message["data"])
+            with self._lock:
+                if self._held is not None:
+                    self._held.append(event)
+                else:
+                    self._indexes[AutocompleteKind(event["kind"])].add(event["name"], int(event["delta"]))
+        except (ValueError, KeyError) as e:
+            print(f"Ignoring malformed autocomplete event: {e}")
+
+    def lookup(self, kind: AutocompleteKind, prefix: str, limit: int = 10) -> list[dict]:
+        with self._lock:
+            return self._indexes[kind].lookup(prefix, limit)
+
+
+autocomplete_service = AutocompleteService()
@@ -0,0 +1,191 @@
+"""
+Precompressed, versioned snapshots of the unfiltered catalog (GET /api/videos).
+
+The catalog only changes when the daily sync inserts videos or a related verdict flips; both
+bump CATALOG_VERSION_KEY in Redis. Each (version, related_only) payload is rendered once
+(a Redis lock makes the other processes wait for that render), stored in Redis as
+identity/gzip/brotli variants and cached in process memory, and served
+with a strong ETag per encoding ("catalog-{version}-{related}-{encoding}": the three bodies
+differ byte for byte) so clients can revalidate with If-None-Match. While Redis is unavailable
+the endpoint keeps working from process memory and Postgres.
+"""
+import gzip
+import threading
+import time
+from dataclasses import dataclass
+
+import brotli
+import orjson
+import redis
+
+from app.db.repo.videos_repo import get_videos_for_catalog
+from app.queues.redis_queue import redis_conn
+
+CATALOG_VERSION_KEY = "catalog:version"
+SNAPSHOT_TTL_SECONDS = 7 * 24 * 3600
+ENCODINGS = ("br", "gzip", "identity")
+_RENDER_LOCK_SECONDS = 120   # lock expiry: longer than a render of the full catalog
+_RENDER_WAIT_SECONDS = 30    # how long another process waits for that render
+FALLBACK_SECONDS = 60        # without Redis: re-render from Postgres at most this often
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    related_only: bool
+    bodies: dict  # encoding -> bytes
+
+    def etag(self, encoding: str) -> str:
+        return f'"catalog-{self.version}-{int(self.related_only)}-{encoding}"'
+
+
+_cache: dict[tuple[int, bool], CatalogSnapshot] = {}
+_fallback: dict[bool, tuple[float, CatalogSnapshot]] = {}   # related_only -> (monotonic time, snapshot)
+_render_lock = threading.Lock()
+
+
+def _epoch_version() -> int:
+    # Versions restart from wall-clock ms if the key is lost, so they never repeat a value
+    # a process may still have cached.
+    return int(time.time() * 1000)
+
+
+def bump_catalog_version() -> None:
+    """Invalidate catalog snapshots. Called after the daily sync, a curated import and when a related verdict flips."""
+    try:
+        if redis_conn.incr(CATALOG_VERSION_KEY) == 1:
+            redis_conn.set(CATALOG_VERSION_KEY, _epoch_version())
+    except redis.RedisError as e:
+        print(f"Failed to bump catalog version: {e}")
+
+
+def get_catalog_version() -> int:
+    version = redis_conn.get(CATALOG_VERSION_KEY)
+    if version is None:
+        redis_conn.set(CATALOG_VERSION_KEY, _epoch_version(), nx=True)
+        version = redis_conn.get(CATALOG_VERSION_KEY)
+    return int(version)
+
+
+def _redis_key(version: int, related_only: bool, encoding: str) -> str:
+    return f"catalog:snapshot:{version}:{int(related_only)}:{encoding}"
+
+
+def _render(version: int, related_only: bool) -> dict:
+    body = orjson.dumps({
+        "success": True,
+        "message": "Videos fetched successfully",
+        "data": get_videos_for_catalog(related_only=related_only),
+    })
+    return {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9),
+        "br": brotli.compress(body, quality=11),
+    }
+
+
+def get_catalog_snapshot(related_only: bool = False) -> CatalogSnapshot:
+    """
+    Current snapshot: process memory, then Redis, then render. A render takes a Redis lock, so
+    the processes that miss the same version at once wait for one render instead of each doing
+    their own. If Redis is unavailable the catalog is still served (see _fallback_snapshot).
+    """
+    try:
+        snapshot = _current_snapshot(related_only)
+    except redis.RedisError as e:
+        print(f"Catalog snapshot store unavailable, serving from process memory / Postgres: {e}")
+        return _fallback_snapshot(related_only)
+    if _fallback:
+        _fallback.clear()   # Redis is back: the next outage starts from the current snapshot
+    return snapshot
+
+
+def _current_snapshot(related_only: bool) -> CatalogSnapshot:
+    version = get_catalog_version()
+    key = (version, related_only)
+    snapshot = _cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    with _render_lock:
+        snapshot = _cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        bodies = _stored_bodies(version, related_only)
+        if bodies is None:
+            lock = redis_conn.lock(
+                f"lock:catalog_render:{version}:{int(related_only)}", timeout=_RENDER_LOCK_SECONDS
+            )
+            # Not acquired in time: the holder is stuck or slow, render here rather than wait longer
+            acquired = lock.acquire(blocking_timeout=_RENDER_WAIT_SECONDS)
+            try:
+                bodies = _stored_bodies(version, related_only)  # the holder we waited for may have stored it
+                if bodies is None:
+                    bodies = _render(version, related_only)
+                    pipe = redis_conn.pipeline()
+                    for enc, body in bodies.items():
+                        pipe.set(_redis_key(version, related_only, enc), body, ex=SNAPSHOT_TTL_SECONDS)
+                    pipe.execute()
+            finally:
+                if acquired:
+                    try:
+                        lock.release()
+                    except redis.exceptions.LockError:
+                        pass  # expired during a slow render; the bodies are stored either way
+
+        snapshot = CatalogSnapshot(version=version, related_only=related_only, bodies=bodies)
+        # Keep only the current version in memory
+        for old in [k for k in _cache if k[0] != version]:
+            del _cache[old]
+        _cache[key] = snapshot
+        return snapshot
+
+
+def _stored_bodies(version: int, related_only: bool) -> dict | None:
+    stored = redis_conn.mget([_redis_key(version, related_only, enc) for enc in ENCODINGS])
+    return dict(zip(ENCODINGS, stored)) if all(stored) else None
+
+
+def _fallback_snapshot(related_only: bool) -> CatalogSnapshot:
+    """
+    Snapshot while Redis is down (the version is unknown): the last one this process served, then
+    a render straight from Postgres every FALLBACK_SECONDS. A fallback render gets a fresh
+    wall-clock version, so its ETags never collide with a stored version's.
+    """
+    with _render_lock:
+        now = time.monotonic()
+        entry = _fallback.get(related_only)
+        if entry is None:
+            cached = [snap for (_, related), snap in _cache.items() if related == related_only]
+            if cached:
+                entry = _fallback[related_only] = (now, cached[0])
+        if entry is not None and now - entry[0] < FALLBACK_SECONDS:
+            return entry[1]
+        version = _epoch_version()
+        snapshot = CatalogSnapshot(version=version, related_only=related_only, bodies=_render(version, related_only))
+        _fallback[related_only] = (now, snapshot)
+        return snapshot
+
+
+def pick_encoding(accept_encoding: str | None) -> str:
+    """Best available encoding the client accepts: br, then gzip, else identity."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for enc in ("br", "gzip"):
+        if enc in accepted or "*" in accepted:
+            return enc
+    return "identity"
+
+
+def etag_matches(if_none_match: str | None, snapshot: CatalogSnapshot) -> bool:
+    """True if If-None-Match names this snapshot in any encoding (a proxy may have cached another variant)."""
+    if not if_none_match:
+        return False
+    tags = {t.strip() for t in if_none_match.split(",")}
+    return "*" in tags or any(snapshot.etag(enc) in tags for enc in ENCODINGS)
@@ -0,0 +1,91 @@
+"""
+Streaming catalog export (GET /api/videos/export) for consumers that need the whole dataset.
+
+Rows come from iter_catalog_export_rows (a server-side cursor), and each batch is encoded into a
+single chunk as it arrives, so time-to-first-byte and memory don't depend on the catalog size.
+NDJSON lines are the ResolvedVideo fields, the same shape as the static export's videos/*.json;
+CSV has a header row with the same columns.
+
+Every export holds a pool connection until it finishes, so at most CATALOG_EXPORT_MAX_CONCURRENT
+run per process; stream_catalog returns None beyond that (the route answers 503).
+"""
+import csv
+import io
+import threading
+from typing import Iterator
+
+import orjson
+
+from app.core.config import CATALOG_EXPORT_BATCH_SIZE, CATALOG_EXPORT_MAX_CONCURRENT
+from app.db.repo.videos_repo import iter_catalog_export_rows
+from app.domain.enum import ExportFormat
+from app.domain.models import ResolvedVideo
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+_export_slots = threading.BoundedSemaphore(CATALOG_EXPORT_MAX_CONCURRENT)
+
+
+class _ExportSlot:
+    """One acquired export slot, released once: when the stream ends, or when it is garbage
+    collected without ever being iterated (e.g. the client went away before the body started)."""
+
+    def __init__(self):
+        self._held = True
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            _export_slots.release()
+
+    __del__ = release
+
+
+def _holding(slot: _ExportSlot, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    finally:
+        slot.release()
+
+
+def _ndjson_chunks(batches: Iterator[list[ResolvedVideo]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(orjson.dumps(video) + b"\n" for video in batch)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(batches: Iterator[list[ResolvedVideo]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(ResolvedVideo.columns)
+    for batch in batches:
+        for video in batch:
+            writer.writerow([_csv_value(getattr(video, c)) for c in ResolvedVideo.columns])
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():  # header only: empty catalog
+        yield buf.getvalue().encode("utf-8")
+
+
+def stream_catalog(fmt: ExportFormat) -> Iterator[bytes] | None:
+    """
+    Encoded chunks, one per cursor batch. Holds a pool connection until exhausted or closed.
+    None when CATALOG_EXPORT_MAX_CONCURRENT exports are already running in this process.
+    """
+    if not _export_slots.acquire(blocking=False):
+        return None
+    batches = iter_catalog_export_rows(CATALOG_EXPORT_BATCH_SIZE)
+    if fmt is ExportFormat.csv:
+        return _holding(_ExportSlot(), _csv_chunks(batches))
+    return _holding(_ExportSlot(), _ndjson_chunks(batches))
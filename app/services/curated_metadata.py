@@ -0,0 +1,163 @@
+"""
+Bulk import / export of curated video metadata (suggestion_video_info) for the curriculum team.
+
+Input is CSV with a header row or JSON lines, using the SuggestionVideo column names; only
+video_id is required and absent columns are left as they are. Levels must be a value (or member
+name) of MainAcademicLevel / CommonSubLevel / SpecializedLevel, batch an ISO date and
+is_related_video a boolean. Every row is validated before anything is written; the load itself is
+one COPY + merge transaction (videos_repo.bulk_merge_curated_metadata). Imported fields are
+authoritative: the vote consensus projection no longer overwrites them. The export is a COPY of
+the whole table in the same CSV layout, so it can be re-imported as is.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from app.db.repo.videos_repo import bulk_merge_curated_metadata, copy_curated_metadata_out
+from app.domain.enum import CommonSubLevel, MainAcademicLevel, SpecializedLevel
+from app.domain.models import SuggestionVideo
+from app.services.catalog_snapshot import bump_catalog_version
+
+COLUMNS = SuggestionVideo.columns
+_LEVELS = {
+    "main_level": MainAcademicLevel,
+    "common_sub_level": CommonSubLevel,
+    "specialized_level": SpecializedLevel,
+}
+_TRUE = {"true", "t", "1", "yes", "y"}
+_FALSE = {"false", "f", "0", "no", "n"}
+
+
+@dataclass
+class CuratedRows:
+    rows: dict[str, tuple] = field(default_factory=dict)   # video_id -> row in COLUMNS order (last one wins)
+    read: int = 0
+    duplicates: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def _level(column: str, value: str) -> str:
+    enum = _LEVELS[column]
+    try:
+        return enum(value).value
+    except ValueError:
+        pass
+    try:
+        return enum[value].value
+    except KeyError:
+        raise ValueError(f"{column} {value!r} is not a {enum.__name__}") from None
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"is_related_video {value!r} is not a boolean")
+
+
+def _batch(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"batch {value!r} is not an ISO date (YYYY-MM-DD)") from None
+
+
+def _validate(record: dict) -> tuple:
+    unknown = set(record) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown columns: {', '.join(sorted(unknown))}")
+    values = []
+    for column in COLUMNS:
+        value = record.get(column)
+        if isinstance(value, str):
+            value = value.strip() or None
+        elif value is not None and not (column == "is_related_video" and isinstance(value, bool)):
+            # JSONL numbers / lists / objects: every column is text (or a JSON boolean for is_related_video)
+            expected = "a string or boolean" if column == "is_related_video" else "a string"
+            raise ValueError(f"{column} {value!r} must be {expected}")
+        if value is not None:
+            if column in _LEVELS:
+                value = _level(column, value)
+            elif column == "is_related_video":
+                value = _boolean(value)
+            elif column == "batch":
+                value = _batch(value)
+        values.append(value)
+    if not values[0]:
+        raise ValueError("video_id is required")
+    return tuple(values)
+
+
+def _records(path: Path, fmt: str):
+    """(line number, dict) per input record."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                if None in record:  # DictReader keeps fields past the header under the key None
+                    yield reader.line_num, ValueError(f"too many fields (the header has {len(reader.fieldnames)})")
+                    continue
+                yield reader.line_num, record
+        else:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_num, e
+                    continue
+                yield line_num, record if isinstance(record, dict) else ValueError("expected a JSON object")
+
+
+def read_curated_file(path: Path, fmt: str) -> CuratedRows:
+    """Parse and validate every record of a CSV / JSONL file."""
+    result = CuratedRows()
+    for line_num, record in _records(path, fmt):
+        result.read += 1
+        try:
+            if isinstance(record, Exception):
+                raise ValueError(str(record))
+            row = _validate(record)
+        except ValueError as e:
+            result.errors.append(f"line {line_num}: {e}")
+            continue
+        if row[0] in result.rows:
+            result.duplicates += 1
+        result.rows[row[0]] = row
+    return result
+
+
+def import_curated_metadata(path: Path, fmt: str, overwrite: bool = False, skip_invalid: bool = False) -> dict:
+    """
+    Validate the file, then merge it in one transaction. Nothing is written when a record is
+    invalid unless skip_invalid is set. Returns the counts (and errors / unknown video ids).
+    """
+    parsed = read_curated_file(path, fmt)
+    counts = {
+        "read": parsed.read,
+        "invalid": len(parsed.errors),
+        "duplicates": parsed.duplicates,
+        "errors": parsed.errors,
+        "inserted": 0,
+        "updated": 0,
+        "unknown": [],
+    }
+    if (parsed.errors and not skip_invalid) or not parsed.rows:
+        return counts
+    counts.update(bulk_merge_curated_metadata(list(parsed.rows.values()), overwrite=overwrite))
+    if counts["inserted"] or counts["updated"]:
+        bump_catalog_version()  # is_related_video may have changed the related-only catalog
+    return counts
+
+
+def export_curated_metadata(path: Path) -> int:
+    """Write the whole table as CSV (re-importable). Returns the row count."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return copy_curated_metadata_out(f)
@@ -0,0 +1,70 @@
+"""
+Live vote tallies for connected clients.
+
+Vote jobs publish {kind, suggestion_id, approval_count} on votes:{video_id} after commit.
+Each API process holds one pattern subscription to votes:* and fans events out to the local
+subscribers of that video (SSE streams and WebSockets), so a live view costs an idle
+connection instead of repeated queries. Payloads are forwarded as published, without re-encoding.
+"""
+import asyncio
+
+import redis.asyncio as async_redis
+
+from app.core.config import REDIS_URL
+from app.queues.pubsub import VOTES_CHANNEL_PREFIX
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class LiveVoteHub:
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def subscribe(self, video_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(video_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, video_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(video_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[video_id]
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        for queue in self._subscribers.get(channel[len(VOTES_CHANNEL_PREFIX):], ()):
+            if queue.full():
+                # Slow consumer: drop its oldest event, the newest count supersedes it anyway
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _run(self) -> None:
+        while True:
+            conn = async_redis.from_url(REDIS_URL, decode_responses=True, health_check_interval=30)
+            pubsub = conn.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{VOTES_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Live vote subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await conn.aclose()
+
+
+live_vote_hub = LiveVoteHub()
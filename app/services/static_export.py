@@ -0,0 +1,187 @@
+"""
+Static catalog export: sharded JSON files a CDN can serve without the API.
+
+Layout under the target:
+    index.json                          video and page counts, level shards
+    pages/{n}.json                      STATIC_EXPORT_PAGE_SIZE videos per page, numbered from the
+                                        oldest video (page 1) so new videos only change the last
+                                        page; newest first within a page, the last page may be short
+    levels/{facet}/{LevelName}.json     videos per academic level value (enum member name)
+    videos/{video_id}.json              resolved metadata for one video
+    manifest.json                       fingerprint of every shard (used for incremental runs)
+
+Each shard's fingerprint is derived from the rows it contains; shards whose fingerprint matches
+the previous manifest are neither re-rendered nor rewritten. Writes are atomic per file and the
+manifest is written last, so an interrupted export is simply redone on the next run.
+"""
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import orjson
+
+from app.core.config import S3_ENDPOINT_URL
+from app.db.repo.videos_repo import get_catalog_export_rows
+from app.domain.enum import CommonSubLevel, MainAcademicLevel, SpecializedLevel
+
+MANIFEST = "manifest.json"
+
+_LEVEL_FACETS = {
+    "main_level": MainAcademicLevel,
+    "common_sub_level": CommonSubLevel,
+    "specialized_level": SpecializedLevel,
+}
+
+
+class LocalTarget:
+    def __init__(self, root: str):
+        self.root = root
+
+    def read(self, path: str) -> bytes | None:
+        try:
+            with open(os.path.join(self.root, path), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, path: str, body: bytes) -> None:
+        full = os.path.join(self.root, path)
+        directory = os.path.dirname(full)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, full)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def delete(self, path: str) -> None:
+        try:
+            os.remove(os.path.join(self.root, path))
+        except FileNotFoundError:
+            pass
+
+
+class S3Target:
+    """S3 or S3-compatible bucket. Object PUTs are atomic. Requires boto3."""
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("boto3 is required for s3:// export targets (pip install boto3)") from e
+        self.client = boto3.client("s3", endpoint_url=S3_ENDPOINT_URL)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, path: str) -> str:
+        return f"{self.prefix}/{path}" if self.prefix else path
+
+    def read(self, path: str) -> bytes | None:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(path))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def write(self, path: str, body: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(path),
+            Body=body,
+            ContentType="application/json",
+            CacheControl="public, max-age=60",
+        )
+
+    def delete(self, path: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(path))
+
+
+def open_target(target: str):
+    """"s3://bucket/prefix" -> S3Target, anything else is a local directory."""
+    parsed = urlparse(target)
+    if parsed.scheme == "s3":
+        return S3Target(parsed.netloc, parsed.path)
+    if parsed.scheme == "file":
+        return LocalTarget(parsed.path)
+    return LocalTarget(target)
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha1(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _level_slug(facet: str, value: str) -> str | None:
+    try:
+        return _LEVEL_FACETS[facet](value).name
+    except ValueError:
+        return None
+
+
+def export_static_catalog(target, page_size: int = 100, full: bool = False) -> dict:
+    """
+    Export the catalog to `target` (LocalTarget / S3Target). With full=True every shard is rewritten.
+    Returns counts of written, unchanged and deleted shards.
+    """
+    previous = {} if full else orjson.loads(target.read(MANIFEST) or b"{}").get("shards", {})
+
+    rows = get_catalog_export_rows()
+    row_prints = {r.video_id: _fingerprint(r) for r in rows}
+
+    # shard path -> (fingerprint, render callable)
+    shards: dict[str, tuple] = {}
+
+    for r in rows:
+        shards[f"videos/{r.video_id}.json"] = (row_prints[r.video_id], lambda r=r: r)
+
+    # Rows are newest first; slice from the oldest so an appended video does not shift every page.
+    # A page holds nothing that depends on the total (the page count lives in index.json).
+    oldest_first = rows[::-1]
+    pages = [oldest_first[i:i + page_size][::-1] for i in range(0, len(rows), page_size)] or [[]]
+    for n, page in enumerate(pages, start=1):
+        fp = _fingerprint(n, [(r.video_id, row_prints[r.video_id]) for r in page])
+        shards[f"pages/{n}.json"] = (fp, lambda n=n, page=page: {"page": n, "videos": page})
+
+    levels: dict[str, list] = {}
+    for r in rows:
+        for facet in _LEVEL_FACETS:
+            value = getattr(r, facet)
+            slug = _level_slug(facet, value) if value else None
+            if slug:
+                levels.setdefault(f"levels/{facet}/{slug}.json", []).append(r)
+    for path, members in levels.items():
+        fp = _fingerprint(path, [(r.video_id, row_prints[r.video_id]) for r in members])
+        shards[path] = (fp, lambda members=members: {"count": len(members), "videos": members})
+
+    # The index is small: fingerprint exactly what is rendered
+    index = {
+        "videos": len(rows),
+        "pages": len(pages),
+        "page_size": page_size,
+        "levels": {path: len(members) for path, members in sorted(levels.items())},
+    }
+    shards["index.json"] = (_fingerprint(index), lambda: index)
+
+    written = unchanged = 0
+    for path, (fp, render) in shards.items():
+        if previous.get(path) == fp:
+            unchanged += 1
+            continue
+        target.write(path, orjson.dumps(render()))
+        written += 1
+
+    stale = [path for path in previous if path not in shards]
+    for path in stale:
+        target.delete(path)
+
+    target.write(MANIFEST, orjson.dumps({
+        "generated_at": datetime.now(timezone.utc),
+        "shards": {path: fp for path, (fp, _) in shards.items()},
+    }))
+    return {"written": written, "unchanged": unchanged, "deleted": len(stale)}
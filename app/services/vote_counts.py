@@ -0,0 +1,251 @@
+"""
+Write-behind approval counts.
+
+A vote job inserts the (suggestion, voter) row and commits, then HINCRBYs the suggestion's field in
+the PENDING_KEY hash instead of updating the suggestion row, so votes on one hot suggestion no longer
+queue on its row lock (or on the per-video consensus lock). flush_vote_counts, scheduled every
+VOTE_FLUSH_SECONDS, takes the hash (RENAME to FLUSHING_KEY), adds it to approval_count in one
+UPDATE and then does the per-video follow-up once per flush instead of once per vote: consensus
+projection, search rows, autocomplete weights and the related-only catalog version.
+
+Reads that show counts add the buffered votes of both hashes (current_suggestions), so a vote is
+visible as soon as its job ran; a per-video set of recently voted suggestions lets the top-N read
+include a suggestion whose buffered votes lift it past the stored top N. Consensus, search and
+autocomplete follow within one flush. If Redis is unavailable the vote is counted straight into
+the row. Each flush batch carries an id committed with its UPDATE (vote_count_flush), so retrying
+a batch is safe; FLUSHING_KEY is dropped right after that commit and the follow-up runs after it.
+reconcile_vote_counts repairs any remaining drift from the vote rows, which stay authoritative.
+"""
+from collections import Counter
+from uuid import UUID, uuid4
+
+import redis
+
+from app.core.config import VOTE_RECONCILE_CHUNK_SIZE, VOTE_RECONCILE_GRACE_SECONDS
+from app.core.metrics import (
+    VOTE_COUNT_CORRECTION_SIZE,
+    VOTE_COUNT_CORRECTIONS,
+    VOTE_COUNTS_DIRECT,
+    VOTE_COUNTS_FLUSHED,
+)
+from app.db.repo.videos_repo import (
+    add_approval_counts,
+    count_suggestion_votes,
+    get_related_suggestions_by_video,
+    get_suggestions_by_ids,
+    get_suggestions_by_video,
+    project_video_consensus,
+    refresh_video_search,
+    set_approval_counts,
+)
+from app.domain.suggestion_kinds import RELATED_KIND, SUGGESTION_KINDS
+from app.queues.pubsub import AUTOCOMPLETE_CHANNEL, publish_event
+from app.queues.redis_queue import redis_conn
+from app.services.catalog_snapshot import bump_catalog_version
+
+PENDING_KEY = "vote_counts:pending"      # suggestion id -> votes not yet in approval_count
+FLUSHING_KEY = "vote_counts:flushing"    # the batch a flush is applying (kept for a retry if it fails)
+VOTED_KEY_PREFIX = "vote_counts:voted:"  # + video id: suggestions voted on recently (top-N candidates)
+_VOTED_TTL_SECONDS = 300
+_BATCH_FIELD = "batch"                    # FLUSHING_KEY field with the batch id (not a suggestion id)
+FLUSH_LOCK_KEY = "lock:vote_flush"       # held by whoever moves counts between Redis and the rows
+
+
+def release_flush_lock(lock) -> None:
+    """Release FLUSH_LOCK_KEY; a flush or chunk that outlived the lock timeout only logs it (batches are idempotent)."""
+    try:
+        lock.release()
+    except redis.exceptions.LockError:
+        print(f"Vote flush lock expired before release (flush took longer than its {lock.timeout} s timeout)")
+
+
+def _voted_key(video_id: str) -> str:
+    return f"{VOTED_KEY_PREFIX}{video_id}"
+
+
+def count_vote(suggestion_id, video_id: str, stored_count: int) -> int:
+    """Buffer one vote for a suggestion whose vote row just committed. Returns its current total."""
+    field = str(suggestion_id)
+    try:
+        # MULTI: a flush's RENAME cannot run between the HINCRBY and the HGET, which would count
+        # this suggestion's pending votes in both hashes
+        pipe = redis_conn.pipeline(transaction=True)
+        pipe.hincrby(PENDING_KEY, field, 1)
+        pipe.hget(FLUSHING_KEY, field)
+        pipe.sadd(_voted_key(video_id), field)
+        pipe.expire(_voted_key(video_id), _VOTED_TTL_SECONDS)
+        pending, flushing, _, _ = pipe.execute()
+        return (stored_count or 0) + pending + int(flushing or 0)
+    except redis.RedisError as e:
+        print(f"Vote count buffer unavailable, counting {field} directly: {e}")
+        VOTE_COUNTS_DIRECT.inc()
+        rows = _apply({field: 1})
+        return rows[0][4] if rows else (stored_count or 0) + 1
+
+
+def _buffered(ids: list[str]) -> list[int]:
+    """Buffered votes per suggestion id (0 when Redis is unavailable)."""
+    if not ids:
+        return []
+    try:
+        pipe = redis_conn.pipeline(transaction=False)
+        pipe.hmget(PENDING_KEY, ids)
+        pipe.hmget(FLUSHING_KEY, ids)
+        pending, flushing = pipe.execute()
+    except redis.RedisError as e:
+        print(f"Vote count buffer unavailable, serving stored counts: {e}")
+        return [0] * len(ids)
+    return [int(p or 0) + int(f or 0) for p, f in zip(pending, flushing)]
+
+
+def _with_buffered(rows: list) -> list:
+    for row, extra in zip(rows, _buffered([str(row.id) for row in rows])):
+        row.approval_count = (row.approval_count or 0) + extra
+    return rows
+
+
+def _recently_voted(video_id: str) -> set[str]:
+    try:
+        return {field.decode() for field in redis_conn.smembers(_voted_key(video_id))}
+    except redis.RedisError:
+        return set()
+
+
+def current_suggestions(kind: str, video_id: str, limit: int = 5, rank: str = "top") -> list:
+    """get_suggestions_by_video with buffered votes included (rank=top is re-ordered by them)."""
+    rows = get_suggestions_by_video(kind, video_id, limit=limit, rank=rank)
+    if rank != "top":
+        return _with_buffered(rows)
+    candidates = _recently_voted(video_id) - {str(row.id) for row in rows}
+    rows = _with_buffered(rows + get_suggestions_by_ids(kind, video_id, sorted(candidates)))
+    rows.sort(key=lambda row: (row.approval_count, row.created_at), reverse=True)
+    return rows[:limit]
+
+
+def current_related_suggestions(video_id: str) -> list:
+    """get_related_suggestions_by_video with buffered votes included."""
+    return _with_buffered(get_related_suggestions_by_video(video_id))
+
+
+def _apply(deltas: dict[str, int]) -> list[tuple]:
+    """Add the counts, then bring the derived per-video state up to date. Returns the updated rows."""
+    rows = add_approval_counts(deltas)
+    _counts_changed(rows, deltas)
+    return rows
+
+
+def _counts_changed(rows: list[tuple], deltas: dict[str, int]) -> None:
+    """Consensus, search, autocomplete and catalog version follow-up for (id, kind, video_id, text, count, txid) rows."""
+    consensus_videos: set[str] = set()
+    search_videos: set[str] = set()
+    names: Counter = Counter()
+    txid = None
+    for suggestion_id, kind, video_id, text, _, txid in rows:
+        delta = deltas[str(suggestion_id)]
+        if kind == RELATED_KIND:
+            consensus_videos.add(video_id)
+            continue
+        spec = SUGGESTION_KINDS.get(kind)
+        if spec is None:
+            continue
+        if spec.consensus_column:
+            consensus_videos.add(video_id)
+        if spec.searchable:
+            search_videos.add(video_id)
+            names[(kind, text)] += delta
+
+    # The related-only catalog lists is_related_video: bump its version only when a verdict flipped
+    related_flipped = False
+    for video_id in sorted(consensus_videos):
+        before, after = project_video_consensus(video_id)
+        related_flipped |= bool(before and before.is_related_video) != bool(after.is_related_video)
+    if search_videos:
+        refresh_video_search(sorted(search_videos))
+    for (kind, name), delta in names.items():
+        # txid: lets an index being built skip changes its snapshot already contains
+        publish_event(AUTOCOMPLETE_CHANNEL, {"kind": kind, "name": name, "delta": delta, "txid": txid})
+    if related_flipped:
+        bump_catalog_version()
+
+
+def flush_vote_counts() -> int:
+    """
+    Fold the buffered votes into approval_count. Returns the number of votes applied.
+    Callers must not run two flushes at once (see app.workers.vote_flush_scheduler).
+    A batch left in FLUSHING_KEY by a failed flush is retried before new votes are taken; its
+    batch id is committed with the counts, so a batch that did commit is not added again.
+    """
+    if not redis_conn.exists(FLUSHING_KEY):
+        try:
+            redis_conn.rename(PENDING_KEY, FLUSHING_KEY)
+        except redis.ResponseError:  # no such key: nothing buffered
+            return 0
+    redis_conn.hsetnx(FLUSHING_KEY, _BATCH_FIELD, str(uuid4()))
+    batch = {field.decode(): value.decode() for field, value in redis_conn.hgetall(FLUSHING_KEY).items()}
+    batch_id = UUID(batch.pop(_BATCH_FIELD))
+    deltas = {suggestion_id: int(votes) for suggestion_id, votes in batch.items() if int(votes)}
+    rows = add_approval_counts(deltas, batch_id)
+    # The counts are committed: stop reads from adding the batch on top of them right away
+    redis_conn.delete(FLUSHING_KEY)
+    if rows is None:  # applied by an earlier attempt that failed before the delete
+        return 0
+    total = sum(deltas.values())
+    VOTE_COUNTS_FLUSHED.inc(total)
+    _counts_changed(rows, deltas)
+    return total
+
+
+def _reconcile_chunk(kind: str, after_id, chunk_size: int, grace_seconds: float) -> tuple[list[tuple], int, int]:
+    """
+    Recount one chunk of suggestions and correct the ones that drifted. Must hold FLUSH_LOCK_KEY.
+    Returns (counted rows, corrections, suggestions skipped because they were voted on recently).
+    """
+    flush_vote_counts()  # FLUSHING_KEY is gone, so a count is stored + PENDING_KEY
+    # Read the buffer before the count query takes its snapshot: a vote buffered by then committed
+    # its row earlier, so it is in both numbers. A vote whose row the snapshot sees but whose
+    # HINCRBY is missing here (a row commits before its HINCRBY) is newer than the grace period, so
+    # its suggestion is skipped and checked on a later run.
+    pending = {field.decode(): int(value) for field, value in redis_conn.hgetall(PENDING_KEY).items()}
+    rows = count_suggestion_votes(kind, after_id, chunk_size, grace_seconds)
+    corrections = [
+        (suggestion_id, stored, votes - pending.get(str(suggestion_id), 0))
+        for suggestion_id, stored, votes, recent in rows
+        if not recent and stored != votes - pending.get(str(suggestion_id), 0)
+    ]
+    updated = set_approval_counts(corrections)
+    deltas = {str(suggestion_id): count - stored for suggestion_id, stored, count in corrections}
+    for suggestion_id, *_ in updated:
+        VOTE_COUNT_CORRECTION_SIZE.labels(kind).observe(abs(deltas[str(suggestion_id)]))
+    VOTE_COUNT_CORRECTIONS.labels(kind).inc(len(updated))
+    _counts_changed(updated, deltas)
+    return rows, len(updated), sum(1 for row in rows if row[3])
+
+
+def reconcile_vote_counts(
+    chunk_size: int = VOTE_RECONCILE_CHUNK_SIZE,
+    grace_seconds: float = VOTE_RECONCILE_GRACE_SECONDS,
+) -> dict[str, dict[str, int]]:
+    """
+    Recompute approval_count from suggestion_votes for every kind, chunk_size suggestions (by id) at
+    a time, and overwrite the counts that drifted. The flush lock is taken per chunk, so buffered
+    votes keep flowing between chunks. Returns {kind: {checked, corrected, skipped}}.
+    """
+    result = {}
+    for kind in [*SUGGESTION_KINDS, RELATED_KIND]:
+        stats = result[kind] = {"checked": 0, "corrected": 0, "skipped": 0}
+        after_id = None
+        while True:
+            lock = redis_conn.lock(FLUSH_LOCK_KEY, timeout=60)
+            if not lock.acquire(blocking_timeout=60):
+                raise RuntimeError("vote count flush lock is busy; reconciliation stopped")
+            try:
+                rows, corrected, skipped = _reconcile_chunk(kind, after_id, chunk_size, grace_seconds)
+            finally:
+                release_flush_lock(lock)
+            stats["checked"] += len(rows)
+            stats["corrected"] += corrected
+            stats["skipped"] += skipped
+            if len(rows) < chunk_size:
+                break
+            after_id = rows[-1][0]
+    return result
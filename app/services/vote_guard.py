@@ -0,0 +1,108 @@
+"""
+Vote abuse throttling, checked in the API before a vote is queued.
+
+Two sliding-window counters per vote: one per voter_hash and kind, one per (client IP, target)
+and kind, where the target is the video for related votes and the suggestion otherwise. Rotating
+voter hashes from one address therefore still hits the (IP, target) quota; the IP is the one our
+own proxies saw (app.api.rate_limit.client_identifier), not a client-supplied header. Exceeding
+the voter quota flags the voter hash, which blocks all its votes; exceeding the (IP, target) quota
+flags only that (kind, IP, target), so other users behind a shared NAT can still vote elsewhere.
+Flags last VOTE_FLAG_TTL_SECONDS. A repeat of a vote already counted this window (same kind,
+voter and target) is a duplicate: it uses no quota and is left to the vote job, which ignores it.
+
+The sliding window is the usual two-bucket approximation: count = previous bucket weighted by the
+part of it still inside the window + current bucket. Check and increment run in one Lua script,
+so a vote costs one Redis round trip. Redis errors fail open.
+"""
+import hashlib
+import logging
+import time
+from enum import Enum
+
+import redis
+
+from app.core.config import VOTE_FLAG_TTL_SECONDS, VOTE_QUOTA_WINDOW_SECONDS, VOTE_QUOTAS
+from app.queues.redis_queue import redis_conn
+
+logger = logging.getLogger(__name__)
+
+
+class VoteVerdict(str, Enum):
+    allowed = "allowed"
+    flagged = "flagged"            # voter hash, or this IP on this target, is already flagged
+    voter_quota = "voter_quota"    # too many votes from this voter hash
+    ip_quota = "ip_quota"          # too many votes from this IP on this target
+    duplicate = "duplicate"        # same voter, kind and target already counted this window
+
+    @property
+    def rejected(self) -> bool:
+        return self in (VoteVerdict.flagged, VoteVerdict.voter_quota, VoteVerdict.ip_quota)
+
+
+_VERDICTS = [VoteVerdict.allowed, VoteVerdict.flagged, VoteVerdict.voter_quota, VoteVerdict.ip_quota, VoteVerdict.duplicate]
+
+# KEYS: voter cur, voter prev, ip-target cur, ip-target prev, voter flag, ip-target flag, seen
+# ARGV: voter quota, ip-target quota, previous bucket weight, bucket ttl, flag ttl
+_CHECK_AND_COUNT = redis_conn.register_script("""
+if redis.call('EXISTS', KEYS[5]) == 1 or redis.call('EXISTS', KEYS[6]) == 1 then
+    return 1
+end
+if redis.call('EXISTS', KEYS[7]) == 1 then
+    return 4
+end
+local weight = tonumber(ARGV[3])
+local voter = tonumber(redis.call('GET', KEYS[2]) or '0') * weight + tonumber(redis.call('GET', KEYS[1]) or '0')
+if voter + 1 > tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[5], 1, 'EX', ARGV[5])
+    return 2
+end
+local ip = tonumber(redis.call('GET', KEYS[4]) or '0') * weight + tonumber(redis.call('GET', KEYS[3]) or '0')
+if ip + 1 > tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[6], 1, 'EX', ARGV[5])
+    return 3
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+redis.call('SET', KEYS[7], 1, 'EX', ARGV[4])
+return 0
+""")
+
+
+def _digest(value: str) -> str:
+    # voter_hash is client-supplied and unbounded; keep key sizes fixed
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def check_vote(kind: str, voter_hash: str, client_ip: str, target: str) -> VoteVerdict:
+    """
+    Count the vote against the quotas for `kind` (see VOTE_QUOTAS) unless it exceeds one or is a
+    duplicate. Blocking (one Redis round trip): async routes call it via run_in_threadpool.
+    """
+    voter_quota, ip_quota = VOTE_QUOTAS[kind]
+    window = VOTE_QUOTA_WINDOW_SECONDS
+    now = time.time()
+    bucket = int(now // window)
+    weight = 1 - (now % window) / window
+
+    voter = _digest(voter_hash)
+    ip_target = f"{client_ip}:{target}"
+    keys = [
+        f"votequota:{kind}:voter:{voter}:{bucket}",
+        f"votequota:{kind}:voter:{voter}:{bucket - 1}",
+        f"votequota:{kind}:ip:{ip_target}:{bucket}",
+        f"votequota:{kind}:ip:{ip_target}:{bucket - 1}",
+        f"voteflag:voter:{voter}",
+        f"voteflag:{kind}:ip:{ip_target}",
+        f"votequota:{kind}:seen:{voter}:{target}",
+    ]
+    try:
+        code = _CHECK_AND_COUNT(keys=keys, args=[voter_quota, ip_quota, weight, 2 * window, VOTE_FLAG_TTL_SECONDS])
+    except redis.RedisError as e:
+        logger.warning("Vote guard unavailable, allowing vote: %s", e)
+        return VoteVerdict.allowed
+    verdict = _VERDICTS[int(code)]
+    if verdict in (VoteVerdict.voter_quota, VoteVerdict.ip_quota):
+        logger.warning("Vote anomaly flagged: kind=%s reason=%s ip=%s target=%s", kind, verdict.value, client_ip, target)
+    return verdict
@@ -0,0 +1,28 @@
+"""
+Scheduled incremental static catalog export (see app/services/static_export.py).
+"""
+from datetime import datetime
+from app.core.metrics import instrumented_job
+from app.core.config import STATIC_EXPORT_TARGET, STATIC_EXPORT_PAGE_SIZE
+from app.queues.redis_queue import redis_conn
+from app.services.static_export import export_static_catalog, open_target
+
+
+@instrumented_job
+def export_static_catalog_job():
+    """
+    Run an incremental export to STATIC_EXPORT_TARGET.
+    Every API process schedules this, so a Redis lock makes sure only one export runs at a time.
+    """
+    lock = redis_conn.lock("lock:static_export", timeout=1800)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        result = export_static_catalog(open_target(STATIC_EXPORT_TARGET), page_size=STATIC_EXPORT_PAGE_SIZE)
+        print(f"[{datetime.now()}] Static export: {result}")
+        return result
+    except Exception as e:
+        print(f"[{datetime.now()}] Error exporting static catalog: {str(e)}")
+        raise
+    finally:
+        lock.release()
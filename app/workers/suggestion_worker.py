@@ -1,90 +1,79 @@
 """
 Workers for suggestion and vote operations. All DB writes go through these jobs.
+One create job and one vote job serve every kind in app.domain.suggestion_kinds.
+Vote counts are write-behind (app.services.vote_counts): consensus, search, autocomplete weights
+and the catalog version follow votes when the buffered counts are flushed.
 """
+from functools import partial
 from uuid import UUID
 from app.db.repo.videos_repo import (
-    create_title_suggestion,
-    create_description_suggestion,
-    vote_title_suggestion,
-    vote_description_suggestion,
+    create_suggestion,
+    vote_suggestion,
+    refresh_video_search,
 )
-from app.domain.models import titleSuggestions, descriptionSuggestions
-
-
-def job_create_title_suggestion(video_id: str, title_text: str) -> dict:
-    """Create a title suggestion. Called from queue."""
-    row = create_title_suggestion(video_id, title_text)
-    return {
-        "id": str(row.id),
-        "video_id": row.video_id,
-        "title_text": row.title_text,
-        "approval_count": row.approval_count or 0,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-    }
-
-
-def job_create_description_suggestion(video_id: str, description_text: str) -> dict:
-    """Create a description suggestion. Called from queue."""
-    row = create_description_suggestion(video_id, description_text)
-    return {
-        "id": str(row.id),
-        "video_id": row.video_id,
-        "description_text": row.description_text,
-        "approval_count": row.approval_count or 0,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-    }
-
-
-def job_vote_title_suggestion(suggestion_id: str, voter_hash: str) -> bool:
-    """Vote on a title suggestion. Called from queue."""
-    return vote_title_suggestion(UUID(suggestion_id), voter_hash)
-
-
-def job_vote_description_suggestion(suggestion_id: str, voter_hash: str) -> bool:
-    """Vote on a description suggestion. Called from queue."""
-    return vote_description_suggestion(UUID(suggestion_id), voter_hash)
-
-
-def job_create_lesson_name_suggestion(video_id: str, lesson_name_text: str) -> dict:
-    """Create a lesson name suggestion. Called from queue."""
-    from app.db.repo.videos_repo import create_lesson_name_suggestion
-    row = create_lesson_name_suggestion(video_id, lesson_name_text)
-    return {
-        "id": str(row.id),
-        "video_id": row.video_id,
-        "lesson_name_text": row.lesson_name_text,
-        "approval_count": row.approval_count or 0,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-    }
-
-
-def job_create_lecturer_suggestion(video_id: str, lecturer_name_text: str) -> dict:
-    """Create a lecturer name suggestion. Called from queue."""
-    from app.db.repo.videos_repo import create_lecturer_suggestion
-    row = create_lecturer_suggestion(video_id, lecturer_name_text)
+from app.domain.suggestion_kinds import RELATED_KIND, SUGGESTION_KINDS
+from app.queues.pubsub import AUTOCOMPLETE_CHANNEL, publish_event, votes_channel
+from app.services.vote_counts import count_vote
+from app.core.metrics import instrumented_job
+from app.core.tracing import traced_job
+
+
+def _publish_vote(kind: str, video_id: str, suggestion_id, approval_count: int | None) -> None:
+    """Live tally update for GET /videos/{video_id}/stream and /ws subscribers (after the vote committed)."""
+    publish_event(votes_channel(video_id), {
+        "kind": kind,
+        "suggestion_id": str(suggestion_id),
+        "approval_count": approval_count or 0,
+    })
+
+
+@instrumented_job
+@traced_job
+def job_create_suggestion(kind: str, video_id: str, text: str) -> dict:
+    """Create a suggestion of the given kind. Called from queue."""
+    spec = SUGGESTION_KINDS[kind]
+    row = create_suggestion(kind, video_id, text)
+    if spec.searchable:
+        refresh_video_search([row.video_id])
+        publish_event(AUTOCOMPLETE_CHANNEL, {"kind": kind, "name": text, "delta": 0})
     return {
         "id": str(row.id),
         "video_id": row.video_id,
-        "lecturer_name_text": row.lecturer_name_text,
+        spec.text_field: text,
         "approval_count": row.approval_count or 0,
         "created_at": row.created_at.isoformat() if row.created_at else None,
     }
 
 
-def job_vote_lesson_name_suggestion(suggestion_id: str, voter_hash: str) -> bool:
-    """Vote on a lesson name suggestion. Called from queue."""
-    from app.db.repo.videos_repo import vote_lesson_name_suggestion
-    return vote_lesson_name_suggestion(UUID(suggestion_id), voter_hash)
+@instrumented_job
+@traced_job
+def job_vote_suggestion(kind: str, suggestion_id: str, voter_hash: str) -> bool:
+    """Vote on a suggestion of the given kind. Called from queue."""
+    row = vote_suggestion(kind, UUID(suggestion_id), voter_hash)
+    if row is None:
+        return False
+    _publish_vote(kind, row.video_id, row.id, count_vote(row.id, row.video_id, row.approval_count))
+    return True
 
 
-def job_vote_lecturer_suggestion(suggestion_id: str, voter_hash: str) -> bool:
-    """Vote on a lecturer suggestion. Called from queue."""
-    from app.db.repo.videos_repo import vote_lecturer_suggestion
-    return vote_lecturer_suggestion(UUID(suggestion_id), voter_hash)
+# Jobs enqueued before the kinds were unified reference per-kind functions by name
+# (job_create_title_suggestion, job_vote_title_suggestion, ...); keep them resolvable.
+for _kind in SUGGESTION_KINDS:
+    globals()[f"job_create_{_kind}_suggestion"] = partial(job_create_suggestion, _kind)
+    globals()[f"job_vote_{_kind}_suggestion"] = partial(job_vote_suggestion, _kind)
 
 
+@instrumented_job
+@traced_job
 def job_submit_related_vote(video_id: str, is_related: bool, voter_hash: str) -> bool:
     """Vote that a video is related or not. Ensures (video_id, is_related) row exists, then adds vote. Called from queue."""
-    from app.db.repo.videos_repo import get_or_create_related_suggestion, vote_related_suggestion
+    from app.db.repo.videos_repo import (
+        get_or_create_related_suggestion,
+        vote_related_suggestion,
+    )
     row = get_or_create_related_suggestion(video_id, is_related)
-    return vote_related_suggestion(row.id, voter_hash)
+    voted = vote_related_suggestion(row.id, voter_hash)
+    if voted is None:
+        return False
+    _publish_vote(RELATED_KIND, video_id, voted.id, count_vote(voted.id, video_id, voted.approval_count))
+    return True
@@ -0,0 +1,48 @@
+"""
+Scheduled flush of the write-behind vote counters and repair of approval_count drift
+(see app/services/vote_counts.py).
+"""
+from datetime import datetime
+from app.core.metrics import instrumented_job
+from app.queues.redis_queue import redis_conn
+from app.services.vote_counts import FLUSH_LOCK_KEY, flush_vote_counts, reconcile_vote_counts, release_flush_lock
+
+
+@instrumented_job
+def flush_vote_counts_job():
+    """
+    Fold the buffered votes into suggestions.approval_count.
+    Every API process schedules this, so a Redis lock makes sure only one flush runs at a time.
+    The timeout covers the DB write and the per-video follow-up; if a flush still outlives it, a
+    second flush can only retry the same batch, which its batch id makes a no-op.
+    """
+    lock = redis_conn.lock(FLUSH_LOCK_KEY, timeout=120)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        return flush_vote_counts()
+    except Exception as e:
+        print(f"[{datetime.now()}] Error flushing vote counts: {str(e)}")
+        raise
+    finally:
+        release_flush_lock(lock)
+
+
+@instrumented_job
+def reconcile_vote_counts_job():
+    """
+    Recount approval_count from the vote rows and repair drift.
+    Every API process schedules this, so a Redis lock makes sure only one run is active at a time.
+    """
+    lock = redis_conn.lock("lock:vote_reconcile", timeout=3600)
+    if not lock.acquire(blocking=False):
+        return None
+    try:
+        result = reconcile_vote_counts()
+        print(f"[{datetime.now()}] Vote count reconciliation: {result}")
+        return result
+    except Exception as e:
+        print(f"[{datetime.now()}] Error reconciling vote counts: {str(e)}")
+        raise
+    finally:
+        lock.release()
@@ -2,11 +2,14 @@
 Scheduled task to fetch YouTube videos daily.
 """
 from datetime import datetime
+from app.core.metrics import instrumented_job
 from app.services.youtube_service import get_channel_videos
 from app.domain.youtube import YouTubeVideo
-from app.db.repo.videos_repo import insert_youtube_videos
+from app.db.repo.videos_repo import insert_youtube_videos, refresh_video_search
+from app.services.catalog_snapshot import bump_catalog_version
 
 
+@instrumented_job
 def fetch_and_store_youtube_videos():
     """
     Fetch videos from YouTube channel and store them in database.
@@ -28,8 +31,11 @@ def fetch_and_store_youtube_videos():
                 published_at=published_at
             ))
         
-        # Store in database
-        insert_youtube_videos(videos)
+        # Store in database and index the new ones for search
+        new_ids = insert_youtube_videos(videos)
+        refresh_video_search(new_ids)
+        if new_ids:
+            bump_catalog_version()
         
         print(f"[{datetime.now()}] Successfully fetched and stored {len(videos)} videos")
         return len(videos)
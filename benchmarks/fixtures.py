@@ -0,0 +1,120 @@
+"""
+Throwaway local Postgres and Redis for benchmarks, started from the installed binaries (no docker).
+
+    with local_postgres() as pg, local_redis() as redis_url:
+        ...
+
+Postgres: initdb into a temp directory, listen on a unix socket + free port, create the database
+and load database_schema.sql (needs the uuid-ossp and pg_trgm contrib extensions). Binaries are
+looked up in $PG_BIN, then PATH. Redis: redis-server with persistence off, from $REDIS_SERVER or
+PATH. Both are stopped and deleted on exit.
+"""
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+SCHEMA = Path(__file__).resolve().parent.parent / "database_schema.sql"
+
+
+@dataclass(frozen=True)
+class PostgresInstance:
+    host: str      # unix socket directory
+    port: int
+    user: str
+    database: str
+
+    def env(self) -> dict:
+        """Environment variables app.core.config reads."""
+        return {
+            "HOST": self.host,
+            "PORT": str(self.port),
+            "USER": self.user,
+            "PASSWORD": "",
+            "DATABASE_Name": self.database,
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _binary(name: str, env_dir: str | None = None) -> str:
+    if env_dir:
+        path = Path(env_dir) / name
+        if path.exists():
+            return str(path)
+    found = shutil.which(name)
+    if not found:
+        raise RuntimeError(f"{name} not found: install it or point PG_BIN / REDIS_SERVER at it")
+    return found
+
+
+def _wait_for(predicate, what: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"Timed out waiting for {what}")
+
+
+@contextmanager
+def local_postgres(database: str = "bench"):
+    pg_bin = os.environ.get("PG_BIN")
+    initdb, pg_ctl, psql = (_binary(n, pg_bin) for n in ("initdb", "pg_ctl", "psql"))
+    root = tempfile.mkdtemp(prefix="bench-pg-")
+    data, sock = os.path.join(root, "data"), os.path.join(root, "sock")
+    os.makedirs(sock)
+    port = free_port()
+    user = "bench"
+
+    subprocess.run(
+        [initdb, "-D", data, "-U", user, "--auth=trust", "--encoding=UTF8", "--locale=C.UTF-8"],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    subprocess.run(
+        [pg_ctl, "-D", data, "-l", os.path.join(root, "postgres.log"), "-w", "start",
+         "-o", f"-p {port} -k {sock} -c listen_addresses='' -c fsync=off -c max_connections=300"],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    try:
+        base = [psql, "-q", "-h", sock, "-p", str(port), "-U", user, "-v", "ON_ERROR_STOP=1"]
+        subprocess.run(base + ["-d", "postgres", "-c", f"CREATE DATABASE {database}"], check=True)
+        subprocess.run(base + ["-d", database, "-f", str(SCHEMA)], check=True, stdout=subprocess.DEVNULL)
+        yield PostgresInstance(host=sock, port=port, user=user, database=database)
+    finally:
+        subprocess.run([pg_ctl, "-D", data, "-m", "immediate", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@contextmanager
+def local_redis():
+    """Yields a redis:// URL."""
+    server = _binary("redis-server", os.environ.get("REDIS_SERVER"))
+    port = free_port()
+    proc = subprocess.Popen(
+        [server, "--port", str(port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+    )
+
+    def accepting() -> bool:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return True
+        except OSError:
+            return False
+
+    try:
+        _wait_for(accepting, "redis-server")
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        proc.terminate()
+        proc.wait()
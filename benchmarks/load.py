@@ -0,0 +1,347 @@
+"""
+Load test: the real FastAPI app and RQ worker against a seeded local Postgres and Redis.
+
+    python -m benchmarks.load --videos 2000 --suggestions 5 --votes 20 --concurrency 50 --duration 60 \\
+        --save baseline
+    python -m benchmarks.load ... --compare benchmarks/baselines/load-baseline.json
+
+Starts throwaway Postgres/Redis (benchmarks/fixtures.py; --external uses the DB/REDIS_URL environment
+instead, with an empty database that has the schema loaded), seeds the catalog, runs
+`uvicorn app.main:app` (whose lifespan starts the rq worker), and drives a weighted mix of reads,
+votes and creates from --concurrency virtual users. The harness stands in for the one trusted proxy
+(TRUSTED_PROXY_HOPS=1): each virtual user sends its own fixed X-Forwarded-For address, like one
+real client, so the per-IP rate limits and vote quotas apply exactly as in production.
+
+Reports throughput, error/429 counts and p50/p95/p99 latency per operation, plus vote-to-visible
+lag: probes vote on title suggestions reserved for them and poll the GET endpoint until the new count
+shows. Results are written as JSON (benchmarks/baselines/load-<name>.json) and can be diffed
+against a previous run. Needs httpx (benchmarks/requirements.txt).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fixtures import free_port, local_postgres, local_redis
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines"
+
+DEFAULT_MIX = "catalog=5,video=15,suggestions=35,related=5,search=10,autocomplete=10,vote=12,related_vote=4,create=4"
+REGRESSION_THRESHOLD = 0.20
+
+
+def percentile(sorted_values: list[float], p: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))  # nearest rank
+    return round(sorted_values[index], 3)
+
+
+def summarize(latencies_ms: list[float]) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": round(values[-1], 3) if values else None,
+    }
+
+
+class Workload:
+    def __init__(self, catalog, probe_videos: int):
+        self.catalog = catalog
+        self.video_ids = catalog.video_ids
+        # Title suggestions of the first videos are reserved for lag probes
+        self.probe_videos = self.video_ids[:probe_videos]
+        self.vote_videos = self.video_ids[probe_videos:] or self.video_ids
+
+    def request(self, op: str) -> tuple[str, str, dict | None, dict | None]:
+        """(method, url, params, json body) for one operation."""
+        video_id = random.choice(self.video_ids)
+        if op == "catalog":
+            return "GET", "/api/videos", None, None
+        if op == "video":
+            return "GET", f"/api/videos/{video_id}", None, None
+        if op == "suggestions":
+            kind = random.choice(["title", "description", "lesson-name", "lecturer"])
+            return "GET", f"/api/videos/{video_id}/{kind}-suggestions", {"rank": random.choice(["top", "hot"])}, None
+        if op == "related":
+            return "GET", f"/api/videos/{video_id}/related-suggestions", None, None
+        if op == "search":
+            return "GET", "/api/search", {"q": random.choice(self.catalog.lesson_names)}, None
+        if op == "autocomplete":
+            name = random.choice(self.catalog.lecturers)
+            return "GET", "/api/autocomplete", {"kind": "lecturer", "q": name[: random.randint(1, 4)]}, None
+        if op == "vote":
+            video_id = random.choice(self.vote_videos)
+            suggestion_id = random.choice(self.catalog.title_suggestions[video_id])
+            return "POST", f"/api/title-suggestions/{suggestion_id}/vote", None, {"voter_hash": uuid.uuid4().hex}
+        if op == "related_vote":
+            return "POST", f"/api/videos/{video_id}/related-vote", None, {
+                "is_related": random.random() < 0.7, "voter_hash": uuid.uuid4().hex,
+            }
+        if op == "create":
+            return "POST", f"/api/videos/{video_id}/title-suggestions", None, {
+                "video_id": video_id, "title_text": f"عنوان مقترح {uuid.uuid4().hex[:8]}",
+            }
+        raise ValueError(f"Unknown operation {op}")
+
+
+def client_headers(n: int) -> dict:
+    """Headers of virtual client n: one stable address per client, as our proxy would forward it."""
+    return {"X-Forwarded-For": f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"}
+
+
+PROBE_CLIENT = 0xFFFFFF   # address of the lag prober (10.255.255.255); virtual users count from 1
+
+
+async def virtual_user(client, workload, ops, weights, stats, measure_from, deadline, headers):
+    while time.monotonic() < deadline:
+        op = random.choices(ops, weights)[0]
+        method, url, params, body = workload.request(op)
+        start = time.monotonic()
+        try:
+            response = await client.request(method, url, params=params, json=body, headers=headers)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        if start < measure_from:
+            continue
+        entry = stats.setdefault(op, {"latencies": [], "errors": 0, "rejected": 0})
+        entry["latencies"].append((time.monotonic() - start) * 1000)
+        if status == 429:
+            entry["rejected"] += 1
+        elif status is None or status >= 400:
+            entry["errors"] += 1
+
+
+async def _title_count(client, video_id: str, suggestion_id: str, limit: int) -> int | None:
+    response = await client.get(
+        f"/api/videos/{video_id}/title-suggestions", params={"limit": limit}, headers=client_headers(PROBE_CLIENT)
+    )
+    for row in response.json().get("data") or []:
+        if row["id"] == suggestion_id:
+            return row["approval_count"]
+    return None
+
+
+async def lag_prober(client, workload, lags, misses, interval, measure_from, deadline, limit, timeout=10.0):
+    """misses: {"timeouts": n, "rejected": n}; a probe vote rejected by a quota is not a lag sample."""
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        video_id = random.choice(workload.probe_videos)
+        suggestion_id = random.choice(workload.catalog.title_suggestions[video_id])
+        before = await _title_count(client, video_id, suggestion_id, limit)
+        if before is None:
+            continue
+        start = time.monotonic()
+        response = await client.post(
+            f"/api/title-suggestions/{suggestion_id}/vote",
+            json={"voter_hash": uuid.uuid4().hex},
+            headers=client_headers(PROBE_CLIENT),
+        )
+        if response.status_code == 429:
+            misses["rejected"] += 1
+            continue
+        while True:
+            count = await _title_count(client, video_id, suggestion_id, limit)
+            if count is not None and count > before:
+                if start >= measure_from:
+                    lags.append((time.monotonic() - start) * 1000)
+                break
+            if time.monotonic() - start > timeout:
+                misses["timeouts"] += 1
+                break
+            await asyncio.sleep(0.02)
+
+
+async def run_load(base_url, workload, mix, concurrency, duration, warmup, probe_interval, suggestions):
+    ops, weights = zip(*mix.items())
+    stats: dict[str, dict] = {}
+    lags: list[float] = []
+    misses = {"timeouts": 0, "rejected": 0}
+    limits = httpx.Limits(max_connections=concurrency + 4, max_keepalive_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        now = time.monotonic()
+        measure_from, deadline = now + warmup, now + warmup + duration
+        tasks = [
+            virtual_user(client, workload, ops, weights, stats, measure_from, deadline, client_headers(n))
+            for n in range(1, concurrency + 1)
+        ]
+        if workload.probe_videos and probe_interval > 0:
+            tasks.append(lag_prober(client, workload, lags, misses, probe_interval, measure_from, deadline, suggestions))
+        await asyncio.gather(*tasks)
+
+    operations = {}
+    for op, entry in sorted(stats.items()):
+        operations[op] = {
+            "requests": len(entry["latencies"]),
+            "rps": round(len(entry["latencies"]) / duration, 2),
+            "errors": entry["errors"],
+            "rejected_429": entry["rejected"],
+            **summarize(entry["latencies"]),
+        }
+    return {
+        "total_rps": round(sum(o["requests"] for o in operations.values()) / duration, 2),
+        "operations": operations,
+        "vote_to_visible": {"probes": len(lags), **misses, **summarize(lags)},
+    }
+
+
+def _wait_ready(base_url: str, proc, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("API process exited during startup")
+        try:
+            if httpx.get(base_url + "/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(result: dict, baseline: dict) -> list[str]:
+    """Human-readable diff; lines for regressions start with '!'."""
+    lines = []
+    for op, current in result["operations"].items():
+        before = baseline.get("operations", {}).get(op)
+        if not before:
+            continue
+        for key, worse_if_higher in (("rps", False), ("p95_ms", True), ("p99_ms", True)):
+            old, new = before.get(key), current.get(key)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regression = change > REGRESSION_THRESHOLD if worse_if_higher else change < -REGRESSION_THRESHOLD
+            lines.append(f"{'!' if regression else ' '} {op:<14} {key:<7} {old:>10} -> {new:>10}  ({change:+.0%})")
+    old_lag = baseline.get("vote_to_visible", {}).get("p95_ms")
+    new_lag = result["vote_to_visible"].get("p95_ms")
+    if old_lag and new_lag is not None:
+        change = (new_lag - old_lag) / old_lag
+        lines.append(f"{'!' if change > REGRESSION_THRESHOLD else ' '} {'vote→visible':<14} p95_ms  {old_lag:>10} -> {new_lag:>10}  ({change:+.0%})")
+    return lines
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        mix[op.strip()] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test against local Postgres/Redis and the real app")
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--suggestions", type=int, default=5, help="suggestions of each kind per video")
+    parser.add_argument("--votes", type=int, default=20, help="average votes per suggestion")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="op=weight,... (%(default)s)")
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--probe-videos", type=int, default=20, help="videos whose title suggestions only lag probes vote on")
+    parser.add_argument("--probe-interval", type=float, default=0.5)
+    parser.add_argument("--rate-limit", action="store_true", help="keep RATE_LIMIT_ENABLED on (off by default)")
+    parser.add_argument("--external", action="store_true", help="use the DB / REDIS_URL environment instead of fixtures")
+    parser.add_argument("--save", metavar="NAME", help="write benchmarks/baselines/load-NAME.json")
+    parser.add_argument("--compare", metavar="PATH", help="diff against a saved result")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--note", help="free text stored with the result (machine, Redis / Postgres build, ...)")
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    with ExitStack() as stack:
+        env = dict(os.environ)
+        if not args.external:
+            pg = stack.enter_context(local_postgres())
+            env.update(pg.env())
+            env["REDIS_URL"] = stack.enter_context(local_redis())
+        env["RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+        env["TRUSTED_PROXY_HOPS"] = "1"   # the harness is the proxy: X-Forwarded-For is the client address
+        env.pop("TRUSTED_PROXIES", None)
+        os.environ.update(env)
+
+        from benchmarks.seed import seed_catalog  # imports app.*, which reads the environment
+
+        started = time.monotonic()
+        catalog = seed_catalog(args.videos, args.suggestions, args.votes)
+        print(f"Seeded {len(catalog.video_ids)} videos in {time.monotonic() - started:.1f}s")
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+             "--workers", str(args.api_workers), "--log-level", "warning", "--no-access-log"],
+            cwd=ROOT, env=env, start_new_session=True,
+        )
+        # The app's lifespan spawns `rq worker`; stop the whole process group, not just uvicorn
+        stack.callback(api.wait)
+        stack.callback(os.killpg, api.pid, signal.SIGTERM)
+        _wait_ready(base_url, api)
+
+        workload = Workload(catalog, min(args.probe_videos, len(catalog.video_ids) // 2))
+        result = asyncio.run(run_load(
+            base_url, workload, mix, args.concurrency, args.duration, args.warmup,
+            args.probe_interval, args.suggestions,
+        ))
+
+    result = {
+        "params": {k: v for k, v in vars(args).items() if k not in ("save", "compare", "fail_on_regression")},
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        **result,
+    }
+
+    print(f"\n{'operation':<14} {'req':>8} {'rps':>9} {'err':>6} {'429':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for op, o in result["operations"].items():
+        print(f"{op:<14} {o['requests']:>8} {o['rps']:>9} {o['errors']:>6} {o['rejected_429']:>6} "
+              f"{o['p50_ms']:>9} {o['p95_ms']:>9} {o['p99_ms']:>9}")
+    lag = result["vote_to_visible"]
+    print(f"\ntotal {result['total_rps']} rps; vote→visible p50 {lag['p50_ms']} ms, p95 {lag['p95_ms']} ms, "
+          f"p99 {lag['p99_ms']} ms ({lag['probes']} probes, {lag['timeouts']} timeouts, {lag['rejected']} rejected)")
+
+    # Read the baseline before --save can overwrite it
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        path = BASELINES / f"load-{args.save}.json"
+        path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Saved {path}")
+
+    if baseline is not None:
+        lines = compare(result, baseline)
+        print("\n".join(["", f"vs {args.compare}:"] + lines))
+        if args.fail_on_regression and any(line.startswith("!") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Per-row cost of the hot conversions: DB row -> dataclass -> response, and YouTube item -> domain.
+
+    python -m benchmarks.micro [--rows 1000 10000 100000] [--only suggestion_to_video_info ...]
+    python -m benchmarks.micro --save                      # update benchmarks/baselines/micro.json
+    python -m benchmarks.micro --compare --fail-on-regression
+
+Cases (inputs are built up front, so only the conversion is timed):
+
+  row_to_suggestion           tuple-cursor row -> SuggestionVideo
+  title_suggestion_dataclass  tuple-cursor row -> titleSuggestions(*row), as every suggestions query does
+  title_response_pydantic     titleSuggestions -> TitleSuggestionResponse (the old response path)
+  suggestions_body_pydantic   rows -> SuccessResponse envelope -> validated -> JSON (benchmarks/serialization.py)
+  suggestions_body_orjson     rows -> FastJSONResponse body (what the GET routes do now)
+  suggestion_to_video_info    SuggestionVideo -> VideoInfo, with the three Enum lookups
+  parse_youtube_item          playlistItems API item -> YouTubeVideo
+
+Reported in microseconds per row, best of --repeat runs. No database or Redis is needed. Timings
+are machine-specific: regenerate the baseline on the machine you compare on.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from app.domain.enum import CommonSubLevel, MainAcademicLevel, SpecializedLevel
+from app.domain.models import SuggestionVideo, titleSuggestions
+from app.mappers.video_mapper import row_to_suggestion, suggestion_to_video_info
+from app.mappers.youtube_mapper import parse_youtube_item
+from app.schemas.suggestions import TitleSuggestionResponse
+from benchmarks.serialization import fast_path, old_path
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+REGRESSION_THRESHOLD = 0.20   # slower than baseline by more than this fraction is flagged
+
+
+def _title_rows(n: int) -> list[tuple]:
+    now = datetime.now()
+    return [
+        (uuid.uuid4(), f"video{i % 500:05d}", f"شرح متن الآجرومية - الدرس {i}", i % 37, now - timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def _suggestion_video_rows(n: int) -> list[tuple]:
+    """Rows in SuggestionVideo.columns order."""
+    main, common, specialized = list(MainAcademicLevel), list(CommonSubLevel), list(SpecializedLevel)
+    today = date.today()   # batch is a DATE column
+    return [
+        (
+            f"video{i:07d}",
+            main[i % len(main)].value,
+            common[i % len(common)].value,
+            specialized[i % len(specialized)].value if i % 2 else None,
+            f"شرح متن الآجرومية - الدرس {i}",
+            "باب الإعراب",
+            today,
+            bool(i % 3),
+            "محمد عبد الله",
+        )
+        for i in range(n)
+    ]
+
+
+def _youtube_items(n: int) -> list[dict]:
+    return [
+        {
+            "kind": "youtube#playlistItem",
+            "snippet": {
+                "publishedAt": "2024-03-01T12:00:00Z",
+                "title": f"شرح متن الآجرومية - الدرس {i}",
+                "resourceId": {"kind": "youtube#video", "videoId": f"vid{i:08d}"},
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def _title_response(ts: titleSuggestions) -> TitleSuggestionResponse:
+    return TitleSuggestionResponse(
+        id=ts.id,
+        video_id=ts.video_id,
+        title_text=ts.title_text,
+        approval_count=ts.approval_count or 0,
+        created_at=ts.created_at,
+    )
+
+
+# name -> (build inputs for n rows, per-call function over the whole input)
+CASES = {
+    "row_to_suggestion": (
+        _suggestion_video_rows,
+        lambda rows: [row_to_suggestion(r) for r in rows],
+    ),
+    "title_suggestion_dataclass": (
+        _title_rows,
+        lambda rows: [titleSuggestions(*r) for r in rows],
+    ),
+    "title_response_pydantic": (
+        lambda n: [titleSuggestions(*r) for r in _title_rows(n)],
+        lambda rows: [_title_response(ts) for ts in rows],
+    ),
+    "suggestions_body_pydantic": (
+        lambda n: [titleSuggestions(*r) for r in _title_rows(n)],
+        old_path,
+    ),
+    "suggestions_body_orjson": (
+        lambda n: [titleSuggestions(*r) for r in _title_rows(n)],
+        fast_path,
+    ),
+    "suggestion_to_video_info": (
+        lambda n: [SuggestionVideo(*r) for r in _suggestion_video_rows(n)],
+        lambda rows: [suggestion_to_video_info(s) for s in rows],
+    ),
+    "parse_youtube_item": (
+        _youtube_items,
+        lambda items: [parse_youtube_item(i) for i in items],
+    ),
+}
+
+
+def bench(fn, inputs, repeat: int) -> float:
+    """Best per-row time in microseconds."""
+    best = min(timeit.repeat(lambda: fn(inputs), number=1, repeat=repeat))
+    return best / len(inputs) * 1e6
+
+
+def run(cases: list[str], sizes: list[int], repeat: int) -> dict:
+    results: dict[str, dict[str, float]] = {}
+    for name in cases:
+        build, fn = CASES[name]
+        results[name] = {}
+        for n in sizes:
+            us = bench(fn, build(n), repeat)
+            results[name][str(n)] = round(us, 4)
+            print(f"{name:<28} {n:>7} rows  {us:9.3f} us/row", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    lines = []
+    for name, by_size in results.items():
+        for n, us in by_size.items():
+            before = baseline.get(name, {}).get(n)
+            if not before:
+                continue
+            change = us / before - 1
+            flag = "!" if change > REGRESSION_THRESHOLD else " "
+            lines.append(f"{flag} {name:<28} {n:>7}  {before:9.3f} -> {us:9.3f} us/row  ({change:+.0%})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="run a subset of the cases")
+    parser.add_argument("--save", action="store_true", help=f"write the results to {BASELINE.name}")
+    parser.add_argument("--compare", action="store_true", help=f"diff against {BASELINE.name}")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help=f"exit 1 if any case is over {REGRESSION_THRESHOLD:.0%} slower than the baseline")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))["results"] if args.compare else None
+    results = run(args.only or list(CASES), args.rows, args.repeat)
+
+    if args.save:
+        BASELINE.parent.mkdir(exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        BASELINE.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved {BASELINE}")
+
+    if baseline is not None:
+        lines = compare(results, baseline)
+        print("\n".join(["", f"vs {BASELINE}:"] + lines))
+        if args.fail_on_regression and any(line.startswith("!") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
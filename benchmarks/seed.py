@@ -0,0 +1,110 @@
+"""
+Seed a benchmark catalog: N videos, M suggestions of each kind per video, about V votes per suggestion.
+
+Rows are generated set-based in SQL (generate_series), then the derived state the app maintains is
+built the same way the app builds it: consensus projection per video, the search index and the
+facet counts. Import only after the DB environment variables are set (app.core.config reads them).
+"""
+from dataclasses import dataclass
+
+from app.db.connection import db_pool
+from app.db.repo.videos_repo import project_video_consensus, rebuild_catalog_facets, refresh_video_search
+from app.domain.enum import CommonSubLevel, MainAcademicLevel, SpecializedLevel
+from app.domain.suggestion_kinds import NOT_RELATED, RELATED, RELATED_KIND
+
+# free-text kinds: generated text prefix
+_PREFIXES = {
+    "title": "شرح الدرس",
+    "description": "وصف الدرس",
+}
+
+_LESSONS = ["الطهارة", "الصلاة", "الزكاة", "الصيام", "الحج", "البيوع", "النحو", "الصرف", "البلاغة", "التوحيد"]
+_LECTURERS = ["محمد عبد الله", "أحمد مصطفى", "علي جمعة", "حسن الشافعي", "عبد الرحمن يوسف", "إبراهيم الهدهد"]
+
+
+@dataclass
+class SeededCatalog:
+    video_ids: list[str]
+    title_suggestions: dict[str, list[str]]   # video_id -> title suggestion ids
+    lesson_names: list[str]
+    lecturers: list[str]
+
+
+def _array(values) -> str:
+    return "ARRAY[" + ", ".join("'" + v.replace("'", "''") + "'" for v in values) + "]"
+
+
+def seed_catalog(videos: int, suggestions: int, votes: int, random_seed: float = 0.42) -> SeededCatalog:
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT setseed(%s)", (random_seed,))
+            cur.execute(
+                """
+                INSERT INTO video_info (video_id, title, published_at)
+                SELECT 'bench' || lpad(g::text, 7, '0'), 'درس رقم ' || g, NOW() - g * INTERVAL '1 hour'
+                FROM generate_series(1, %s) g
+                """,
+                (videos,),
+            )
+            main, common, specialized = (
+                _array(e.value for e in enum) for enum in (MainAcademicLevel, CommonSubLevel, SpecializedLevel)
+            )
+            cur.execute(
+                f"""
+                INSERT INTO suggestion_video_info (video_id, main_level, common_sub_level, specialized_level)
+                SELECT video_id,
+                       ({main})[1 + floor(random() * {len(MainAcademicLevel)})::int],
+                       ({common})[1 + floor(random() * {len(CommonSubLevel)})::int],
+                       CASE WHEN random() < 0.5 THEN ({specialized})[1 + floor(random() * {len(SpecializedLevel)})::int] END
+                FROM video_info
+                """
+            )
+            names = {
+                "lesson_name": _array(_LESSONS),
+                "lecturer": _array(_LECTURERS),
+            }
+            for kind in ("title", "description", "lesson_name", "lecturer"):
+                pool = names.get(kind)
+                text = f"({pool})[1 + floor(random() * array_length({pool}, 1))::int]" if pool else f"'{_PREFIXES[kind]} ' || v.video_id || ' ' || s"
+                cur.execute(
+                    f"""
+                    INSERT INTO suggestions (kind, video_id, text, approval_count, created_at)
+                    SELECT %s, v.video_id, {text}, floor(random() * %s)::int, NOW() - random() * INTERVAL '30 days'
+                    FROM video_info v CROSS JOIN generate_series(1, %s) s
+                    """,
+                    (kind, 2 * votes + 1, suggestions),
+                )
+            cur.execute(
+                """
+                INSERT INTO suggestions (kind, video_id, text, approval_count)
+                SELECT %s, video_id, r, floor(random() * %s)::int FROM video_info CROSS JOIN (VALUES (%s), (%s)) AS x(r)
+                """,
+                (RELATED_KIND, 2 * votes + 1, RELATED, NOT_RELATED),
+            )
+            cur.execute("UPDATE suggestions SET score = suggestion_hot_score(approval_count, created_at)")
+            cur.execute(
+                """
+                INSERT INTO suggestion_votes (suggestion_id, voter_hash)
+                SELECT t.id, voter_key(t.id::text || n) FROM suggestions t CROSS JOIN LATERAL generate_series(1, t.approval_count) n
+                """
+            )
+            conn.commit()
+
+            cur.execute("SELECT video_id FROM video_info ORDER BY video_id")
+            video_ids = [r[0] for r in cur.fetchall()]
+            cur.execute("SELECT video_id, id::text FROM suggestions WHERE kind = 'title' ORDER BY video_id, id")
+            title_suggestions: dict[str, list[str]] = {}
+            for video_id, suggestion_id in cur.fetchall():
+                title_suggestions.setdefault(video_id, []).append(suggestion_id)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        db_pool.putconn(conn)
+
+    for video_id in video_ids:
+        project_video_consensus(video_id)
+    refresh_video_search()
+    rebuild_catalog_facets()
+    return SeededCatalog(video_ids, title_suggestions, _LESSONS, _LECTURERS)
@@ -0,0 +1,85 @@
+"""
+Per-row serialization cost of a suggestions GET: the old pydantic path vs the fast JSON path.
+
+    python -m benchmarks.serialization [--rows 1000 10000]
+
+old:  dataclass -> TitleSuggestionResponse -> SuccessResponse -> response_model validation -> dict -> json
+fast: dataclass -> orjson (app.api.fast_json.FastJSONResponse)
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.fast_json import FastJSONResponse
+from app.domain.models import titleSuggestions
+from app.schemas.responses import SuccessResponse
+from app.schemas.suggestions import TitleSuggestionResponse
+
+
+def make_rows(n: int) -> list[titleSuggestions]:
+    now = datetime.now()
+    return [
+        titleSuggestions(
+            id=uuid.uuid4(),
+            video_id=f"video{i % 500:05d}",
+            title_text=f"شرح متن الآجرومية - الدرس {i}",
+            approval_count=i % 37,
+            created_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def old_path(rows: list[titleSuggestions]) -> bytes:
+    body = SuccessResponse(
+        success=True,
+        message="Title suggestions fetched successfully",
+        data=[
+            TitleSuggestionResponse(
+                id=ts.id,
+                video_id=ts.video_id,
+                title_text=ts.title_text,
+                approval_count=ts.approval_count or 0,
+                created_at=ts.created_at,
+            )
+            for ts in rows
+        ],
+    )
+    # What FastAPI does with response_model: validate again, then encode and dump
+    validated = SuccessResponse.model_validate(body.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def fast_path(rows: list[titleSuggestions]) -> bytes:
+    return FastJSONResponse({
+        "success": True,
+        "message": "Title suggestions fetched successfully",
+        "data": rows,
+    }).body
+
+
+def bench(fn, rows, repeat: int) -> float:
+    """Best per-row time in microseconds."""
+    best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=repeat))
+    return best / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        rows = make_rows(n)
+        old = bench(old_path, rows, args.repeat)
+        fast = bench(fast_path, rows, args.repeat)
+        print(f"{n:>7} rows  old {old:8.3f} us/row   fast {fast:8.3f} us/row   x{old / fast:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
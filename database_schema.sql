@@ -25,126 +25,273 @@ CREATE TABLE IF NOT EXISTS suggestion_video_info (
     FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
 );
 
--- Title Suggestions Table
-CREATE TABLE IF NOT EXISTS title_suggestions (
+-- Video Votes Table
+CREATE TABLE IF NOT EXISTS video_votes (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     video_id TEXT NOT NULL,
-    title_text TEXT NOT NULL,
-    approval_count INTEGER DEFAULT 0,
+    voter_hash TEXT NOT NULL,
     created_at TIMESTAMP DEFAULT NOW(),
     FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
 );
 
--- Description Suggestions Table
-CREATE TABLE IF NOT EXISTS description_suggestions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    video_id TEXT NOT NULL,
-    description_text TEXT NOT NULL,
-    approval_count INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
-);
+-- Create indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_video_info_published_at ON video_info(published_at DESC);
+-- Full-catalog export order: a streamed export reads rows off this index instead of sorting the table first
+CREATE INDEX IF NOT EXISTS idx_video_info_published_at_video_id ON video_info(published_at DESC, video_id);
 
--- Title Votes Table
-CREATE TABLE IF NOT EXISTS title_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    title_suggestion_id UUID NOT NULL,
-    voter_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (title_suggestion_id) REFERENCES title_suggestions(id) ON DELETE CASCADE,
-    UNIQUE(title_suggestion_id, voter_hash)
-);
+-- -------------------------------------------------------------------
+-- Search: Arabic-normalized full-text + trigram index over videos
+-- -------------------------------------------------------------------
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
--- Description Votes Table
-CREATE TABLE IF NOT EXISTS description_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    description_suggestion_id UUID NOT NULL,
-    voter_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (description_suggestion_id) REFERENCES description_suggestions(id) ON DELETE CASCADE,
-    UNIQUE(description_suggestion_id, voter_hash)
-);
+-- Same rules as app/core/arabic.py: strip tashkeel/tatweel, unify alef/ya/ta-marbuta forms
+CREATE OR REPLACE FUNCTION normalize_arabic(input TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+    SELECT btrim(regexp_replace(lower(translate(
+        regexp_replace(input, '[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]', '', 'g'),
+        U&'\0623\0625\0622\0671\0649\0629',
+        U&'\0627\0627\0627\0627\064A\0647'
+    )), '\s+', ' ', 'g'))
+$$;
 
--- Video Votes Table
-CREATE TABLE IF NOT EXISTS video_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    video_id TEXT NOT NULL,
-    voter_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW(),
+-- One row per video: YouTube title plus the leading lesson name and lecturer suggestions.
+-- Maintained incrementally by the ingestion job and the lesson/lecturer suggestion jobs.
+CREATE TABLE IF NOT EXISTS video_search (
+    video_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    lesson_name TEXT,
+    lecturer_name TEXT,
+    search_text TEXT NOT NULL,
+    document TSVECTOR NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW(),
     FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
 );
 
--- Lesson Name Suggestions Table
-CREATE TABLE IF NOT EXISTS lesson_name_suggestions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    video_id TEXT NOT NULL,
-    lesson_name_text TEXT NOT NULL,
-    approval_count INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
-);
+CREATE INDEX IF NOT EXISTS idx_video_search_document ON video_search USING GIN (document);
+CREATE INDEX IF NOT EXISTS idx_video_search_text_trgm ON video_search USING GIN (search_text gin_trgm_ops);
 
--- Lesson Name Votes Table
-CREATE TABLE IF NOT EXISTS lesson_name_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    lesson_name_suggestion_id UUID NOT NULL,
-    voter_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (lesson_name_suggestion_id) REFERENCES lesson_name_suggestions(id) ON DELETE CASCADE,
-    UNIQUE(lesson_name_suggestion_id, voter_hash)
+-- -------------------------------------------------------------------
+-- Catalog facets: video counts per academic level value
+-- -------------------------------------------------------------------
+-- Maintained by a row trigger on suggestion_video_info, so the level navigation never needs a
+-- GROUP BY. The trigger sees the exact row version each write replaced, so concurrent writers
+-- (daily sync, consensus projection, curated import) cannot subtract the same pre-image twice.
+CREATE TABLE IF NOT EXISTS catalog_facets (
+    facet TEXT NOT NULL,            -- main_level | common_sub_level | specialized_level
+    value TEXT NOT NULL,
+    is_related BOOLEAN NOT NULL,    -- suggestion_video_info.is_related_video (NULL counted as FALSE)
+    video_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value, is_related)
 );
 
--- Lecturer Suggestions Table
-CREATE TABLE IF NOT EXISTS lecturer_suggestions (
+CREATE OR REPLACE FUNCTION catalog_facets_track()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.main_level IS NOT DISTINCT FROM NEW.main_level
+       AND OLD.common_sub_level IS NOT DISTINCT FROM NEW.common_sub_level
+       AND OLD.specialized_level IS NOT DISTINCT FROM NEW.specialized_level
+       AND COALESCE(OLD.is_related_video, FALSE) = COALESCE(NEW.is_related_video, FALSE) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO catalog_facets (facet, value, is_related, video_count)
+        SELECT f.facet, f.value, COALESCE(OLD.is_related_video, FALSE), -1
+        FROM (VALUES
+            ('main_level', OLD.main_level),
+            ('common_sub_level', OLD.common_sub_level),
+            ('specialized_level', OLD.specialized_level)
+        ) AS f(facet, value)
+        WHERE f.value IS NOT NULL
+        ON CONFLICT (facet, value, is_related)
+        DO UPDATE SET video_count = catalog_facets.video_count + EXCLUDED.video_count;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO catalog_facets (facet, value, is_related, video_count)
+        SELECT f.facet, f.value, COALESCE(NEW.is_related_video, FALSE), 1
+        FROM (VALUES
+            ('main_level', NEW.main_level),
+            ('common_sub_level', NEW.common_sub_level),
+            ('specialized_level', NEW.specialized_level)
+        ) AS f(facet, value)
+        WHERE f.value IS NOT NULL
+        ON CONFLICT (facet, value, is_related)
+        DO UPDATE SET video_count = catalog_facets.video_count + EXCLUDED.video_count;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_catalog_facets ON suggestion_video_info;
+CREATE TRIGGER trg_catalog_facets
+AFTER INSERT OR DELETE OR UPDATE OF main_level, common_sub_level, specialized_level, is_related_video
+ON suggestion_video_info
+FOR EACH ROW EXECUTE FUNCTION catalog_facets_track();
+
+CREATE INDEX IF NOT EXISTS idx_suggestion_video_info_main_level ON suggestion_video_info(main_level);
+CREATE INDEX IF NOT EXISTS idx_suggestion_video_info_common_sub_level ON suggestion_video_info(common_sub_level);
+CREATE INDEX IF NOT EXISTS idx_suggestion_video_info_specialized_level ON suggestion_video_info(specialized_level);
+
+-- -------------------------------------------------------------------
+-- Consensus projection: winning metadata materialized per video
+-- -------------------------------------------------------------------
+-- lecture_title, lesson_name, lecturer_name and is_related_video are recomputed from the
+-- vote tables whenever a vote on the video commits (see project_video_consensus).
+ALTER TABLE suggestion_video_info ADD COLUMN IF NOT EXISTS lecturer_name TEXT;
+
+-- -------------------------------------------------------------------
+-- Ranking: stored time-decayed score per suggestion (?rank=hot)
+-- -------------------------------------------------------------------
+-- log10(votes) + age bonus: every 12.5 hours (45000 s) a suggestion needs 10x the votes to stay ahead,
+-- so a fresh suggestion with 3 votes can overtake a stale one with 5. Updated by the vote path.
+CREATE OR REPLACE FUNCTION suggestion_hot_score(votes INTEGER, created TIMESTAMP)
+RETURNS DOUBLE PRECISION
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT (log(10, GREATEST(COALESCE(votes, 0), 1)::numeric)
+            + EXTRACT(EPOCH FROM created) / 45000.0)::double precision
+$$;
+
+-- -------------------------------------------------------------------
+-- Compact votes: 16-byte voter keys, (suggestion, voter) primary key
+-- -------------------------------------------------------------------
+-- The app stores the first 128 bits of sha256(voter_hash) (app.db.repo.videos_repo.voter_key)
+-- instead of the client's text hash, and the composite primary key replaces the surrogate UUID
+-- and the UNIQUE index. 128 bits keeps collisions between voters on one suggestion negligible.
+CREATE OR REPLACE FUNCTION voter_key(voter_hash TEXT)
+RETURNS BYTEA
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT substring(sha256(convert_to(voter_hash, 'UTF8')) FROM 1 FOR 16)
+$$;
+
+-- -------------------------------------------------------------------
+-- Suggestions: one table for every metadata kind
+-- -------------------------------------------------------------------
+-- kind is a name from app.domain.suggestion_kinds (title, description, lesson_name, lecturer) or
+-- 'related', whose two rows per video have text 'related' / 'not_related'. The per-video reads
+-- (top-N, hot-N, consensus, search) are range scans of the (video_id, kind, ...) indexes, and a
+-- read across kinds is one scan of the video's prefix instead of a UNION over per-kind tables.
+CREATE TABLE IF NOT EXISTS suggestions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    kind TEXT NOT NULL,
     video_id TEXT NOT NULL,
-    lecturer_name_text TEXT NOT NULL,
-    approval_count INTEGER DEFAULT 0,
+    text TEXT NOT NULL,
+    approval_count INTEGER NOT NULL DEFAULT 0,
+    score DOUBLE PRECISION DEFAULT suggestion_hot_score(0, LOCALTIMESTAMP),
     created_at TIMESTAMP DEFAULT NOW(),
     FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE
 );
 
--- Lecturer Votes Table
-CREATE TABLE IF NOT EXISTS lecturer_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    lecturer_suggestion_id UUID NOT NULL,
-    voter_hash TEXT NOT NULL,
+CREATE TABLE IF NOT EXISTS suggestion_votes (
+    suggestion_id UUID NOT NULL,
+    voter_hash BYTEA NOT NULL CHECK (octet_length(voter_hash) = 16),  -- voter_key(): first 16 bytes of sha256(client voter_hash)
     created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (lecturer_suggestion_id) REFERENCES lecturer_suggestions(id) ON DELETE CASCADE,
-    UNIQUE(lecturer_suggestion_id, voter_hash)
+    FOREIGN KEY (suggestion_id) REFERENCES suggestions(id) ON DELETE CASCADE,
+    PRIMARY KEY (suggestion_id, voter_hash)
 );
 
--- Related-suggestions: users vote whether each video is "related" or not (is_related)
-CREATE TABLE IF NOT EXISTS related_suggestions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    video_id TEXT NOT NULL,
-    is_related BOOLEAN NOT NULL,
-    approval_count INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (video_id) REFERENCES video_info(video_id) ON DELETE CASCADE,
-    UNIQUE(video_id, is_related)
-);
+CREATE INDEX IF NOT EXISTS idx_suggestions_video_kind_top ON suggestions(video_id, kind, approval_count DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_suggestions_video_kind_score ON suggestions(video_id, kind, score DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_suggestions_related ON suggestions(video_id, text) WHERE kind = 'related';
+-- Walks one kind in id order for the approval_count reconciliation (app.services.vote_counts)
+CREATE INDEX IF NOT EXISTS idx_suggestions_kind_id ON suggestions(kind, id);
 
-CREATE TABLE IF NOT EXISTS related_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    related_suggestion_id UUID NOT NULL,
-    voter_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (related_suggestion_id) REFERENCES related_suggestions(id) ON DELETE CASCADE,
-    UNIQUE(related_suggestion_id, voter_hash)
-);
+-- Move the per-kind tables (<kind>_suggestions / <kind>_votes) into suggestions and drop them.
+-- Ids are kept, so votes queued before the switch still apply; text voter hashes from before the
+-- compact vote layout are converted with voter_key().
+DO $$
+DECLARE
+    kind TEXT;
+    text_expr TEXT;
+    voter TEXT;
+BEGIN
+    FOREACH kind IN ARRAY ARRAY['title', 'description', 'lesson_name', 'lecturer', 'related'] LOOP
+        CONTINUE WHEN to_regclass(kind || '_suggestions') IS NULL;
+        text_expr := CASE kind
+            WHEN 'related' THEN 'CASE WHEN is_related THEN ''related'' ELSE ''not_related'' END'
+            WHEN 'lecturer' THEN 'lecturer_name_text'
+            ELSE quote_ident(kind || '_text')
+        END;
+        EXECUTE format(
+            'INSERT INTO suggestions (id, kind, video_id, text, approval_count, score, created_at)
+             SELECT id, %L, video_id, %s, COALESCE(approval_count, 0),
+                    suggestion_hot_score(approval_count, created_at), created_at
+             FROM %I
+             ON CONFLICT DO NOTHING',
+            kind, text_expr, kind || '_suggestions'
+        );
+        IF to_regclass(kind || '_votes') IS NOT NULL THEN
+            SELECT CASE WHEN data_type = 'bytea' THEN 'voter_hash' ELSE 'voter_key(voter_hash)' END INTO voter
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = kind || '_votes' AND column_name = 'voter_hash';
+            EXECUTE format(
+                'INSERT INTO suggestion_votes (suggestion_id, voter_hash, created_at)
+                 SELECT %I, %s, created_at FROM %I
+                 ON CONFLICT DO NOTHING',
+                kind || '_suggestion_id', voter, kind || '_votes'
+            );
+            EXECUTE format('DROP TABLE %I', kind || '_votes');
+        END IF;
+        EXECUTE format('DROP TABLE %I', kind || '_suggestions');
+    END LOOP;
+END;
+$$;
 
-CREATE INDEX IF NOT EXISTS idx_related_suggestions_video_id ON related_suggestions(video_id);
+-- Rewrite suggestion_votes, optionally hash-partitioned by suggestion id. Takes an exclusive
+-- lock for the duration. For a large table:
+--     SELECT rebuild_vote_table(16);
+DROP FUNCTION IF EXISTS rebuild_vote_table(TEXT, INTEGER);
+CREATE OR REPLACE FUNCTION rebuild_vote_table(partitions INTEGER DEFAULT 0)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    LOCK TABLE suggestion_votes IN EXCLUSIVE MODE;
+    CREATE TEMP TABLE vote_rebuild ON COMMIT DROP AS
+        SELECT suggestion_id, voter_hash, created_at FROM suggestion_votes;
+    DROP TABLE suggestion_votes;
+    EXECUTE format(
+        'CREATE TABLE suggestion_votes (
+            suggestion_id UUID NOT NULL,
+            voter_hash BYTEA NOT NULL CHECK (octet_length(voter_hash) = 16),
+            created_at TIMESTAMP DEFAULT NOW(),
+            FOREIGN KEY (suggestion_id) REFERENCES suggestions(id) ON DELETE CASCADE,
+            PRIMARY KEY (suggestion_id, voter_hash)
+        )%s',
+        CASE WHEN partitions > 0 THEN ' PARTITION BY HASH (suggestion_id)' ELSE '' END
+    );
+    FOR i IN 0 .. partitions - 1 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF suggestion_votes FOR VALUES WITH (MODULUS %s, REMAINDER %s)',
+            'suggestion_votes_p' || i, partitions, i
+        );
+    END LOOP;
+    EXECUTE 'INSERT INTO suggestion_votes SELECT suggestion_id, voter_hash, created_at FROM vote_rebuild';
+    DROP TABLE vote_rebuild;
+END;
+$$;
 
--- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_title_suggestions_video_id ON title_suggestions(video_id);
-CREATE INDEX IF NOT EXISTS idx_title_suggestions_approval_count ON title_suggestions(approval_count DESC);
-CREATE INDEX IF NOT EXISTS idx_description_suggestions_video_id ON description_suggestions(video_id);
-CREATE INDEX IF NOT EXISTS idx_description_suggestions_approval_count ON description_suggestions(approval_count DESC);
-CREATE INDEX IF NOT EXISTS idx_title_votes_suggestion_id ON title_votes(title_suggestion_id);
-CREATE INDEX IF NOT EXISTS idx_description_votes_suggestion_id ON description_votes(description_suggestion_id);
-CREATE INDEX IF NOT EXISTS idx_video_info_published_at ON video_info(published_at DESC);
-CREATE INDEX IF NOT EXISTS idx_lesson_name_suggestions_video_id ON lesson_name_suggestions(video_id);
-CREATE INDEX IF NOT EXISTS idx_lesson_name_suggestions_approval_count ON lesson_name_suggestions(approval_count DESC);
-CREATE INDEX IF NOT EXISTS idx_lecturer_suggestions_video_id ON lecturer_suggestions(video_id);
-CREATE INDEX IF NOT EXISTS idx_lecturer_suggestions_approval_count ON lecturer_suggestions(approval_count DESC);
+-- -------------------------------------------------------------------
+-- Write-behind vote counts: last flush batch applied to approval_count
+-- -------------------------------------------------------------------
+-- The flusher (app.services.vote_counts) records its batch id here in the same transaction as
+-- the count UPDATE, so a batch retried after that commit is not added twice. Flushes are serial
+-- and a batch is retried until it is applied, so only the latest id is needed.
+CREATE TABLE IF NOT EXISTS vote_count_flush (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    last_batch UUID NOT NULL,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
+
+-- -------------------------------------------------------------------
+-- Curated metadata is authoritative over the consensus projection
+-- -------------------------------------------------------------------
+-- Columns set by the curated import (app.cli.curated_metadata); project_video_consensus leaves
+-- them alone, so a vote cannot overwrite a lesson name or verdict the curriculum team loaded.
+-- An --overwrite import that clears a column hands it back to the votes.
+ALTER TABLE suggestion_video_info ADD COLUMN IF NOT EXISTS curated_columns TEXT[] NOT NULL DEFAULT '{}';
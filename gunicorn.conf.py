@@ -0,0 +1,7 @@
+# Loaded automatically by gunicorn from the working directory.
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    # Drop the live gauges (pool in-use / idle) of a worker that exited; see app/core/metrics.py
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,75 @@
+"""
+Parsing and validation of curated metadata files (app.services.curated_metadata.read_curated_file).
+Nothing here writes to the database.
+"""
+from datetime import date
+
+from app.services.curated_metadata import read_curated_file
+
+
+def _write(tmp_path, name: str, text: str):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_csv_valid_rows(tmp_path):
+    path = _write(
+        tmp_path,
+        "curated.csv",
+        "video_id,main_level,batch,is_related_video\n"
+        "abc,التمهيدية,2024-01-01,yes\n"
+        "def,MainAcademicLevel2,,\n",
+    )
+    parsed = read_curated_file(path, "csv")
+    assert parsed.errors == []
+    assert parsed.rows["abc"][1] == "التمهيدية"
+    assert parsed.rows["abc"][6] == date(2024, 1, 1)
+    assert parsed.rows["abc"][7] is True
+    assert parsed.rows["def"][1] == "المتوسطة"
+
+
+def test_csv_row_with_too_many_fields_is_invalid(tmp_path):
+    path = _write(
+        tmp_path,
+        "curated.csv",
+        "video_id,main_level,lesson_name\n"
+        "abc,التمهيدية,x,EXTRA\n"
+        "def,التمهيدية,y\n",
+    )
+    parsed = read_curated_file(path, "csv")
+    assert parsed.read == 2
+    assert parsed.errors == ["line 2: too many fields (the header has 3)"]
+    assert list(parsed.rows) == ["def"]
+
+
+def test_csv_unknown_column_is_invalid(tmp_path):
+    path = _write(tmp_path, "curated.csv", "video_id,colour\nabc,red\n")
+    parsed = read_curated_file(path, "csv")
+    assert parsed.errors == ["line 2: unknown columns: colour"]
+    assert not parsed.rows
+
+
+def test_jsonl_non_string_values_are_invalid(tmp_path):
+    path = _write(
+        tmp_path,
+        "curated.jsonl",
+        '{"video_id": "v1", "batch": 20240101}\n'
+        '{"video_id": "v2", "main_level": ["a"]}\n'
+        '{"video_id": 5}\n'
+        '{"video_id": "v3", "is_related_video": true}\n'
+        '{"video_id": "v4", "is_related_video": {"x": 1}}\n'
+        "[1, 2]\n",
+    )
+    parsed = read_curated_file(path, "jsonl")
+    assert parsed.read == 6
+    assert [error.split(":")[0] for error in parsed.errors] == ["line 1", "line 2", "line 3", "line 5", "line 6"]
+    assert list(parsed.rows) == ["v3"]
+    assert parsed.rows["v3"][7] is True
+
+
+def test_duplicates_keep_the_last_record(tmp_path):
+    path = _write(tmp_path, "curated.csv", "video_id,lesson_name\nabc,first\nabc,second\n")
+    parsed = read_curated_file(path, "csv")
+    assert parsed.duplicates == 1
+    assert parsed.rows["abc"][5] == "second"